@@ -1,37 +1,101 @@
-from fastapi import APIRouter, Query  # pyright: ignore[reportMissingImports]
-from app.models.request import DebugRequest
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect  # pyright: ignore[reportMissingImports]
+from fastapi.concurrency import run_in_threadpool  # pyright: ignore[reportMissingImports]
+from app.models.request import DebugRequest, BreakpointRequest
 from app.services.session import session_manager
-from app.services.debug_runner import start_debug_session, run_until_next_new_error
+from app.services.debug_runner import (
+    start_debug_session,
+    run_until_next_new_error,
+    continue_to_breakpoint,
+    step_cursor,
+    set_breakpoint,
+    clear_breakpoint,
+    list_breakpoints,
+)
+from app.services.debug_protocol import DebugChannel
+from app.utils.serializer import FastJSONResponse, dumps
 
 router = APIRouter()
 
 @router.post("/debug")
 def debug(req: DebugRequest):
-    return start_debug_session(req.code, req.debug_key)
+    return FastJSONResponse(start_debug_session(req.code, req.debug_key))
 
 @router.post("/debug/rerunDebug")
 def next_error(
     session_id: str = Query(...),
     debug_key: str = Query(...)
 ):
-    return run_until_next_new_error(session_id, debug_key)
+    return FastJSONResponse(run_until_next_new_error(session_id, debug_key))
+
+@router.post("/debug/continue")
+def continue_(
+    session_id: str = Query(...),
+    debug_key: str = Query(...)
+):
+    return FastJSONResponse(continue_to_breakpoint(session_id, debug_key))
+
+@router.post("/debug/step")
+def step_fine(
+    session_id: str = Query(...),
+    debug_key: str = Query(...),
+    mode: str = Query("into")
+):
+    return FastJSONResponse(step_cursor(session_id, debug_key, mode))
+
+@router.get("/debug/breakpoints")
+def get_breakpoints(session_id: str):
+    return FastJSONResponse(list_breakpoints(session_id))
+
+@router.post("/debug/breakpoints")
+def add_breakpoint(req: BreakpointRequest):
+    return FastJSONResponse(set_breakpoint(req.session_id, req.line, req.condition))
+
+@router.delete("/debug/breakpoints")
+def remove_breakpoint(session_id: str, line: int = None):
+    return FastJSONResponse(clear_breakpoint(session_id, line))
 
 @router.get("/env")
 def env(session_id: str):
-    return session_manager.env(session_id)
+    return FastJSONResponse(session_manager.env(session_id))
 
 @router.post("/step")
 def step(session_id: str):
-    return session_manager.step(session_id)
+    return FastJSONResponse(session_manager.step(session_id))
 
 @router.post("/back")
 def back(session_id: str):
-    return session_manager.back(session_id)
+    return FastJSONResponse(session_manager.back(session_id))
 
 @router.post("/next")
 def next_(session_id: str):
-    return session_manager.next(session_id)
+    return FastJSONResponse(session_manager.next(session_id))
 
 @router.get("/detail")
 def detail(session_id: str):
-    return session_manager.detail(session_id)
+    return FastJSONResponse(session_manager.detail(session_id))
+
+@router.get("/memory")
+def memory(session_id: str = None):
+    return FastJSONResponse(session_manager.memory(session_id))
+
+@router.websocket("/debug/ws")
+async def debug_ws(ws: WebSocket):
+    """
+    Commands (JSON): start {code, debug_key} | attach {session_id, debug_key}
+    | step | step_into | step_over | step_out | back | next | continue
+    | input {value} | snapshot
+    | break {line, condition?} | clear {line?}.
+    Replies carry only env/output/trace changes since the previous reply.
+    """
+    await ws.accept()
+    channel = DebugChannel()
+    try:
+        while True:
+            msg = await ws.receive_json()
+            reply = await run_in_threadpool(channel.handle, msg)
+            await ws.send_text(dumps(reply).decode("utf-8"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # a cursor left paused would hold its thread forever
+        await run_in_threadpool(channel.close)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request  # pyright: ignore[reportMissingImports]
+from app.models.request import JobRequest
+from app.services.job_queue import job_scheduler
+from app.utils.serializer import FastJSONResponse
+
+router = APIRouter()
+
+
+def _client_id(request: Request):
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "anonymous")
+
+@router.post("/jobs")
+def submit_job(req: JobRequest, request: Request):
+    job = job_scheduler.submit(req.code, req.inputs, req.priority, _client_id(request), req.trace_format)
+    return FastJSONResponse({"success": True, "job_id": job.id, "status": job.status})
+
+@router.get("/jobs/metrics")
+def job_metrics():
+    return FastJSONResponse(job_scheduler.metrics())
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    return FastJSONResponse({"success": True, **job_scheduler.get(job_id)})
@@ -0,0 +1,9 @@
+from fastapi import APIRouter  # pyright: ignore[reportMissingImports]
+from fastapi.responses import PlainTextResponse  # pyright: ignore[reportMissingImports]
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
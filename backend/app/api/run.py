@@ -1,13 +1,37 @@
 from fastapi import APIRouter  # pyright: ignore[reportMissingImports]
-from app.models.request import RunRequest
+from fastapi.responses import PlainTextResponse, StreamingResponse  # pyright: ignore[reportMissingImports]
+from app.models.request import RunRequest, BatchRunRequest
 from app.models.response import RunResponse, RunErrorResponse
-from app.services.runner import run_code
+from app.services.runner import run_code, collapsed_stacks
+from app.services.stream_runner import stream_code
+from app.services.batch_runner import run_batch, stream_batch
+from app.utils.serializer import FastJSONResponse
 
 router = APIRouter()
 
 @router.post("/run")
 def run(req: RunRequest):
-    return run_code(req.code)
+    return FastJSONResponse(run_code(req.code, req.trace_format, req.inputs, req.profile))
+
+@router.post("/run/stream")
+def run_stream(req: RunRequest):
+    return StreamingResponse(
+        stream_code(req.code, req.inputs),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/run/batch")
+def run_batch_(req: BatchRunRequest):
+    jobs = [job.model_dump() for job in req.jobs]
+    if req.stream:
+        return StreamingResponse(stream_batch(jobs), media_type="application/x-ndjson")
+    return FastJSONResponse(run_batch(jobs))
+
+@router.get("/run/flamegraph")
+def flamegraph(session_id: str):
+    # collapsed stacks for flamegraph.pl / speedscope / inferno
+    return PlainTextResponse(collapsed_stacks(session_id))
 
 def run_internal(req: RunRequest):
-    return run_code(req.code)
+    return run_code(req.code, req.trace_format, req.inputs, req.profile)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter  # pyright: ignore[reportMissingImports]
+from fastapi.responses import Response  # pyright: ignore[reportMissingImports]
+from app.services.trace_export import trace_page, export_trace
+from app.utils.serializer import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/trace")
+def trace(session_id: str, start: int = 0, limit: int = 200):
+    return FastJSONResponse(trace_page(session_id, start, limit))
+
+@router.get("/trace/export")
+def trace_export(session_id: str):
+    return Response(
+        content=export_trace(session_id),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="trace-{session_id}.ayrt"'},
+    )
@@ -1,6 +1,16 @@
 from fastapi import FastAPI  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware # pyright: ignore[reportMissingImports]
-from app.api import run, debug, input
+from fastapi.encoders import ENCODERS_BY_TYPE  # pyright: ignore[reportMissingImports]
+from app.api import run, debug, input, trace, jobs, metrics
+from app.runtime.builtins import AYRArray
+from app.runtime.trace import ColumnarTrace
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware
+
+# numpy-backed arrays go over the wire as plain JSON lists
+ENCODERS_BY_TYPE[AYRArray] = AYRArray.tolist
+# columnar traces are sent in their compact form, not as per-step dicts
+ENCODERS_BY_TYPE[ColumnarTrace] = ColumnarTrace.columns
 
 
 app = FastAPI(title="AYR Runtime", version="0.1.0")
@@ -16,8 +26,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip / brotli for large env and trace payloads
+app.add_middleware(CompressionMiddleware)
+# outermost: latency includes compression
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(run.router)
 app.include_router(debug.router)
 app.include_router(input.router)
+app.include_router(trace.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
 
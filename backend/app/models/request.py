@@ -1,10 +1,40 @@
+from typing import List, Optional, Union
+
 from pydantic import BaseModel
 
 
 class RunRequest(BaseModel):
     code: str
+    trace_format: str = "full"    # "full" | "columnar"
+    # answers for pucho, one per prompt ("3 4" for `a, b = pucho`); when
+    # given, the run never suspends and no session is kept
+    inputs: Optional[List[Union[str, int, float]]] = None
+    profile: bool = False         # per-line timings + kaam call counts in the response
+
+
+class BatchJob(BaseModel):
+    code: str
+    inputs: List[Union[str, int, float]] = []   # answers for pucho, one per prompt
+
+
+class BatchRunRequest(BaseModel):
+    jobs: List[BatchJob]
+    stream: bool = False        # NDJSON in completion order instead of one ordered list
+
+
+class JobRequest(BaseModel):
+    code: str
+    inputs: List[Union[str, int, float]] = []   # answers for pucho, one per prompt
+    priority: int = 0                           # higher runs first
+    trace_format: str = "full"
 
 
 class DebugRequest(BaseModel):
     code: str
     debug_key: str
+
+
+class BreakpointRequest(BaseModel):
+    session_id: str
+    line: int
+    condition: Optional[str] = None
@@ -0,0 +1,221 @@
+import gc
+import hashlib
+import marshal
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+from app.runtime import nodes
+from app.runtime.nodes import Program
+
+
+_MAGIC = b"AYRA"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH16sII")   # magic, version, runtime digest, crc32, payload length
+_MARSHAL_VERSION = 4
+
+# entries kept on disk; the least recently written go first
+MAX_CACHE_ENTRIES = 10000
+# how often (in writes) the directory is checked against MAX_CACHE_ENTRIES
+PRUNE_EVERY = 256
+
+# node tuples start with their shape index; plain tuples with this tag
+_TUPLE = -1
+_PLAIN = (type(None), bool, int, float, str)
+
+_NODE_TYPES = {
+    name: cls for name, cls in vars(nodes).items()
+    if isinstance(cls, type) and cls.__module__ == nodes.__name__
+}
+
+
+def _runtime_digest():
+    """Changes whenever the lexer, parser, node classes or marshal format change."""
+    h = hashlib.sha256()
+    h.update(f"{_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    here = os.path.dirname(__file__)
+    for name in ("lexer.py", "parser.py", "nodes.py"):
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    return h.digest()[:16]
+
+
+RUNTIME_VERSION = _runtime_digest()
+
+
+# ---------- Program <-> bytes ----------
+def encode_program(program):
+    """
+    Versioned binary form of a parsed Program: a header (magic, format
+    version, runtime digest, CRC32) and a zlib-compressed marshal payload
+    of nested tuples. Each node is (shape id, *field values); shapes are
+    (class name, field names, fields holding nodes/containers) and stored
+    once. Underscore attributes (the interpreter's call-site caches) are
+    left out.
+    """
+    shapes = {}
+
+    def enc(value):
+        t = type(value)
+        if t in _PLAIN:
+            return value
+        if t is list:
+            return [enc(v) for v in value]
+        if t is tuple:
+            return (_TUPLE, *[enc(v) for v in value])
+        if t is dict:
+            return {k: enc(v) for k, v in value.items()}
+        if t.__name__ not in _NODE_TYPES:
+            raise TypeError(f"Cannot serialize {t.__name__} in an AST")
+        fields = value.__dict__
+        keys = tuple(k for k in fields if not k.startswith("_"))
+        # the decoder only recurses into the fields listed here
+        nested = tuple(k for k in keys if type(fields[k]) not in _PLAIN)
+        shape = (t.__name__, keys, nested)
+        index = shapes.get(shape)
+        if index is None:
+            index = shapes[shape] = len(shapes)
+        return (index, *[enc(fields[k]) for k in keys])
+
+    root = enc(program)
+    payload = zlib.compress(marshal.dumps((list(shapes), root), _MARSHAL_VERSION), 6)
+    return _HEADER.pack(_MAGIC, _VERSION, RUNTIME_VERSION, zlib.crc32(payload), len(payload)) + payload
+
+
+def decode_program(data):
+    """Inverse of encode_program; ValueError for anything stale or damaged."""
+    if len(data) < _HEADER.size:
+        raise ValueError("AST cache entry is truncated")
+    magic, version, digest, crc, length = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION or digest != RUNTIME_VERSION:
+        raise ValueError("AST cache entry is from another runtime version")
+    payload = data[_HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("AST cache entry is corrupted")
+
+    try:
+        shapes, root = marshal.loads(zlib.decompress(payload))
+        classes = [(_NODE_TYPES[name], keys, nested) for name, keys, nested in shapes]
+    except (EOFError, TypeError, ValueError, KeyError, zlib.error) as e:
+        raise ValueError(f"AST cache entry is corrupted: {e}") from None
+
+    def dec(value):
+        t = type(value)
+        if t is tuple:
+            tag = value[0]
+            if tag == _TUPLE:
+                return tuple([dec(v) for v in value[1:]])
+            cls, keys, nested = classes[tag]
+            fields = dict(zip(keys, value[1:]))
+            for k in nested:
+                fields[k] = dec(fields[k])
+            node = cls.__new__(cls)
+            node.__dict__ = fields
+            return node
+        if t is list:
+            return [dec(v) for v in value]
+        if t is dict:
+            return {k: dec(v) for k, v in value.items()}
+        return value
+
+    # building a tree allocates only acyclic objects: don't let the cyclic
+    # GC rescan them over and over while it grows
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        program = dec(root)
+    except (IndexError, TypeError, ValueError, RecursionError) as e:
+        raise ValueError(f"AST cache entry is corrupted: {e}") from None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if not isinstance(program, Program):
+        raise ValueError("AST cache entry does not hold a Program")
+    return program
+
+
+# ---------- on-disk cache ----------
+class ASTCache:
+    """
+    Parsed programs on disk, one file per (source, runtime version), so a
+    restarted instance skips Lexer + Parser for sources it has seen.
+    Unreadable, stale or corrupted entries count as misses and are removed.
+    """
+
+    def __init__(self, directory, max_entries=MAX_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    def path(self, source: str):
+        key = hashlib.sha256(RUNTIME_VERSION + source.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".ayra")
+
+    def get(self, source: str):
+        path = self.path(source)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            program = decode_program(data)
+        except ValueError:
+            self.corrupt += 1
+            self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        self.hits += 1
+        return program
+
+    def put(self, source: str, program):
+        path = self.path(source)
+        tmp = None
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # unique per writer: threads of one process may store the same source
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_program(program))
+            os.replace(tmp, path)   # readers never see a half-written entry
+        except OSError:
+            # a read-only or full disk only costs us the cache
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return
+
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        try:
+            with os.scandir(self.directory) as it:
+                entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(".ayra")]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "corrupt": self.corrupt}
@@ -0,0 +1,396 @@
+from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import numpy as np
+except ImportError:  # optional: only array() needs it
+    np = None
+
+
+# ============================================================
+# RUNTIME VALUES
+# ============================================================
+
+@dataclass
+class AYRRange:
+    """
+    Lazy integer range returned by range(). Iteration is delegated to the
+    native range object, so `har range(n) main i` never builds a list.
+    Being a dataclass keeps it JSON/deepcopy friendly inside env snapshots.
+    """
+    start: int
+    stop: int
+    step: int = 1
+
+    def _native(self):
+        return range(self.start, self.stop, self.step)
+
+    def __iter__(self):
+        return iter(self._native())
+
+    def __len__(self):
+        return len(self._native())
+
+
+class AYRArray:
+    """
+    Opt-in numeric array returned by array(), backed by a 1-D NumPy ndarray.
+    Arithmetic and comparisons on it are vectorized (see array_binary_op).
+
+    Deep copies (trace / checkpoint snapshots) share the buffer
+    copy-on-write: whichever side calls set_item first copies it.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._shared = False
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        # a comparison result is an array of booleans, not one boolean
+        raise BuiltinError("Array ko condition me seedha use nahi kar sakte, any() ya all() lagao.")
+
+    def __deepcopy__(self, memo):
+        self._shared = True
+        clone = AYRArray(self.data)
+        clone._shared = True
+        return clone
+
+    def __iter__(self):
+        return iter(self.data.tolist())
+
+    def __eq__(self, other):
+        return isinstance(other, AYRArray) and np.array_equal(self.data, other.data)
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def item(self, index):
+        return self.data[index].item()
+
+    def set_item(self, index, value):
+        if isinstance(value, int):
+            _check_int64(value)
+        if isinstance(value, float) and self.data.dtype.kind != "f":
+            self.data = self.data.astype(np.float64)
+        elif self._shared:
+            self.data = self.data.copy()
+        self._shared = False
+        self.data[index] = value
+
+    def __repr__(self):
+        return f"array({self.tolist()})"
+
+
+class BuiltinError(Exception):
+    """Raised by a builtin; the interpreter re-raises it as ExpressionError."""
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(message)
+
+
+@dataclass
+class Builtin:
+    name: str
+    fn: Callable
+    min_args: int
+    max_args: int   # -1 = variadic
+    # "append" / "rewrite": changes its first argument in place
+    mutates: str = None
+
+
+BUILTINS = {}
+
+
+def builtin(name, min_args, max_args=None, mutates=None):
+    def register(fn):
+        BUILTINS[name] = Builtin(name, fn, min_args, min_args if max_args is None else max_args, mutates)
+        return fn
+    return register
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+ITERABLES = (list, tuple, dict, str, AYRRange, AYRArray)
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _require_int(v, what):
+    if not isinstance(v, int) or isinstance(v, bool):
+        raise BuiltinError(f"{what} number (int) hona chahiye.")
+    return v
+
+
+def _require_iterable(v, fname):
+    if not isinstance(v, ITERABLES):
+        raise BuiltinError(f"{fname}() ko list / tuple / dict / string / range chahiye.")
+    return v
+
+
+def _require_list(v, fname):
+    if not isinstance(v, list):
+        raise BuiltinError(f"{fname}() sirf list par kaam karta hai.")
+    return v
+
+
+def _comparable(values, fname):
+    if len(values) == 0:
+        raise BuiltinError(f"{fname}() ko khaali collection nahi de sakte.")
+    if all(_is_number(v) for v in values) or all(isinstance(v, str) for v in values):
+        return values
+    raise BuiltinError(f"{fname}() me sab values ek hi type (number ya string) ki honi chahiye.")
+
+
+# ============================================================
+# BUILTINS
+# ============================================================
+
+@builtin("len", 1)
+def _len(value):
+    return len(_require_iterable(value, "len"))
+
+
+@builtin("range", 1, 3)
+def _range(*args):
+    for a in args:
+        _require_int(a, "range() ka argument")
+    if len(args) == 1:
+        return AYRRange(0, args[0])
+    if len(args) == 3 and args[2] == 0:
+        raise BuiltinError("range() ka step zero nahi ho sakta.")
+    return AYRRange(*args)
+
+
+@builtin("sum", 1)
+def _sum(values):
+    values = _require_iterable(values, "sum")
+    if isinstance(values, AYRRange):
+        return sum(values._native())
+    if isinstance(values, AYRArray):
+        return values.data.sum().item()
+    if isinstance(values, (str, dict)) or not all(_is_number(v) for v in values):
+        raise BuiltinError("sum() sirf numbers ki list par kaam karta hai.")
+    return sum(values)
+
+
+def _min_max(fname, pick, args):
+    if len(args) == 1:
+        values = _require_iterable(args[0], fname)
+        if isinstance(values, AYRRange):
+            native = values._native()
+            if len(native) == 0:
+                raise BuiltinError(f"{fname}() ko khaali collection nahi de sakte.")
+            return pick(native)
+        if isinstance(values, AYRArray):
+            if len(values) == 0:
+                raise BuiltinError(f"{fname}() ko khaali collection nahi de sakte.")
+            reduce = values.data.min if pick is min else values.data.max
+            return reduce().item()
+        values = list(values)
+    else:
+        values = list(args)
+    return pick(_comparable(values, fname))
+
+
+@builtin("min", 1, -1)
+def _min(*args):
+    return _min_max("min", min, args)
+
+
+@builtin("max", 1, -1)
+def _max(*args):
+    return _min_max("max", max, args)
+
+
+@builtin("sorted", 1)
+def _sorted(values):
+    values = list(_require_iterable(values, "sorted"))
+    if not values:
+        return []
+    return sorted(_comparable(values, "sorted"))
+
+
+@builtin("append", 2, mutates="append")
+def _append(target, value):
+    _require_list(target, "append").append(value)
+    return None
+
+
+@builtin("pop", 1, 2, mutates="rewrite")
+def _pop(target, index=-1):
+    target = _require_list(target, "pop")
+    _require_int(index, "pop() ka index")
+    if not target:
+        raise BuiltinError("Khaali list se pop nahi ho sakta.")
+    if index < -len(target) or index >= len(target):
+        raise BuiltinError("List index limit ke bahar hai.")
+    return target.pop(index)
+
+
+@builtin("abs", 1)
+def _abs(value):
+    if not _is_number(value):
+        raise BuiltinError("abs() sirf number par kaam karta hai.")
+    return abs(value)
+
+
+@builtin("str", 1)
+def _str(value):
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@builtin("int", 1)
+def _int(value):
+    if isinstance(value, bool):
+        raise BuiltinError("Boolean ko int me convert nahi kar sakte.")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BuiltinError(f"'{value}' ko int me convert nahi kar sakte.")
+
+
+@builtin("float", 1)
+def _float(value):
+    if isinstance(value, bool):
+        raise BuiltinError("Boolean ko float me convert nahi kar sakte.")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise BuiltinError(f"'{value}' ko float me convert nahi kar sakte.")
+
+
+@builtin("mean", 1)
+def _mean(values):
+    values = _require_iterable(values, "mean")
+    if len(values) == 0:
+        raise BuiltinError("mean() ko khaali collection nahi de sakte.")
+    if isinstance(values, AYRArray):
+        return values.data.mean().item()
+    return _sum(values) / len(values)
+
+
+def _bools(values, fname):
+    values = list(_require_iterable(values, fname))
+    if not all(isinstance(v, bool) for v in values):
+        raise BuiltinError(f"{fname}() ko booleans ki list ya array chahiye.")
+    return values
+
+
+@builtin("any", 1)
+def _any(values):
+    if isinstance(values, AYRArray):
+        return bool(values.data.any())
+    return any(_bools(values, "any"))
+
+
+@builtin("all", 1)
+def _all(values):
+    if isinstance(values, AYRArray):
+        return bool(values.data.all())
+    return all(_bools(values, "all"))
+
+
+# ============================================================
+# NUMERIC ARRAYS (NumPy)
+# ============================================================
+
+@builtin("array", 1)
+def _array(values):
+    if np is None:
+        raise BuiltinError("array() ke liye server par numpy install hona chahiye.")
+    if isinstance(values, AYRArray):
+        return AYRArray(values.data.copy())
+    if isinstance(values, AYRRange):
+        return AYRArray(np.arange(values.start, values.stop, values.step, dtype=np.int64))
+    if not isinstance(values, (list, tuple)):
+        raise BuiltinError("array() ko numbers ki list / tuple / range chahiye.")
+    if not all(_is_number(v) for v in values):
+        raise BuiltinError("array() me sirf numbers ho sakte hain.")
+    if all(isinstance(v, int) for v in values):
+        for v in values:
+            _check_int64(v)
+        return AYRArray(np.array(values, dtype=np.int64))
+    return AYRArray(np.array(values, dtype=np.float64))
+
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _check_int64(v):
+    if not INT64_MIN <= v <= INT64_MAX:
+        raise BuiltinError("Array ki integer value int64 range ke bahar hai.")
+
+
+def _int_bound(v):
+    """Largest |element| as a Python int (no int64 wrap-around)."""
+    if isinstance(v, AYRArray):
+        if len(v) == 0:
+            return 0
+        return max(-int(v.data.min()), int(v.data.max()))
+    return abs(v)
+
+
+def _check_int_overflow(a, b, op):
+    # NumPy int64 arithmetic wraps silently: reject anything that could leave the range
+    if op not in ("+", "-", "*"):
+        return
+    for v in (a, b):
+        if isinstance(v, float) or (isinstance(v, AYRArray) and v.data.dtype.kind != "i"):
+            return
+    x, y = _int_bound(a), _int_bound(b)
+    worst = x * y if op == "*" else x + y
+    if worst > INT64_MAX:
+        raise BuiltinError("Array ka result int64 range ke bahar ja sakta hai.")
+
+
+def _array_operand(v):
+    if isinstance(v, AYRArray):
+        return v.data
+    if _is_number(v):
+        return v
+    raise BuiltinError("Array ke saath sirf number ya dusra array use ho sakta hai.")
+
+
+_ARRAY_OPS = {
+    "+": lambda x, y: np.add(x, y),
+    "-": lambda x, y: np.subtract(x, y),
+    "*": lambda x, y: np.multiply(x, y),
+    "/": lambda x, y: np.true_divide(x, y),
+    "%": lambda x, y: np.mod(x, y),
+    ">": lambda x, y: np.greater(x, y),
+    "<": lambda x, y: np.less(x, y),
+    ">=": lambda x, y: np.greater_equal(x, y),
+    "<=": lambda x, y: np.less_equal(x, y),
+    "==": lambda x, y: np.equal(x, y),
+    "!=": lambda x, y: np.not_equal(x, y),
+}
+
+
+def array_binary_op(a, b, op):
+    """Element-wise `a op b` where at least one side is an AYRArray."""
+    if op not in _ARRAY_OPS:
+        raise BuiltinError(f"Array par '{op}' operator allowed nahi hai.")
+
+    x, y = _array_operand(a), _array_operand(b)
+
+    if isinstance(a, AYRArray) and isinstance(b, AYRArray) and len(a) != len(b):
+        raise BuiltinError("Dono arrays ki length same honi chahiye.")
+
+    if op in ("/", "%") and np.any(np.equal(y, 0)):
+        raise BuiltinError("Zero se division allowed nahi hai.")
+
+    _check_int_overflow(a, b, op)
+
+    return AYRArray(_ARRAY_OPS[op](x, y))
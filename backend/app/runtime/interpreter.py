@@ -1,8 +1,16 @@
 import re
 import copy
+import time
+import queue
+import itertools
+import threading
+from collections import deque
 from dataclasses import dataclass
 from app.runtime.nodes import *
 from app.runtime.state_manager import StateManager
+from app.runtime.memory import MemoryAccountant
+from app.runtime.trace import ColumnarTrace
+from app.runtime.builtins import BUILTINS, AYRRange, AYRArray, BuiltinError, array_binary_op
 
 
 class InputRequest(Exception):
@@ -32,6 +40,8 @@ class ExpressionError(Exception):
         if isinstance(v, list): return "list"
         if isinstance(v, tuple): return "tuple"
         if isinstance(v, dict): return "dict"
+        if isinstance(v, AYRRange): return "range"
+        if isinstance(v, AYRArray): return "array"
         return "unknown"
 
     def infer_input_type(raw):
@@ -47,6 +57,13 @@ class ExpressionError(Exception):
         return raw
 
     def apply_binary_op(a, b, op, node):
+        # -------- VECTORIZED (NumPy arrays) --------
+        if isinstance(a, AYRArray) or isinstance(b, AYRArray):
+            try:
+                return array_binary_op(a, b, op)
+            except BuiltinError as e:
+                raise ExpressionError(node.line, e.message, node.expr_text)
+
         la = ExpressionError.type_name(a)
         lb = ExpressionError.type_name(b)
 
@@ -118,6 +135,17 @@ class ExpressionError(Exception):
             node.expr_text
         )
 
+# Global stamp source for function/class definitions. Every definition event
+# (in any interpreter) gets a unique stamp, so a call-site cache tagged with a
+# stamp can never be mistaken as valid by a different interpreter sharing the
+# same AST.
+_DEF_STAMPS = itertools.count(1)
+
+
+class ExecutionTimeout(Exception):
+    """A loop ran past Interpreter.deadline."""
+
+
 class BreakSignal(Exception): pass
 class ContinueSignal(Exception): pass
 
@@ -125,29 +153,167 @@ class ReturnSignal(Exception):
     def __init__(self, value):
         self.value = value
 
+class TailCall(Exception):
+    """`wapas f(...)` inside f: argument values for the next round of f's body."""
+    def __init__(self, values):
+        self.values = values
+
+
+# top-level statements between env keyframes while running to a breakpoint
+KEYFRAME_EVERY = 50
+
+# cursor stop depth meaning "any depth"
+ANY_DEPTH = 1 << 30
+
+
+class CursorClosed(BaseException):
+    """Unwinds a paused cursor thread; BaseException so `except Exception` won't eat it."""
+
+
+class _CursorThread:
+    """
+    Runs `target` on a worker thread that can pause itself: pause(value)
+    hands `value` to the caller of send() and blocks until the next send().
+    This gives the debug cursor generator-style send()/close() on top of
+    the plain recursive execute()/eval(), so there is a single interpreter
+    and no second copy of it to keep in sync.
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._inbox = queue.SimpleQueue()
+        self._outbox = queue.SimpleQueue()
+        self._thread = None
+        self._paused = False
+
+    def send(self, value=None):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._main, daemon=True)
+            self._thread.start()
+        else:
+            self._inbox.put((False, value))
+        kind, payload = self._outbox.get()
+        self._paused = kind == "pause"
+        if kind == "pause":
+            return payload
+        if kind == "done":
+            raise StopIteration
+        raise payload
+
+    def close(self):
+        if self._paused:
+            self._paused = False
+            self._inbox.put((True, None))
+            self._outbox.get()   # wait until the worker has unwound
+
+    # worker side
+    def pause(self, value):
+        self._outbox.put(("pause", value))
+        closing, value = self._inbox.get()
+        if closing:
+            raise CursorClosed()
+        return value
+
+    def _main(self):
+        try:
+            self._target()
+        except CursorClosed:
+            pass
+        except BaseException as e:
+            self._outbox.put(("error", e))
+            return
+        self._outbox.put(("done", None))
+
+
+TRACE_FORMATS = ("full", "columnar", "off")
+
 
 class Interpreter:
-    def __init__(self):
+    def __init__(self, trace_format="full"):
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format '{trace_format}'")
+        self.trace_format = trace_format
+
         self.env = {}
         self.functions = {}
+        self.builtins = BUILTINS
         self.program = None
         self.pc = 0
 
         self.state = StateManager()
+        self.memory = MemoryAccountant()
+        # bumped whenever env may have changed (see MemoryAccountant)
+        self.env_version = 0
+        # in-place changes to lists / objects: all of them, and all but
+        # append (lets the columnar trace skip values that did not change)
+        self._mutations = 0
+        self._rewrites = 0
         self.used_vars = set()
         self._in_function = False
+        self._current_fn = None    # kaam whose body _invoke is running
 
         self.output = []
-        self.trace_log = []
+        self.trace_log = self._new_trace()
         self.warnings = []
 
         self.classes = {}
         self._objects_created = []
 
         self._trace_i = 0
-
+        self._defs_stamp = next(_DEF_STAMPS)
+
+        # debugger: line -> (condition source, condition node) or (None, None)
+        self.breakpoints = {}
+        self.breakpoint_hit = None
+        self._skip_break = None
+        self._continue_steps = 0
+        self._max_steps = None
+        self._recording = True
+
+        # fine-grained stepping cursor (see cursor_step)
+        self._cursor = None
+        self._pause = None
+        self._pause_top = False
+        self._stop = None
+        self._tracing = False
+        self._answers = []
+        self._output_mark = 0
+        self.frames = []
+
+        # pre-supplied pucho answers (non-interactive runs), see provide_inputs
+        self.input_queue = None
+        # time.monotonic() after which loops stop with ExecutionTimeout;
+        # works off the main thread, where SIGALRM can't be used
+        self.deadline = None
+
+        self.reset_counters()
+
+    def reset_counters(self):
+        # plain ints bumped on the hot path; app.utils.metrics folds them in
+        self.statements_executed = 0
+        self.call_cache_hits = 0
+        self.call_cache_misses = 0
+        self.method_cache_hits = 0
+        self.method_cache_misses = 0
+
+    def memory_report(self):
+        return self.memory.report(self)
+
+    def memory_kb(self):
+        return self.memory_report()["total_kb"]
+
+    def _new_trace(self):
+        return ColumnarTrace() if self.trace_format == "columnar" else []
 
     def _trace_snapshot(self, line=None):
+        if not self._recording or self.trace_format == "off":
+            return
+
+        if self.trace_format == "columnar":
+            self.trace_log.record(self._trace_i, line, self.env, (self._mutations, self._rewrites))
+            self._trace_i += 1
+            return
+
         try:
             env_copy = copy.deepcopy(self.env)
         except Exception:
@@ -161,23 +327,26 @@ class Interpreter:
         self._trace_i += 1
 
     def load(self, program):
+        self.drop_cursor(rewind=False)
         self.program = program
         self.env = {}
+        self.env_version += 1
         self.functions = {}
         self.pc = 0
         self.used_vars = set()
 
         self.output = []
-        self.trace_log = []
+        self.trace_log = self._new_trace()
         self.warnings = []
 
         self.classes = {}
         self._objects_created = []
 
         self._trace_i = 0
+        self._defs_stamp = next(_DEF_STAMPS)
 
         self.state.reset()
-        self.state.save(self.env)
+        self._save_state()
 
         self._trace_snapshot(line=None)
 
@@ -187,9 +356,9 @@ class Interpreter:
         self.used_vars = set()
 
         self.state.reset()
-        self.state.save(self.env)
+        self._save_state()
 
-        self.trace_log = []
+        self.trace_log = self._new_trace()
         self._trace_i = 0
         self._trace_snapshot(line=None)
 
@@ -204,16 +373,278 @@ class Interpreter:
                 self.warnings.append(f"⚠️ Warning: variable '{v}' define hua hai par use nahi hua.")
 
     def step(self):
+        if self._cursor is not None:
+            # a fine-grained step left us inside this statement: finish it
+            return self._cursor_finish_statement()
+
         if self.pc >= len(self.program.statements):
             return False
 
         stmt = self.program.statements[self.pc]
 
+        self._answers = []
+        self._output_mark = len(self.output) if isinstance(self.output, list) else 0
         self.execute(stmt)
-        self.state.save(self.env)
+        self._record_exec()
         self.pc += 1
+        self._save_state()
         return True
 
+    def skip_statement(self):
+        """Move past a top-level statement that failed with a runtime error."""
+        self._record_exec()
+        self.pc += 1
+
+    def _record_exec(self):
+        # pucho answers consumed by the statement are replayed with it
+        if self._answers:
+            self.state.record("exec", self.pc, tuple(self._answers))
+        else:
+            self.state.record("exec", self.pc)
+
+    def provide_inputs(self, values):
+        """Queue pucho answers up front; pucho consumes them instead of suspending."""
+        self.input_queue = deque(str(v) for v in values)
+
+    def _take_input(self):
+        raw = self.input_queue.popleft().strip()
+        self._answers.append(raw)
+        return raw
+
+    def answer_input(self, raw):
+        """
+        Answer the pucho a suspended top-level statement is waiting on. The
+        statement is rewound and re-run with every answer given so far, so a
+        pucho inside a block or kaam carries on where it stopped, and it is
+        recorded (with its answers) like any other executed statement.
+        Another pucho in the same statement raises InputRequest again.
+        """
+        answers = self._answers + [str(raw).strip()]
+
+        # output before the statement is already known (and may have been
+        # streamed): rewind on a scratch list, drop only the partial run's
+        output = self.output
+        del output[self._output_mark:]
+        self.output = []
+        try:
+            self._rewind_statement()
+        finally:
+            self.output = output
+
+        live_queue = self.input_queue
+        self.input_queue = deque(answers)
+        self._answers = []
+        try:
+            self.execute(self.program.statements[self.pc])
+        finally:
+            self.input_queue = live_queue
+
+        self._record_exec()
+        self.pc += 1
+        self._save_state()
+
+    # ---------- time travel (checkpoint + replay) ----------
+    def _save_state(self):
+        self.state.save(self.env, self.pc, self._checkpoint)
+
+    def _copy_memo(self):
+        # AYRClass / AST nodes are immutable at runtime: share, don't copy
+        memo = {}
+        for cls in self.classes.values():
+            memo[id(cls)] = cls
+        for obj in self._objects_created:
+            memo[id(obj.class_ref)] = obj.class_ref
+        return memo
+
+    def _checkpoint(self):
+        memo = self._copy_memo()
+        shared = (self.functions, self.classes, *memo.values())
+        env, objects = copy.deepcopy((self.env, self._objects_created), memo)
+        return {
+            "pc": self.pc,
+            "env": env,
+            "objects": objects,
+            # definitions are replaced, never mutated (see execute), so the
+            # dicts and the AST / classes in them are shared, not copied
+            "functions": self.functions,
+            "classes": self.classes,
+            "shared": shared,
+            "used_vars": set(self.used_vars),
+            "output_len": len(self.output) if isinstance(self.output, list) else 0,
+            "warnings_len": len(self.warnings),
+        }
+
+    def _restore(self, cp):
+        memo = {}
+        for cls in cp["classes"].values():
+            memo[id(cls)] = cls
+        for obj in cp["objects"]:
+            memo[id(obj.class_ref)] = obj.class_ref
+        self.env, self._objects_created = copy.deepcopy((cp["env"], cp["objects"]), memo)
+
+        self.env_version += 1
+        self.pc = cp["pc"]
+        self.functions = cp["functions"]
+        self.classes = cp["classes"]
+        self.used_vars = set(cp["used_vars"])
+        if isinstance(self.output, list):
+            del self.output[cp["output_len"]:]
+        del self.warnings[cp["warnings_len"]:]
+
+        self._defs_stamp = next(_DEF_STAMPS)
+        self._in_function = False
+        self._current_fn = None
+        self.last_input_var = None
+        self.last_input_vars = None
+
+    def travel(self, target: int):
+        """
+        Move the live interpreter to the state after saved step `target`:
+        restore the nearest checkpoint (when going back) and deterministically
+        re-execute the ledger forward, feeding recorded pucho answers.
+        """
+        st = self.state
+        if target < 0 or target >= len(st):
+            return False
+
+        self.drop_cursor()
+
+        start = st.index
+        if target < st.index:
+            start, payload = st.checkpoint_before(target)
+            self._restore(payload)
+
+        self._replay_steps(start, target)
+        st.index = target
+        return True
+
+    def _replay_steps(self, start, target, pending=()):
+        st = self.state
+        recording = self._recording
+        self._recording = False
+        try:
+            for j in range(start + 1, target + 1):
+                ops, pc_after = st.steps[j]
+                self._replay_ops(ops)
+                if pc_after is not None:
+                    self.pc = pc_after
+            self._replay_ops(pending)
+        finally:
+            self._recording = recording
+
+    def _rewind_statement(self):
+        """Undo a partly executed top-level statement: back to the state before it."""
+        st = self.state
+        pc = self.pc
+        start, payload = st.checkpoint_before(st.index)
+        self._restore(payload)
+        # statements finished since the last saved step are still pending
+        self._replay_steps(start, st.index, st.pending())
+        self.pc = pc
+
+    def _replay_ops(self, ops):
+        for op in ops:
+            stmt = self.program.statements[op[1]]
+            live_queue = self.input_queue
+            # feed the statement the same pucho answers it got originally
+            self.input_queue = deque(op[2]) if len(op) > 2 else None
+            try:
+                self.execute(stmt)
+            except Exception:
+                # failed the same way when it originally ran (skip_statement
+                # records any runtime error, not just ExpressionError)
+                pass
+            finally:
+                self.input_queue = live_queue
+
+    # ---------- breakpoints ----------
+    def set_breakpoint(self, line: int, condition=None, condition_node=None):
+        self.breakpoints[line] = (condition, condition_node)
+
+    def clear_breakpoint(self, line=None):
+        if line is None:
+            self.breakpoints = {}
+        else:
+            self.breakpoints.pop(line, None)
+
+    def _test_breakpoint(self, node):
+        condition, cond_node = self.breakpoints[node.line]
+        hit = {"line": node.line, "condition": condition}
+
+        if cond_node is not None:
+            # debugger expressions must not count as program reads, and
+            # calls in them are not stepped through
+            used = self.used_vars
+            tracing = self._tracing
+            self.used_vars = set()
+            self._tracing = False
+            try:
+                if not self._condition(self.eval(cond_node), node, "breakpoint condition"):
+                    return False
+            except ExpressionError as e:
+                hit["condition_error"] = str(e)
+            except InputRequest:
+                hit["condition_error"] = "Breakpoint condition me pucho allowed nahi hai."
+            finally:
+                self.used_vars = used
+                self._tracing = tracing
+
+        try:
+            hit["env"] = copy.deepcopy(self.env)
+        except Exception:
+            hit["env"] = dict(self.env)
+        hit["paused"] = "before"
+        self.breakpoint_hit = hit
+        return True
+
+    def run_to_breakpoint(self, max_steps: int = 100000):
+        """
+        Run the cursor at full speed (no trace snapshots, history saved only
+        every KEYFRAME_EVERY top-level statements) until a breakpoint fires,
+        the program ends or `max_steps` top-level statements have run.
+
+        A breakpoint pauses *before* the statement on its line, at any
+        depth: the cursor stays paused at the hit, so env and frames are the
+        live state there and stepping / continuing resumes from it. The
+        statement the run starts from never re-triggers.
+
+        Returns "breakpoint" | "done" | "max_steps". A pucho raises
+        InputRequest (the cursor waits for the answer) and runtime errors
+        propagate exactly like step().
+        """
+        if self._cursor is None and self.pc >= len(self.program.statements):
+            return "done"
+        if self.cursor_waiting_input():
+            self._raise_cursor_input()
+
+        self.breakpoint_hit = None
+        self._continue_steps = 0
+        self._max_steps = max_steps
+        self._recording = False
+        try:
+            if self._cursor is None:
+                self._skip_break = self.program.statements[self.pc]
+                alive = self._start_cursor(("break", None))
+            else:
+                self._skip_break = None
+                alive = self._cursor_resume(("break", None))
+        finally:
+            self._recording = True
+            self._skip_break = None
+
+        if self._continue_steps or self.breakpoint_hit is not None:
+            self._trace_snapshot(line=self.breakpoint_hit["line"] if self.breakpoint_hit else None)
+
+        if not alive:
+            return "done"
+        if self._pause[0] == "input":
+            self._raise_cursor_input()
+        if self.breakpoint_hit is not None:
+            return "breakpoint"
+        # stopped at a top-level boundary: nothing to keep the cursor for
+        self.drop_cursor()
+        return "max_steps"
+
     def format_string(self, text: str, line: int):
 
         def resolve_expr(expr: str):
@@ -269,11 +700,18 @@ class Interpreter:
         return re.sub(r"\{([^{}]+)\}", replacer, text)
 
     def execute(self, node):
+        self.statements_executed += 1
+        self.env_version += 1
+        if self._tracing:
+            self._cursor_statement(node)
+
         if isinstance(node, ClassDefNode):
             methods_map = {}
             for m in node.methods:
                 methods_map[m.name] = m
-            self.classes[node.name] = AYRClass(node.name, methods_map)
+            # copy-on-write: checkpoints hold on to the old dict
+            self.classes = {**self.classes, node.name: AYRClass(node.name, methods_map)}
+            self._defs_stamp = next(_DEF_STAMPS)
 
             if hasattr(node, "line"):
                 self._trace_snapshot(line=node.line)
@@ -281,11 +719,16 @@ class Interpreter:
 
         # ---------- assignment ----------
         if isinstance(node, VarAssignNode):
-            try:
-                self.env[node.name] = self.eval(node.value)
-            except InputRequest as inp:
-                self.last_input_var = node.name
-                raise InputRequest(inp.line)
+            if self._tracing and isinstance(node.value, InputNode) and not self.input_queue:
+                # the cursor waits on the assignment, so the answer knows its variable
+                raw = self._cursor_wait_input(node)
+                self.env[node.name] = ExpressionError.infer_input_type(raw)
+            else:
+                try:
+                    self.env[node.name] = self.eval(node.value)
+                except InputRequest as inp:
+                    self.last_input_var = node.name
+                    raise InputRequest(inp.line)
 
         elif isinstance(node, MemberAssignNode):
             obj = self.eval(node.obj)
@@ -296,11 +739,28 @@ class Interpreter:
                     node.expr_text
                 )
             obj.fields[node.member] = self.eval(node.value)
+            self._mutations += 1
+            self._rewrites += 1
 
         elif isinstance(node, MultiAssignNode):
-            self.last_input_vars = node.names
-            self.last_input_line = node.line
-            raise InputRequest(node.line)
+            if self.input_queue:
+                raw = self._take_input()
+            elif self._tracing:
+                raw = self._cursor_wait_input(node)
+            else:
+                self.last_input_vars = node.names
+                self.last_input_line = node.line
+                raise InputRequest(node.line)
+
+            parts = raw.split()
+            if len(parts) != len(node.names):
+                raise ExpressionError(
+                    node.line,
+                    "Input count aur variables ka count match nahi karta.",
+                    node.expr_text
+                )
+            for name, part in zip(node.names, parts):
+                self.env[name] = ExpressionError.infer_input_type(part)
 
         # ---------- print ----------
         elif isinstance(node, PrintNode):
@@ -309,11 +769,11 @@ class Interpreter:
 
         # ---------- if ----------
         elif isinstance(node, IfNode):
-            if self.eval(node.condition):
+            if self._condition(self.eval(node.condition), node, "agar"):
                 self.exec_block(node.body)
             else:
                 for cond, body in node.elif_blocks:
-                    if self.eval(cond):
+                    if self._condition(self.eval(cond), node, "warna agar"):
                         self.exec_block(body)
                         if hasattr(node, "line"):
                             self._trace_snapshot(line=node.line)
@@ -323,7 +783,9 @@ class Interpreter:
 
         # ---------- while ----------
         elif isinstance(node, WhileNode):
-            while self.eval(node.condition):
+            while self._condition(self.eval(node.condition), node, "jabtak"):
+                if self.deadline is not None:
+                    self._check_deadline()
                 try:
                     self.exec_block(node.body)
                 except BreakSignal:
@@ -334,14 +796,16 @@ class Interpreter:
         # ---------- for ----------
         elif isinstance(node, ForNode):
             iterable = self.eval(node.iterable)
-            if not isinstance(iterable, (list, tuple, dict)):
+            if not isinstance(iterable, (list, tuple, dict, AYRRange, AYRArray)):
                 raise ExpressionError(
                     node.line,
-                    "For-loop sirf list / tuple / dict par allowed hai.",
+                    "For-loop sirf list / tuple / dict / range / array par allowed hai.",
                     "har"
                 )
 
             for idx, val in enumerate(iterable):
+                if self.deadline is not None:
+                    self._check_deadline()
                 self.env[node.var_name] = val
                 if node.index_name:
                     self.env[node.index_name] = idx
@@ -361,7 +825,8 @@ class Interpreter:
 
         # ---------- functions ----------
         elif isinstance(node, FunctionDefNode):
-            self.functions[node.name] = node
+            self.functions = {**self.functions, node.name: node}
+            self._defs_stamp = next(_DEF_STAMPS)
 
         elif isinstance(node, FunctionCallNode):
             self.eval(node)
@@ -370,41 +835,11 @@ class Interpreter:
             self.call_method(node)
 
         elif isinstance(node, IndexAssignNode):
-            collection = self.eval(node.collection)
-            index = self.eval(node.index)
-            value = self.eval(node.value)
-
-            # ---------- LIST ----------
-            if isinstance(collection, list):
-                if not isinstance(index, int):
-                    raise ExpressionError(
-                        node.line,
-                        "List index number hona chahiye.",
-                        node.expr_text
-                    )
-                if index < 0 or index >= len(collection):
-                    raise ExpressionError(
-                        node.line,
-                        "List index limit ke bahar hai.",
-                        node.expr_text
-                    )
-                collection[index] = value
-
-                if hasattr(node, "line"):
-                    self._trace_snapshot(line=node.line)
-                return
-
-            if isinstance(collection, dict):
-                collection[index] = value
-
-                if hasattr(node, "line"):
-                    self._trace_snapshot(line=node.line)
-                return
-
-            raise ExpressionError(
-                node.line,
-                "Index assignment sirf list ya dictionary par allowed hai.",
-                node.expr_text
+            self._index_set(
+                self.eval(node.collection),
+                self.eval(node.index),
+                self.eval(node.value),
+                node
             )
 
         elif isinstance(node, ReturnNode):
@@ -414,15 +849,168 @@ class Interpreter:
                     "wapas function ke bahar allowed nahi hai.",
                     "wapas"
                 )
-            raise ReturnSignal(self.eval(node.value) if node.value else None)
+            value = node.value
+            if node.tail_call and self._current_fn is not None:
+                cache = self._lookup_call(value)
+                # still the same kaam (not redefined since): reuse the frame
+                if cache[1] == "function" and cache[2] is self._current_fn:
+                    raise TailCall([self.eval(a) for a in value.args])
+                raise ReturnSignal(self._dispatch_call(cache, value))
+            raise ReturnSignal(self.eval(value) if value else None)
         if hasattr(node, "line"):
             self._trace_snapshot(line=node.line)
 
+    # ---------- value helpers (shared by eval and the debug cursor) ----------
+    def _index_get(self, collection, index, node):
+        if isinstance(collection, list):
+            if not isinstance(index, int):
+                raise ExpressionError(
+                    node.line,
+                    "List index number hona chahiye.",
+                    node.expr_text
+                )
+            if index < 0 or index >= len(collection):
+                raise ExpressionError(
+                    node.line,
+                    "List index limit ke bahar hai.",
+                    node.expr_text
+                )
+            return collection[index]
+
+        if isinstance(collection, dict):
+            if index not in collection:
+                raise ExpressionError(
+                    node.line,
+                    "Dictionary me ye key maujood nahi hai.",
+                    node.expr_text
+                )
+            return collection[index]
+
+        if isinstance(collection, AYRArray):
+            self._check_array_index(collection, index, node)
+            return collection.item(index)
+
+        raise ExpressionError(
+            node.line,
+            "Indexing sirf list, dictionary ya array par hoti hai.",
+            node.expr_text
+        )
+
+    def _index_set(self, collection, index, value, node):
+        self._mutations += 1
+        self._rewrites += 1
+        # ---------- LIST ----------
+        if isinstance(collection, list):
+            if not isinstance(index, int):
+                raise ExpressionError(
+                    node.line,
+                    "List index number hona chahiye.",
+                    node.expr_text
+                )
+            if index < 0 or index >= len(collection):
+                raise ExpressionError(
+                    node.line,
+                    "List index limit ke bahar hai.",
+                    node.expr_text
+                )
+            collection[index] = value
+            return
+
+        if isinstance(collection, dict):
+            collection[index] = value
+            return
+
+        if isinstance(collection, AYRArray):
+            self._check_array_index(collection, index, node)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ExpressionError(
+                    node.line,
+                    "Array me sirf number assign ho sakta hai.",
+                    node.expr_text
+                )
+            try:
+                collection.set_item(index, value)
+            except BuiltinError as e:
+                raise ExpressionError(node.line, e.message, node.expr_text)
+            return
+
+        raise ExpressionError(
+            node.line,
+            "Index assignment sirf list, dictionary ya array par allowed hai.",
+            node.expr_text
+        )
+
+    def _member_get(self, obj, node):
+        if not isinstance(obj, AYRObject):
+            raise ExpressionError(
+                node.line,
+                "Dot access - sirf object par hota hai",
+                node.expr_text
+            )
+        if node.member not in obj.fields:
+            raise ExpressionError(
+                node.line,
+                f"Property '{node.member}' nahi mila",
+                node.expr_text
+            )
+        return obj.fields[node.member]
+
+    def _unary(self, val, node):
+        if not isinstance(val, bool):
+            raise ExpressionError(
+                node.line,
+                "Unary operator sirf boolean par kaam karta hai.",
+                "nahi"
+            )
+        return not val
+
+    def _condition(self, value, node, keyword):
+        if isinstance(value, AYRArray):
+            raise ExpressionError(
+                node.line,
+                "Array ko condition me seedha use nahi kar sakte, any() ya all() lagao.",
+                keyword
+            )
+        return value
+
+    def _check_array_index(self, arr: AYRArray, index, node):
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ExpressionError(
+                node.line,
+                "Array index number hona chahiye.",
+                node.expr_text
+            )
+        if index < 0 or index >= len(arr):
+            raise ExpressionError(
+                node.line,
+                "Array index limit ke bahar hai.",
+                node.expr_text
+            )
+
     # ---------- execute block ----------
     def exec_block(self, stmts):
+        if self._tracing:
+            return self._exec_block_traced(stmts)
         for s in stmts:
             self.execute(s)
 
+    def _push_frame(self, name):
+        if not self._tracing:
+            return False
+        self.frames.append({"function": name, "line": None, "blocks": []})
+        return True
+
+    def _exec_block_traced(self, stmts):
+        # the cursor reports the statement index of every block it is inside
+        blocks = self.frames[-1]["blocks"]
+        blocks.append(0)
+        try:
+            for i, s in enumerate(stmts):
+                blocks[-1] = i
+                self.execute(s)
+        finally:
+            blocks.pop()
+
 
     def eval(self, node):
 
@@ -440,6 +1028,10 @@ class Interpreter:
             return None
 
         if isinstance(node, InputNode):
+            if self.input_queue:
+                return ExpressionError.infer_input_type(self._take_input())
+            if self._tracing:
+                return ExpressionError.infer_input_type(self._cursor_wait_input(node))
             raise InputRequest(node.line)
 
         # ---------- VARIABLE ----------
@@ -454,20 +1046,7 @@ class Interpreter:
             return self.env[node.name]
 
         if isinstance(node, MemberAccessNode):
-            obj = self.eval(node.obj)
-            if not isinstance(obj, AYRObject):
-                raise ExpressionError(
-                    node.line,
-                    "Dot access - sirf object par hota hai",
-                    node.expr_text
-                )
-            if node.member not in obj.fields:
-                raise ExpressionError(
-                    node.line,
-                    f"Property '{node.member}' nahi mila",
-                    node.expr_text
-                )
-            return obj.fields[node.member]
+            return self._member_get(self.eval(node.obj), node)
 
         # ---------- LIST ----------
         if isinstance(node, ListNode):
@@ -493,49 +1072,11 @@ class Interpreter:
 
         # ---------- INDEX ACCESS ----------
         if isinstance(node, IndexAccessNode):
-            collection = self.eval(node.collection)
-            index = self.eval(node.index)
-
-            if isinstance(collection, list):
-                if not isinstance(index, int):
-                    raise ExpressionError(
-                        node.line,
-                        "List index number hona chahiye.",
-                        node.expr_text
-                    )
-                if index < 0 or index >= len(collection):
-                    raise ExpressionError(
-                        node.line,
-                        "List index limit ke bahar hai.",
-                        node.expr_text
-                    )
-                return collection[index]
-
-            if isinstance(collection, dict):
-                if index not in collection:
-                    raise ExpressionError(
-                        node.line,
-                        "Dictionary me ye key maujood nahi hai.",
-                        node.expr_text
-                    )
-                return collection[index]
-
-            raise ExpressionError(
-                node.line,
-                "Indexing sirf list ya dictionary par hoti hai.",
-                node.expr_text
-            )
+            return self._index_get(self.eval(node.collection), self.eval(node.index), node)
 
         # ---------- UNARY ----------
         if isinstance(node, UnaryOpNode):
-            val = self.eval(node.node)
-            if not isinstance(val, bool):
-                raise ExpressionError(
-                    node.line,
-                    "Unary operator sirf boolean par kaam karta hai.",
-                    "nahi"
-                )
-            return not val
+            return self._unary(self.eval(node.node), node)
 
         # ---------- BINARY ----------
         if isinstance(node, BinaryOpNode):
@@ -546,17 +1087,68 @@ class Interpreter:
                 node
             )
         if isinstance(node, FunctionCallNode):
-            # constructor call
-            if node.name in self.classes:
-                return self.instantiate(node)
-            # normal function
-            return self.call(node)
+            return self._dispatch_call(self._lookup_call(node), node)
 
         if isinstance(node, MethodCallNode):
             return self.call_method(node)
         return None
 
-    def call(self, call):
+    def _lookup_call(self, node: FunctionCallNode):
+        # inline cache: (defs stamp, kind, resolved target)
+        cache = getattr(node, "_call_cache", None)
+        if cache is None or cache[0] != self._defs_stamp:
+            cache = self._resolve_call(node)
+            node._call_cache = cache
+            self.call_cache_misses += 1
+        else:
+            self.call_cache_hits += 1
+        return cache
+
+    def _dispatch_call(self, cache, node: FunctionCallNode):
+        kind = cache[1]
+        if kind == "function":
+            return self._invoke(cache[2], node.args)
+        if kind == "class":
+            # constructor call
+            return self._construct(node, *cache[2])
+        return self._call_builtin(cache[2], node)
+
+    def _resolve_call(self, call: FunctionCallNode):
+        """
+        Slow path for FunctionCallNode: pick class vs function vs builtin and
+        validate arity once. Result is cached on the node until the next
+        definition. User kaam functions shadow builtins of the same name.
+        """
+        if call.name in self.classes:
+            cls, init_method = self._resolve_constructor(call)
+            return (self._defs_stamp, "class", (cls, init_method))
+        if call.name not in self.functions and call.name in self.builtins:
+            return (self._defs_stamp, "builtin", self._resolve_builtin(call))
+        return (self._defs_stamp, "function", self._resolve_function(call))
+
+    def _resolve_builtin(self, call: FunctionCallNode):
+        b = self.builtins[call.name]
+        n = len(call.args)
+        if n < b.min_args or (b.max_args != -1 and n > b.max_args):
+            raise ExpressionError(
+                call.line,
+                "Function arguments ka count galat hai.",
+                call.name
+            )
+        return b
+
+    def _call_builtin(self, b, call: FunctionCallNode):
+        args = [self.eval(a) for a in call.args]
+        if b.mutates:
+            self._mutations += 1
+            if b.mutates == "rewrite":
+                self._rewrites += 1
+        try:
+            return b.fn(*args)
+        except BuiltinError as e:
+            raise ExpressionError(call.line, e.message, call.name)
+
+    def _resolve_function(self, call: FunctionCallNode):
         if call.name not in self.functions:
             raise ExpressionError(
                 call.line,
@@ -572,30 +1164,56 @@ class Interpreter:
                 "Function arguments ka count galat hai.",
                 call.name
             )
+        return fn
+
+    def call(self, call):
+        return self._invoke(self._resolve_function(call), call.args)
 
+    def _invoke(self, fn: FunctionDefNode, args):
         local_env = self.env.copy()
-        for p, a in zip(fn.params, call.args):
+        for p, a in zip(fn.params, args):
             local_env[p] = self.eval(a)
 
         old_env = self.env
         old_flag = self._in_function
+        old_fn = self._current_fn
 
         self.env = local_env
         self._in_function = True
+        self._current_fn = fn
+        traced = self._push_frame(fn.name)
 
         try:
-            for s in fn.body:
-                self.execute(s)
+            while True:
+                try:
+                    self.exec_block(fn.body)
+                    return None
+                except TailCall as t:
+                    if self.deadline is not None:
+                        self._check_deadline()
+                    self._on_tail_call(fn)
+                    # self tail call: new params in a fresh frame env, no Python recursion
+                    local_env = self.env.copy()
+                    for p, v in zip(fn.params, t.values):
+                        local_env[p] = v
+                    self.env = local_env
         except ReturnSignal as r:
+            return r.value
+        finally:
             self.env = old_env
             self._in_function = old_flag
-            return r.value
+            self._current_fn = old_fn
+            if traced:
+                self.frames.pop()
 
-        self.env = old_env
-        self._in_function = old_flag
-        return None
+    def _on_tail_call(self, fn: FunctionDefNode):
+        """Hook: `fn` runs its body again for a self tail call (no new _invoke)."""
 
-    def instantiate(self, ctor_call: FunctionCallNode):
+    def _check_deadline(self):
+        if time.monotonic() > self.deadline:
+            raise ExecutionTimeout("Program time limit se zyada chala, rok diya gaya.")
+
+    def _resolve_constructor(self, ctor_call: FunctionCallNode):
         cls = self.classes.get(ctor_call.name)
 
         if not isinstance(cls, AYRClass):
@@ -605,9 +1223,6 @@ class Interpreter:
                 ctor_call.name
             )
 
-        obj = AYRObject(class_ref=cls, fields={})
-        self._objects_created.append(obj)
-
         # auto __init__
         if "__init__" in cls.methods:
             init_method = cls.methods["__init__"]
@@ -626,19 +1241,28 @@ class Interpreter:
                     "Constructor arguments ka count galat hai.",
                     f"{cls.name}(...)"
                 )
+            return cls, init_method
+
+        # no __init__ is fine
+        if len(ctor_call.args) != 0:
+            raise ExpressionError(
+                ctor_call.line,
+                "Class has no __init__, so constructor args not allowed.",
+                f"{cls.name}(...)"
+            )
+        return cls, None
+
+    def instantiate(self, ctor_call: FunctionCallNode):
+        return self._construct(ctor_call, *self._resolve_constructor(ctor_call))
+
+    def _construct(self, ctor_call: FunctionCallNode, cls: AYRClass, init_method):
+        obj = AYRObject(class_ref=cls, fields={})
+        self._objects_created.append(obj)
 
+        if init_method is not None:
             # call method with obj injected
             self._execute_method(obj, init_method, ctor_call.args, ctor_call.line)
 
-        else:
-            # no __init__ is fine
-            if len(ctor_call.args) != 0:
-                raise ExpressionError(
-                    ctor_call.line,
-                    "Class has no __init__, so constructor args not allowed.",
-                    f"{cls.name}(...)"
-                )
-
         return obj
 
     def call_method(self, call: MethodCallNode):
@@ -650,7 +1274,20 @@ class Interpreter:
                 call.expr_text
             )
 
+        # inline cache keyed on the receiver's class: (AYRClass, method)
         cls = obj.class_ref
+        cache = getattr(call, "_method_cache", None)
+        if cache is not None and cache[0] is cls:
+            method_node = cache[1]
+            self.method_cache_hits += 1
+        else:
+            method_node = self._resolve_method(call, cls)
+            call._method_cache = (cls, method_node)
+            self.method_cache_misses += 1
+
+        return self._execute_method(obj, method_node, call.args, call.line)
+
+    def _resolve_method(self, call: MethodCallNode, cls: AYRClass):
         if call.method not in cls.methods:
             raise ExpressionError(
                 call.line,
@@ -675,7 +1312,7 @@ class Interpreter:
                 call.expr_text
             )
 
-        return self._execute_method(obj, method_node, call.args, call.line)
+        return method_node
 
     def _execute_method(self, obj: AYRObject, method_node: MethodDefNode, user_args, call_line: int):
         local_env = self.env.copy()
@@ -688,24 +1325,27 @@ class Interpreter:
 
         old_env = self.env
         old_flag = self._in_function
+        old_fn = self._current_fn
 
         self.env = local_env
         self._in_function = True
+        self._current_fn = None
+        traced = self._push_frame(f"{obj.class_ref.name}.{method_node.name}")
 
         try:
-            for s in method_node.body:
-                self.execute(s)
+            self.exec_block(method_node.body)
         except ReturnSignal as r:
             if method_node.name in ("__init__", "__del__"):
                 self.warnings.append(
                     f"⚠️ Warning (Line {call_line}): '{method_node.name}' should not return a value."
                 )
+            return r.value
+        finally:
             self.env = old_env
             self._in_function = old_flag
-            return r.value
-
-        self.env = old_env
-        self._in_function = old_flag
+            self._current_fn = old_fn
+            if traced:
+                self.frames.pop()
         return None
 
     def _run_destructors(self):
@@ -724,3 +1364,195 @@ class Interpreter:
                 )
 
             self._execute_method(obj, d, [], d.line)
+
+    # ============================================================
+    # FINE-GRAINED DEBUG CURSOR
+    # ============================================================
+    #
+    # The cursor runs the program's remaining top-level statements through
+    # the regular execute()/eval() on a _CursorThread. While it is active,
+    # execute() calls _cursor_statement() before every statement at any
+    # depth, and pucho asks the cursor for its answer; either may pause the
+    # thread. `self.frames` is the call stack, each frame with the
+    # statement index of every block it is inside. Run mode never starts
+    # the cursor and only pays for the `_tracing` checks.
+
+    def cursor_active(self):
+        return self._cursor is not None
+
+    def cursor_waiting_input(self):
+        return self._cursor is not None and self._pause is not None and self._pause[0] == "input"
+
+    def cursor_info(self):
+        if self._cursor is None or self._pause is None:
+            return {"active": False, "frames": [], "depth": 0, "line": None, "waiting": None}
+
+        kind, node = self._pause
+        return {
+            "active": True,
+            "waiting": kind,
+            "line": node.line,
+            "depth": len(self.frames),
+            "frames": [
+                {"function": f["function"], "line": f["line"], "blocks": list(f["blocks"])}
+                for f in self.frames
+            ],
+        }
+
+    def cursor_step(self, mode: str = "into"):
+        """
+        Advance the cursor: "into" stops at the very next statement, "over"
+        at the next one in this frame or a caller, "out" at the next one in
+        a caller (in the main program: the next top-level one).
+        Returns "paused" | "input" | "done".
+        Runtime errors propagate and drop the cursor.
+        """
+        if self._cursor is None:
+            if self.pc >= len(self.program.statements):
+                return "done"
+            # pause before the statement at pc, then take the step from there
+            if not self._start_cursor(("depth", ANY_DEPTH)):
+                return "done"
+
+        if self._pause[0] == "input":
+            return "input"
+
+        depth = len(self.frames)
+        target = {"over": depth, "out": max(depth - 1, 1)}.get(mode, ANY_DEPTH)
+        if not self._cursor_resume(("depth", target)):
+            return "done"
+        return "input" if self._pause[0] == "input" else "paused"
+
+    def cursor_input(self, raw):
+        """Feed a pucho answer to the paused cursor and stop at the next statement."""
+        node = self._pause[1]
+        raw = str(raw).strip()
+
+        if isinstance(node, MultiAssignNode) and len(raw.split()) != len(node.names):
+            raise ExpressionError(
+                node.line,
+                "Input count aur variables ka count match nahi karta.",
+                ", ".join(node.names)
+            )
+
+        if not self._cursor_resume(("depth", ANY_DEPTH), raw):
+            return "done"
+        return "input" if self._pause[0] == "input" else "paused"
+
+    def drop_cursor(self, rewind=True):
+        """Stop the cursor; a partly run statement is rewound to its start."""
+        if self._cursor is None:
+            return
+        partial = rewind and not self._pause_top
+        # unwinding runs the finally blocks of the calls it was inside
+        self._cursor.close()
+        self._cursor_ended()
+        if partial:
+            self._rewind_statement()
+        if self.state.pending():
+            # statements a breakpoint run finished since its last keyframe
+            self._save_state()
+
+    def _raise_cursor_input(self):
+        node = self._pause[1]
+        if isinstance(node, MultiAssignNode):
+            self.last_input_vars = node.names
+            self.last_input_line = node.line
+        else:
+            self.last_input_var = getattr(node, "name", None)
+        raise InputRequest(node.line)
+
+    def _cursor_finish_statement(self):
+        """Run the cursor until the current top-level statement completes."""
+        if self._pause[0] == "input":
+            self._raise_cursor_input()
+
+        self._cursor_resume(("top", None))
+        if self._cursor is not None and self._pause_top:
+            # nothing of the next statement ran yet: plain stepping from here
+            self.drop_cursor()
+        return True
+
+    def _start_cursor(self, stop):
+        self.frames = [{"function": "<main>", "line": None, "blocks": []}]
+        self._cursor = _CursorThread(self._cursor_main)
+        return self._cursor_resume(stop)
+
+    def _cursor_resume(self, stop, value=None):
+        self._stop = stop
+        # a pucho answer lands in env without a new statement
+        self.env_version += 1
+        try:
+            self._pause = self._cursor.send(value)
+            return True
+        except StopIteration:
+            self._cursor_ended()
+            return False
+        except BaseException:
+            self._cursor_ended()
+            raise
+
+    def _cursor_ended(self):
+        self._cursor = None
+        self._pause = None
+        self._pause_top = False
+        self._tracing = False
+        self.frames = []
+
+    # ---------- cursor thread side ----------
+    def _cursor_main(self):
+        self._tracing = True
+        try:
+            while self.pc < len(self.program.statements):
+                self.frames[0]["blocks"] = [self.pc]
+                self._answers = []
+                self.execute(self.program.statements[self.pc])
+                self._record_exec()
+                self.pc += 1
+                self._continue_steps += 1
+                if self._recording or self._continue_steps % KEYFRAME_EVERY == 0:
+                    self._save_state()
+            if self.state.pending():
+                self._save_state()
+        finally:
+            self._tracing = False
+
+    def _cursor_statement(self, node):
+        frames = self.frames
+        frames[-1]["line"] = node.line
+        top = len(frames) == 1 and len(frames[0]["blocks"]) == 1
+
+        kind, depth = self._stop
+        if kind == "top":
+            pause = top
+        elif kind == "break":
+            pause = False
+            if node is self._skip_break:
+                self._skip_break = None
+            elif node.line in self.breakpoints:
+                pause = self._test_breakpoint(node)
+            if not pause and top:
+                pause = self._continue_steps >= self._max_steps
+        else:
+            # a pucho statement pauses for its answer instead
+            pause = len(frames) <= depth and not _takes_input(node)
+
+        if pause:
+            if top and self.state.pending():
+                # a clean boundary: keep the history exact up to here
+                self._save_state()
+            self._pause_top = top
+            self._cursor.pause(("stmt", node))
+
+    def _cursor_wait_input(self, node):
+        self._pause_top = False
+        raw = self._cursor.pause(("input", node))
+        # replayed with the statement, like answers taken from input_queue
+        self._answers.append(raw)
+        return raw
+
+
+def _takes_input(node):
+    return isinstance(node, MultiAssignNode) or (
+        isinstance(node, VarAssignNode) and isinstance(node.value, InputNode)
+    )
@@ -29,6 +29,12 @@ OPERATORS = {
     "."
 }
 
+class LexerError(Exception):
+    def __init__(self, message, line):
+        super().__init__(message)
+        self.line = line
+
+
 @dataclass
 class Token:
     type: str
@@ -59,10 +65,18 @@ class Lexer:
             self.advance()
             op += self.current_char
         self.advance()
-        return Token(TOKEN_OPERATOR, op, self.pos, self.line)
+        return (TOKEN_OPERATOR, op, self.pos, self.line)
 
     def tokenize(self):
-        tokens = []
+        return [Token(*t) for t in self._scan()]
+
+    def stream(self):
+        """Tokens one at a time, lexed only when the consumer asks for the next one."""
+        for t in self._scan():
+            yield Token(*t)
+
+    def _scan(self):
+        """Yield every token as a (type, value, position, line) tuple."""
         at_line_start = True
 
         while self.current_char:
@@ -87,17 +101,17 @@ class Lexer:
 
                     if indent > prev:
                         self.indent_stack.append(indent)
-                        tokens.append(Token(TOKEN_INDENT, None, self.pos, self.line))
+                        yield (TOKEN_INDENT, None, self.pos, self.line)
 
                     elif indent < prev:
                         while indent < self.indent_stack[-1]:
                             self.indent_stack.pop()
-                            tokens.append(Token(TOKEN_DEDENT, None, self.pos, self.line))
+                            yield (TOKEN_DEDENT, None, self.pos, self.line)
 
                     at_line_start = False
 
             if self.current_char == "\n":
-                tokens.append(Token(TOKEN_NEWLINE, "\n", self.pos, self.line))
+                yield (TOKEN_NEWLINE, "\n", self.pos, self.line)
                 self.advance()
                 self.line += 1
                 at_line_start = True
@@ -117,12 +131,12 @@ class Lexer:
                 while self.current_char and (self.current_char.isdigit() or self.current_char == "."):
                     num += self.current_char
                     self.advance()
-                tokens.append(Token(
+                yield (
                     TOKEN_NUMBER,
                     float(num) if "." in num else int(num),
                     self.pos,
                     self.line
-                ))
+                )
                 continue
 
             if self.current_char.isalpha() or self.current_char == "_":
@@ -131,7 +145,7 @@ class Lexer:
                     name += self.current_char
                     self.advance()
                 t = TOKEN_KEYWORD if name in KEYWORDS else TOKEN_IDENTIFIER
-                tokens.append(Token(t, name, self.pos, self.line))
+                yield (t, name, self.pos, self.line)
                 continue
 
             if self.current_char == '"':
@@ -141,18 +155,17 @@ class Lexer:
                     val += self.current_char
                     self.advance()
                 self.advance()
-                tokens.append(Token(TOKEN_STRING, val, self.pos, self.line))
+                yield (TOKEN_STRING, val, self.pos, self.line)
                 continue
 
             if self.current_char in "+-*/%=!<>&|(),[]{}:.":
-                tokens.append(self.make_operator())
+                yield self.make_operator()
                 continue
 
-            raise Exception(f"Invalid character '{self.current_char}' at line {self.line}")
+            raise LexerError(f"Invalid character '{self.current_char}' at line {self.line}", self.line)
 
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            tokens.append(Token(TOKEN_DEDENT, None, self.pos, self.line))
+            yield (TOKEN_DEDENT, None, self.pos, self.line)
 
-        tokens.append(Token(TOKEN_EOF, None, self.pos, self.line))
-        return tokens
+        yield (TOKEN_EOF, None, self.pos, self.line)
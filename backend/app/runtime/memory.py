@@ -0,0 +1,96 @@
+import sys
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate recursive size in bytes (shared objects counted once)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_sizeof(k, seen) + deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += deep_sizeof(v, seen)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+
+    return size
+
+
+def _kb(n):
+    return round(n / 1024, 2)
+
+
+class _ListMeter:
+    """
+    Running deep size of an append-mostly list (trace_log, output). Only
+    items appended since the last measure are sized; if the list was
+    replaced or truncated it is re-measured from scratch.
+    """
+
+    def __init__(self):
+        self._ref = None
+        self._count = 0
+        self._bytes = 0
+
+    def measure(self, items):
+        if hasattr(items, "nbytes"):
+            # columnar trace keeps its own tally
+            return items.nbytes()
+
+        if not isinstance(items, list):
+            # e.g. the streaming output sink keeps nothing in memory
+            self._ref, self._count, self._bytes = None, 0, 0
+            return 0
+
+        if items is not self._ref or len(items) < self._count:
+            self._ref, self._count, self._bytes = items, 0, 0
+
+        for item in items[self._count:]:
+            self._bytes += deep_sizeof(item)
+        self._count = len(items)
+
+        return self._bytes + sys.getsizeof(items)
+
+
+class MemoryAccountant:
+    """
+    Deep memory usage of one interpreter session, split into history
+    (checkpoints + replay ledger), trace_log, output and env.
+
+    History is tallied by StateManager as steps are saved, trace/output
+    only size their new entries, and env is re-measured only after the
+    interpreter bumped `env_version` (any statement run, restore or cursor
+    resume), so repeated responses for the same state cost nothing.
+    """
+
+    def __init__(self):
+        self._trace = _ListMeter()
+        self._output = _ListMeter()
+        self._env_key = None
+        self._env_bytes = 0
+
+    def _env_size(self, interp):
+        # in-place changes keep id(env) and may not save a step
+        key = (id(interp.env), interp.env_version)
+        if key != self._env_key:
+            self._env_bytes = deep_sizeof(interp.env)
+            self._env_key = key
+        return self._env_bytes
+
+    def report(self, interp):
+        parts = {
+            "history": interp.state.history_bytes(),
+            "trace": self._trace.measure(interp.trace_log),
+            "output": self._output.measure(interp.output),
+            "env": self._env_size(interp),
+        }
+        report = {f"{k}_kb": _kb(v) for k, v in parts.items()}
+        report["total_kb"] = _kb(sum(parts.values()))
+        return report
@@ -120,6 +120,8 @@ class ContinueNode:
 class ReturnNode:
     value: Optional[Any]
     line: int
+    # `wapas f(...)` inside kaam f: run as a loop (set by the parser)
+    tail_call: bool = False
 
 
 # ============================================================
@@ -2,16 +2,55 @@ from app.runtime.lexer import *
 from app.runtime.nodes import *
 
 
+# errors collected before parse() gives up on a badly broken file
+MAX_PARSE_ERRORS = 50
+
+
+class ParseErrors(Exception):
+    """
+    Every syntax error found in one pass, as (line, message) pairs.
+    str() is the first message, same as the single error raised before.
+    """
+
+    def __init__(self, errors):
+        super().__init__(errors[0][1])
+        self.errors = errors
+
+
+# binding power of binary operators (higher binds tighter); `nahi` is a
+# prefix operator handled in unary() and binds tighter than all of them
+BINARY_POWER = {
+    (TOKEN_KEYWORD, "aur"): 1,
+    (TOKEN_KEYWORD, "ya"): 1,
+    (TOKEN_OPERATOR, ">"): 2,
+    (TOKEN_OPERATOR, "<"): 2,
+    (TOKEN_OPERATOR, ">="): 2,
+    (TOKEN_OPERATOR, "<="): 2,
+    (TOKEN_OPERATOR, "=="): 2,
+    (TOKEN_OPERATOR, "!="): 2,
+    (TOKEN_OPERATOR, "+"): 3,
+    (TOKEN_OPERATOR, "-"): 3,
+    (TOKEN_OPERATOR, "*"): 4,
+    (TOKEN_OPERATOR, "/"): 4,
+    (TOKEN_OPERATOR, "%"): 4,
+}
+
+
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
+    def __init__(self, tokens, max_errors=MAX_PARSE_ERRORS):
+        # a token list or a lazy Lexer.stream() (any iterable of Tokens): the
+        # grammar is LL(1), so only the current token is held and consumed
+        # tokens are dropped
+        self._tokens = iter(tokens)
         self.pos = 0
-        self.current = tokens[0]
+        self.current = next(self._tokens)
+        self.errors = []
+        self.max_errors = max_errors
 
     def advance(self):
         self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current = self.tokens[self.pos]
+        # past the end we stay on the final EOF token
+        self.current = next(self._tokens, self.current)
 
     def expect(self, ttype, value=None):
         tok = self.current
@@ -49,18 +88,76 @@ class Parser:
         if "MethodCallNode" in globals() and isinstance(node, MethodCallNode):
             return node.expr_text
 
-        return "expression"
+        return getattr(node, "expr_text", "expression")
 
     def parse(self):
         statements = []
-        self.skip_newlines()
-
-        while self.current.type != TOKEN_EOF:
-            statements.append(self.statement())
+        try:
             self.skip_newlines()
 
+            while self.current.type != TOKEN_EOF:
+                self._recovering_statement(statements)
+                self.skip_newlines()
+                # a block abandoned mid-way can leave its DEDENT behind
+                while self.current.type == TOKEN_DEDENT:
+                    self.advance()
+                self.skip_newlines()
+        except LexerError as e:
+            # a streaming lexer can also fail while synchronize() or the
+            # loop above skip tokens: keep the errors found before it
+            self.errors.append((e.line, str(e)))
+            raise ParseErrors(self.errors)
+
+        if self.errors:
+            raise ParseErrors(self.errors)
         return Program(statements)
 
+    # ---------- error recovery (panic mode) ----------
+    def _recovering_statement(self, statements):
+        try:
+            statements.append(self.statement())
+        except ParseErrors:
+            raise
+        except LexerError as e:
+            # raised mid-parse by a streaming lexer: nothing after it can be read
+            self.errors.append((e.line, str(e)))
+            raise ParseErrors(self.errors)
+        except Exception as e:
+            self.errors.append((self.current.line, str(e)))
+            if len(self.errors) >= self.max_errors:
+                # with a streaming lexer the rest of the source is never lexed
+                raise ParseErrors(self.errors)
+            self.synchronize()
+
+    def synchronize(self):
+        """
+        Drop tokens up to the end of the broken statement, so parsing
+        resumes at the next statement of the same block. An indented block
+        hanging off it (the body of a broken `agar` / `kaam` header) is
+        still parsed and thrown away, so errors inside it are reported
+        too. Stops before the DEDENT that closes the enclosing block.
+        """
+        while self.current.type not in (TOKEN_EOF, TOKEN_DEDENT):
+            ttype = self.current.type
+            if ttype == TOKEN_INDENT:
+                self._discard_block()
+                return
+            self.advance()
+            if ttype == TOKEN_NEWLINE:
+                if self.current.type == TOKEN_INDENT:
+                    self._discard_block()
+                return
+
+    def _discard_block(self):
+        # like block(), but the body has no header to attach to
+        self.advance()
+        body = []
+        while self.current.type not in (TOKEN_DEDENT, TOKEN_EOF):
+            self._recovering_statement(body)
+            self.skip_newlines()
+        if self.current.type == TOKEN_DEDENT:
+            self.advance()
+
     def statement(self):
         tok = self.current
 
@@ -255,12 +352,7 @@ class Parser:
             )
 
         if self.current.type == TOKEN_OPERATOR and self.current.value == "(":
-            node = self.func_call(first)
-            node.expr_text = (
-                f"{first.value}("
-                f"{', '.join(self.expr_to_text(a) for a in node.args)})"
-            )
-            return node
+            return self.func_call(first)
 
         raise Exception(f"Invalid assignment or call at line {first.line}")
 
@@ -351,8 +443,24 @@ class Parser:
 
         self.skip_newlines()
         body = self.block()
+        self._mark_tail_calls(name, body)
         return FunctionDefNode(name, params, body, start.line)
 
+    def _mark_tail_calls(self, name, body):
+        """Flag every `wapas name(...)` in the body; nested kaam are their own functions."""
+        for s in body:
+            if isinstance(s, ReturnNode):
+                if isinstance(s.value, FunctionCallNode) and s.value.name == name:
+                    s.tail_call = True
+            elif isinstance(s, IfNode):
+                self._mark_tail_calls(name, s.body)
+                for _, block in s.elif_blocks:
+                    self._mark_tail_calls(name, block)
+                if s.else_body:
+                    self._mark_tail_calls(name, s.else_body)
+            elif isinstance(s, (WhileNode, ForNode)):
+                self._mark_tail_calls(name, s.body)
+
 
     def func_call(self, name_tok):
         self.expect(TOKEN_OPERATOR, "(")
@@ -365,62 +473,41 @@ class Parser:
                 args.append(self.expr())
 
         self.expect(TOKEN_OPERATOR, ")")
-        return FunctionCallNode(name_tok.value, args, name_tok.line)
+        node = FunctionCallNode(name_tok.value, args, name_tok.line)
+        node.expr_text = (
+            f"{name_tok.value}("
+            f"{', '.join(self.expr_to_text(a) for a in args)})"
+        )
+        return node
 
     def block(self):
         self.expect(TOKEN_INDENT)
         self.skip_newlines()
 
         stmts = []
-        while self.current.type != TOKEN_DEDENT:
-            stmts.append(self.statement())
+        while self.current.type not in (TOKEN_DEDENT, TOKEN_EOF):
+            self._recovering_statement(stmts)
             self.skip_newlines()
 
         self.expect(TOKEN_DEDENT)
         return stmts
 
-    def expr(self):
-        return self.logical()
-
-    def logical(self):
-        node = self.comparison()
-        while self.current.type == TOKEN_KEYWORD and self.current.value in ("aur", "ya"):
-            tok = self.current
-            self.advance()
-            right = self.comparison()
-            node = BinaryOpNode(node, tok.value, right, tok.line,
-                                f"{node.expr_text} {tok.value} {right.expr_text}")
-        return node
-
-    def comparison(self):
-        node = self.term()
-        while self.current.type == TOKEN_OPERATOR and self.current.value in (">", "<", ">=", "<=", "==", "!="):
-            tok = self.current
-            self.advance()
-            right = self.term()
-            node = BinaryOpNode(node, tok.value, right, tok.line,
-                                f"{node.expr_text} {tok.value} {right.expr_text}")
-        return node
-
-    def term(self):
-        node = self.factor()
-        while self.current.type == TOKEN_OPERATOR and self.current.value in ("+", "-"):
-            tok = self.current
-            self.advance()
-            right = self.factor()
-            node = BinaryOpNode(node, tok.value, right, tok.line,
-                                f"{node.expr_text} {tok.value} {right.expr_text}")
-        return node
-
-    def factor(self):
+    def expr(self, min_power=0):
+        """
+        Pratt loop over BINARY_POWER: every binary operator is left
+        associative, so the right operand only takes operators that bind
+        tighter than the current one.
+        """
         node = self.unary()
-        while self.current.type == TOKEN_OPERATOR and self.current.value in ("*", "/", "%"):
+        while True:
             tok = self.current
+            power = BINARY_POWER.get((tok.type, tok.value), 0)
+            if power <= min_power:
+                return node
             self.advance()
-            right = self.unary()
+            right = self.expr(power)
             node = BinaryOpNode(node, tok.value, right, tok.line,
                                 f"{node.expr_text} {tok.value} {right.expr_text}")
-        return node
 
     def unary(self):
         if self.current.type == TOKEN_KEYWORD and self.current.value == "nahi":
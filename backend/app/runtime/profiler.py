@@ -0,0 +1,174 @@
+import time
+
+from app.runtime.interpreter import Interpreter
+
+
+class StackRecorder:
+    """
+    Instrumented call-stack recorder: self time (exclusive of callees) per
+    unique stack, emitted as Brendan Gregg collapsed stacks.
+    """
+
+    def __init__(self, root="main"):
+        self.root = root
+        self.stack = []
+        self._frames = []         # [start, time spent in callees]
+        self.totals = {}
+
+    def enter(self, name):
+        self.stack.append(name)
+        self._frames.append([time.perf_counter(), 0.0])
+
+    def exit(self):
+        start, callees = self._frames.pop()
+        elapsed = time.perf_counter() - start
+        key = ";".join(self.stack)
+        self.totals[key] = self.totals.get(key, 0.0) + elapsed - callees
+        self.stack.pop()
+        if self._frames:
+            self._frames[-1][1] += elapsed
+
+    def collapsed(self):
+        """`main;fib;fib 1234` lines, value = self time in microseconds."""
+        lines = []
+        for key, seconds in sorted(self.totals.items()):
+            us = int(seconds * 1_000_000)
+            if us > 0:
+                lines.append(f"{key} {us}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Interpreter that times every statement by its source line and counts
+    kaam / method calls. Profiling lives in this subclass only, so the
+    regular Interpreter pays nothing when it is off.
+
+    Inclusive time of a line covers everything it ran (nested blocks and
+    calls); exclusive time subtracts the statements nested inside it. A
+    line that is already active further up the stack (recursion) is not
+    counted twice towards its inclusive time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.line_stats = {}      # line -> [hits, inclusive, exclusive]
+        self.call_stats = {}      # name -> [calls, inclusive]
+        self._child_time = [0.0]
+        self._active_lines = {}
+        self._active_calls = {}
+        self._exec_depth = 0
+        self.stacks = StackRecorder()
+
+    def execute(self, node):
+        line = getattr(node, "line", None)
+        if line is None or not self._recording:
+            # time-travel replay re-runs statements; don't count them twice
+            return super().execute(node)
+
+        active = self._active_lines
+        active[line] = active.get(line, 0) + 1
+        self._child_time.append(0.0)
+        top_level = self._exec_depth == 0 and not self.stacks.stack
+        if top_level:
+            self.stacks.enter(self.stacks.root)
+        self._exec_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().execute(node)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._exec_depth -= 1
+            if top_level:
+                self.stacks.exit()
+            children = self._child_time.pop()
+            self._child_time[-1] += elapsed
+            active[line] -= 1
+
+            stats = self.line_stats.get(line)
+            if stats is None:
+                stats = self.line_stats[line] = [0, 0.0, 0.0]
+            stats[0] += 1
+            if active[line] == 0:
+                stats[1] += elapsed
+            stats[2] += elapsed - children
+
+    def _timed_call(self, name, run):
+        active = self._active_calls
+        active[name] = active.get(name, 0) + 1
+        self.stacks.enter(name)
+        start = time.perf_counter()
+        try:
+            return run()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stacks.exit()
+            active[name] -= 1
+            stats = self.call_stats.get(name)
+            if stats is None:
+                stats = self.call_stats[name] = [0, 0.0]
+            stats[0] += 1
+            if active[name] == 0:
+                stats[1] += elapsed
+
+    def _invoke(self, fn, args):
+        return self._timed_call(fn.name, lambda: super(ProfilingInterpreter, self)._invoke(fn, args))
+
+    def _on_tail_call(self, fn):
+        # the frame is reused, but it is still one more call of fn
+        stats = self.call_stats.get(fn.name)
+        if stats is None:
+            stats = self.call_stats[fn.name] = [0, 0.0]
+        stats[0] += 1
+
+    def _execute_method(self, obj, method_node, user_args, call_line):
+        name = f"{obj.class_ref.name}.{method_node.name}"
+        return self._timed_call(
+            name,
+            lambda: super(ProfilingInterpreter, self)._execute_method(obj, method_node, user_args, call_line),
+        )
+
+    # ---------- report ----------
+    def profile_report(self, source: str, top: int = 20):
+        lines = source.splitlines()
+
+        def src(n):
+            return lines[n - 1].strip() if 0 < n <= len(lines) else ""
+
+        hotspots = [
+            {
+                "line": n,
+                "hits": hits,
+                "inclusive_ms": round(incl * 1000, 3),
+                "exclusive_ms": round(excl * 1000, 3),
+                "source": src(n),
+            }
+            for n, (hits, incl, excl) in self.line_stats.items()
+        ]
+        hotspots.sort(key=lambda h: h["exclusive_ms"], reverse=True)
+
+        functions = [
+            {"name": name, "calls": calls, "inclusive_ms": round(incl * 1000, 3)}
+            for name, (calls, incl) in self.call_stats.items()
+        ]
+        functions.sort(key=lambda f: f["inclusive_ms"], reverse=True)
+
+        total = sum(excl for _, _, excl in self.line_stats.values()) or 1.0
+        annotated = []
+        for n, text in enumerate(lines, start=1):
+            stats = self.line_stats.get(n)
+            if stats is None:
+                annotated.append(f"{'':>8} {'':>10} {'':>6}  | {text}")
+            else:
+                hits, _, excl = stats
+                annotated.append(
+                    f"{hits:>8} {excl * 1000:>8.2f}ms {excl / total * 100:>5.1f}%  | {text}"
+                )
+
+        return {
+            "total_ms": round(total * 1000, 3) if self.line_stats else 0,
+            "hotspots": hotspots[:top],
+            "functions": functions,
+            "annotated": annotated,
+            "flamegraph": self.stacks.collapsed(),
+        }
@@ -1,67 +1,115 @@
 import sys
 import copy
 
+from app.runtime.memory import deep_sizeof
+from app.utils.metrics import checkpoints_taken, checkpoint_bytes_taken
 
-class StateManager:
-    def __init__(self):
-        self.history = []   # list of environment snapshots
-        self.index = -1     # current pointer
-
-    def reset(self):
-        self.history = []
-        self.index = -1
-
-    def save(self, env):
-        snapshot = copy.deepcopy(env)
-
-        if self.index < len(self.history) - 1:
-            self.history = self.history[: self.index + 1]
-
-        self.history.append(snapshot)
-        self.index += 1
-
-    def back(self):
-        if not self.history:
-            return {}
 
-        if self.index > 0:
-            self.index -= 1
+# first checkpoint interval (in saved steps); doubled whenever the
+# checkpoints of a session outgrow CHECKPOINT_BUDGET_KB
+CHECKPOINT_INTERVAL = 8
+CHECKPOINT_BUDGET_KB = 4096
 
-        return copy.deepcopy(self.history[self.index])
 
-    def next(self):
-        if not self.history:
-            return {}
-
-        if self.index < len(self.history) - 1:
-            self.index += 1
-
-        return copy.deepcopy(self.history[self.index])
-
-    def current(self):
-        if self.index >= 0 and self.history:
-            return copy.deepcopy(self.history[self.index])
-        return {}
-
-    def last(self):
-        if self.history:
-            return copy.deepcopy(self.history[-1])
-        return {}
-
-    def timeline(self):
-        return [copy.deepcopy(s) for s in self.history]
+class StateManager:
+    """
+    Time-travel timeline as sparse checkpoints plus a replay ledger.
+
+    Every save() appends one step to the ledger: the ops that produced it
+    (statements executed, pucho values supplied) and the pc afterwards.
+    Only every `interval`-th step stores a full checkpoint. Going back to
+    step i restores the nearest checkpoint <= i and re-executes the ledger
+    forward (see Interpreter.travel), so memory is O(steps / interval).
+    When checkpoints exceed the budget the interval doubles and the
+    in-between checkpoints are dropped.
+    """
+
+    def __init__(self, interval=CHECKPOINT_INTERVAL, budget_kb=CHECKPOINT_BUDGET_KB):
+        self.base_interval = interval
+        self.budget_bytes = budget_kb * 1024
+        self.reset()
 
+    def reset(self):
+        self.steps = []         # per step: (ops, pc_after)
+        self.checkpoints = {}   # step -> (payload, bytes)
+        self.index = -1         # current pointer
+        self.interval = self.base_interval
+        self.checkpoint_bytes = 0
+        self.ledger_bytes = 0
+        self._step_bytes = []   # deep size of each ledger entry
+        self._pending = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    def record(self, *op):
+        self._pending.append(op)
+
+    def pending(self):
+        """Ops recorded since the last save()."""
+        return list(self._pending)
+
+    def save(self, env, pc=None, checkpoint=None):
+        if self.index < len(self.steps) - 1:
+            self.truncate(self.index)
+
+        step = len(self.steps)
+        entry = (self._pending, pc)
+        self.steps.append(entry)
+        self._pending = []
+
+        size = deep_sizeof(entry)
+        self._step_bytes.append(size)
+        self.ledger_bytes += size
+        self.index = step
+
+        if step % self.interval == 0:
+            payload = checkpoint() if checkpoint is not None else {"env": copy.deepcopy(env)}
+            self._add_checkpoint(step, payload)
+
+    def truncate(self, index):
+        """Forget every step after `index` (a new future is being written)."""
+        del self.steps[index + 1:]
+        self.ledger_bytes -= sum(self._step_bytes[index + 1:])
+        del self._step_bytes[index + 1:]
+        for s in [s for s in self.checkpoints if s > index]:
+            self._drop_checkpoint(s)
+
+    def checkpoint_before(self, index):
+        step = max(s for s in self.checkpoints if s <= index)
+        return step, self.checkpoints[step][0]
+
+    def _add_checkpoint(self, step, payload):
+        # objects the payload shares with the live interpreter are not its cost
+        size = deep_sizeof(payload, {id(o) for o in payload.get("shared", ())})
+        self.checkpoints[step] = (payload, size)
+        self.checkpoint_bytes += size
+        checkpoints_taken.inc()
+        checkpoint_bytes_taken.inc(size)
+
+        # step 0 is always kept, so this terminates
+        while self.checkpoint_bytes > self.budget_bytes and len(self.checkpoints) > 1:
+            self.interval *= 2
+            for s in list(self.checkpoints):
+                if s % self.interval != 0:
+                    self._drop_checkpoint(s)
+
+    def _drop_checkpoint(self, step):
+        _, size = self.checkpoints.pop(step)
+        self.checkpoint_bytes -= size
+
+    def history_bytes(self):
+        return self.checkpoint_bytes + self.ledger_bytes + sys.getsizeof(self.steps)
 
     def memory_kb(self):
-        total = 0
-        for s in self.history:
-            total += sys.getsizeof(s)
-        return round(total / 1024, 2)
+        return round(self.history_bytes() / 1024, 2)
 
     def info(self):
         return {
-            "total_states": len(self.history),
+            "total_states": len(self.steps),
             "current_index": self.index,
             "has_past": self.index > 0,
-            "has_future": self.index < len(self.history) - 1,
+            "has_future": self.index < len(self.steps) - 1,
+            "checkpoints": len(self.checkpoints),
+            "checkpoint_interval": self.interval,
         }
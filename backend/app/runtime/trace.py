@@ -0,0 +1,383 @@
+import json
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+
+from app.runtime.nodes import AYRObject, AYRClass
+from app.runtime.builtins import AYRRange, AYRArray
+from app.runtime.memory import deep_sizeof
+
+
+# full name -> value map kept every KEYFRAME steps for random access
+KEYFRAME = 64
+# decoded values kept around while building the JSON view
+DECODE_CACHE = 256
+
+_MAGIC = b"AYRT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIIII")   # magic, version, steps, changes, names, values
+_U32 = struct.Struct("<I")
+
+_DELETED = -1
+_SCALARS = (type(None), bool, int, float, str)
+
+
+def _plain(value):
+    """JSON-ready copy of a runtime value."""
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, AYRArray):
+        return value.tolist()
+    if isinstance(value, AYRRange):
+        return {"start": value.start, "stop": value.stop, "step": value.step}
+    if isinstance(value, AYRObject):
+        return {"class": value.class_ref.name, "fields": _plain(value.fields)}
+    if isinstance(value, AYRClass):
+        return {"class": value.name}
+    return str(value)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _le(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class ColumnarTrace:
+    """
+    Compact alternative to the list-of-dicts trace_log.
+
+    Columns: step index and line per entry, plus a flat list of env changes
+    (name id, value id) with per-entry offsets. Variable names and values
+    are interned; a value is stored once as JSON text, and a list that only
+    grew since the previous entry is stored as (base value id, appended
+    items). Old-style {"i", "line", "env"} dicts are rebuilt on demand, so
+    indexing, slicing and iterating work like the plain list.
+
+    The interpreter passes a (mutations, rewrites) version with each entry:
+    in-place changes of any kind, and those other than append. A value that
+    is the same object as last time is then known to be unchanged without
+    encoding it, and a flat list only re-encodes its appended tail.
+    """
+
+    def __init__(self):
+        self.steps = array("I")
+        self.lines = array("i")          # -1 = no line
+        self.offsets = array("I", [0])   # entry k changes: offsets[k]..offsets[k+1]
+        self.change_names = array("I")
+        self.change_values = array("i")  # value id, or -1 when deleted
+
+        self.names = []
+        self.values = []                 # json text, or (base id, json of appended items)
+
+        self._name_ids = {}
+        self._value_ids = {}
+        self._current = {}               # name id -> value id
+        self._last = {}                  # name id -> live value recorded last
+        self._flat = {}                  # name id -> length, for lists of scalars
+        self._lists = {}                 # name id -> last plain list (unversioned records)
+        self._version = None
+        self._keyframes = [{}]
+        self._decoded = OrderedDict()    # small decode cache for the JSON view
+
+        self._table_bytes = 0            # running size of names/values/_lists
+        self._list_bytes = {}
+
+    # ---------- recording ----------
+    def record(self, i, line, env, version=None):
+        cur = self._current
+        last = self._last
+        seen = set()
+
+        prev = self._version
+        self._version = version
+        untouched = version is not None and version == prev
+        appends_only = version is not None and prev is not None and version[1] == prev[1]
+
+        for name, value in env.items():
+            nid = self._name_id(name)
+            seen.add(nid)
+            if nid in cur and last.get(nid) is value:
+                if untouched or isinstance(value, _SCALARS):
+                    continue
+                if appends_only and nid in self._flat:
+                    vid = self._grown(nid, value)
+                else:
+                    vid = self._value_id(nid, value, version is not None)
+            else:
+                vid = self._value_id(nid, value, version is not None)
+            last[nid] = value
+            if cur.get(nid) != vid:
+                cur[nid] = vid
+                self.change_names.append(nid)
+                self.change_values.append(vid)
+
+        for nid in [n for n in cur if n not in seen]:
+            del cur[nid]
+            del last[nid]
+            self._forget_list(nid)
+            self.change_names.append(nid)
+            self.change_values.append(_DELETED)
+
+        self.steps.append(i)
+        self.lines.append(-1 if line is None else line)
+        self.offsets.append(len(self.change_names))
+
+        if len(self.steps) % KEYFRAME == 0:
+            self._keyframes.append(dict(cur))
+
+    def _name_id(self, name):
+        nid = self._name_ids.get(name)
+        if nid is None:
+            nid = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            self._table_bytes += sys.getsizeof(name)
+        return nid
+
+    def _intern(self, key):
+        vid = self._value_ids.get(key)
+        if vid is None:
+            vid = self._value_ids[key] = len(self.values)
+            self.values.append(key)
+            self._table_bytes += deep_sizeof(key)
+        return vid
+
+    def _forget_list(self, nid):
+        self._flat.pop(nid, None)
+        self._lists.pop(nid, None)
+        self._table_bytes -= self._list_bytes.pop(nid, 0)
+
+    def _grown(self, nid, value):
+        """A flat list changed only by append since it was last recorded."""
+        n = self._flat[nid]
+        if len(value) == n:
+            return self._current[nid]
+        tail = value[n:]
+        if not all(isinstance(v, _SCALARS) for v in tail):
+            return self._value_id(nid, value, True)
+        self._flat[nid] = len(value)
+        return self._intern((self._current[nid], _dumps(tail)))
+
+    def _value_id(self, nid, value, versioned=False):
+        if versioned:
+            self._forget_list(nid)
+            if isinstance(value, list) and all(isinstance(v, _SCALARS) for v in value):
+                self._flat[nid] = len(value)
+            return self._intern(_dumps(_plain(value)))
+
+        plain = _plain(value)
+        if not isinstance(plain, list):
+            self._forget_list(nid)
+            return self._intern(_dumps(plain))
+
+        prev = self._lists.get(nid)
+        self._forget_list(nid)
+        self._lists[nid] = plain
+        self._list_bytes[nid] = deep_sizeof(plain)
+        self._table_bytes += self._list_bytes[nid]
+        if prev is not None and plain[:len(prev)] == prev:
+            if len(plain) == len(prev):
+                return self._current[nid]
+            return self._intern((self._current[nid], _dumps(plain[len(prev):])))
+        return self._intern(_dumps(plain))
+
+    # ---------- lazy JSON view ----------
+    def value(self, vid):
+        """Decoded value `vid`; appended-list chains are resolved iteratively."""
+        chain = []
+        while vid not in self._decoded and isinstance(self.values[vid], tuple):
+            chain.append(vid)
+            vid = self.values[vid][0]
+
+        if vid in self._decoded:
+            value = self._decoded[vid]
+        else:
+            value = self._cache(vid, json.loads(self.values[vid]))
+
+        for vid in reversed(chain):
+            value = self._cache(vid, value + json.loads(self.values[vid][1]))
+        return value
+
+    def _cache(self, vid, value):
+        self._decoded[vid] = value
+        if len(self._decoded) > DECODE_CACHE:
+            self._decoded.popitem(last=False)
+        return value
+
+    def _state_at(self, k):
+        kf = (k + 1) // KEYFRAME
+        state = dict(self._keyframes[kf])
+        for j in range(kf * KEYFRAME, k + 1):
+            self._apply(state, j)
+        return state
+
+    def _apply(self, state, k):
+        for c in range(self.offsets[k], self.offsets[k + 1]):
+            vid = self.change_values[c]
+            if vid == _DELETED:
+                state.pop(self.change_names[c], None)
+            else:
+                state[self.change_names[c]] = vid
+
+    def _entry(self, k, state):
+        line = self.lines[k]
+        return {
+            "i": self.steps[k],
+            "line": None if line < 0 else line,
+            "env": {self.names[n]: self.value(v) for n, v in state.items()},
+        }
+
+    def entries(self, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return
+        state = self._state_at(start)
+        yield self._entry(start, state)
+        for k in range(start + 1, stop):
+            self._apply(state, k)
+            yield self._entry(k, state)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return self.entries()
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            start, stop, step = k.indices(len(self))
+            items = list(self.entries(start, stop))
+            return items[::step] if step != 1 else items
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("trace index out of range")
+        return self._entry(k, self._state_at(k))
+
+    def columns(self):
+        """Compact JSON form (what responses send for columnar traces)."""
+        return {
+            "format": "columnar",
+            "i": self.steps.tolist(),
+            "line": [None if l < 0 else l for l in self.lines],
+            "offsets": self.offsets.tolist(),
+            "names": self.change_names.tolist(),
+            "values": self.change_values.tolist(),
+            "name_table": self.names,
+            "value_table": [v if isinstance(v, str) else list(v) for v in self.values],
+        }
+
+    def nbytes(self):
+        total = self._table_bytes
+        for obj in (self.names, self.values, self._name_ids, self._value_ids,
+                    self._current, self._last, self._flat, self._lists):
+            total += sys.getsizeof(obj)
+        for col in (self.steps, self.lines, self.offsets, self.change_names, self.change_values):
+            total += sys.getsizeof(col)
+        for kf in self._keyframes:
+            total += sys.getsizeof(kf)
+        return total
+
+    # ---------- binary export ----------
+    @classmethod
+    def from_entries(cls, entries):
+        trace = cls()
+        for e in entries:
+            trace.record(e["i"], e["line"], e["env"])
+        return trace
+
+    def to_bytes(self):
+        """
+        Little-endian layout: header, then steps/lines (u32/i32 per entry),
+        offsets (u32, entries + 1), change names/values (u32/i32), then the
+        name table and value table as length-prefixed UTF-8. Value records
+        start with a tag byte: 0 = JSON text, 1 = u32 base id + appended JSON.
+        """
+        parts = [
+            _HEADER.pack(_MAGIC, _VERSION, len(self.steps), len(self.change_names),
+                         len(self.names), len(self.values)),
+            _le(self.steps), _le(self.lines), _le(self.offsets),
+            _le(self.change_names), _le(self.change_values),
+        ]
+        for name in self.names:
+            raw = name.encode("utf-8")
+            parts.append(_U32.pack(len(raw)) + raw)
+        for v in self.values:
+            if isinstance(v, str):
+                raw = v.encode("utf-8")
+                parts.append(b"\x00" + _U32.pack(len(raw)) + raw)
+            else:
+                raw = v[1].encode("utf-8")
+                parts.append(b"\x01" + _U32.pack(v[0]) + _U32.pack(len(raw)) + raw)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, n, n_changes, n_names, n_values = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not an AYR trace (or unsupported version)")
+
+        pos = _HEADER.size
+
+        def take(typecode, count):
+            nonlocal pos
+            size = array(typecode).itemsize * count
+            arr = _from_le(typecode, data[pos:pos + size])
+            pos += size
+            return arr
+
+        def take_u32():
+            nonlocal pos
+            (v,) = _U32.unpack_from(data, pos)
+            pos += _U32.size
+            return v
+
+        def take_str():
+            nonlocal pos
+            size = take_u32()
+            s = data[pos:pos + size].decode("utf-8")
+            pos += size
+            return s
+
+        trace = cls()
+        trace.steps = take("I", n)
+        trace.lines = take("i", n)
+        trace.offsets = take("I", n + 1)
+        trace.change_names = take("I", n_changes)
+        trace.change_values = take("i", n_changes)
+        trace.names = [take_str() for _ in range(n_names)]
+
+        for _ in range(n_values):
+            tag = data[pos]
+            pos += 1
+            if tag == 0:
+                trace.values.append(take_str())
+            else:
+                base = take_u32()
+                trace.values.append((base, take_str()))
+
+        # rebuild keyframes so random access stays cheap
+        state = {}
+        for k in range(n):
+            trace._apply(state, k)
+            if (k + 1) % KEYFRAME == 0:
+                trace._keyframes.append(dict(state))
+        return trace
@@ -0,0 +1,185 @@
+import time
+from concurrent.futures import as_completed
+
+from fastapi import HTTPException  # pyright: ignore[reportMissingImports]
+
+from app.runtime.interpreter import Interpreter, ExpressionError, ExecutionTimeout, InputRequest
+from app.services.runner import _make_problem, _parse_problems
+from app.services.program_cache import parse_program
+from app.services import pool
+from app.services.job_queue import JOB_TIMEOUT
+from app.utils.metrics import counter_delta, counter_values, fold_counters, record_interpreter
+from app.utils.serializer import dumps
+
+
+MAX_BATCH_JOBS = 5000
+# below this many jobs the batch runs in-process (pool IPC would dominate)
+MIN_PARALLEL_JOBS = 16
+
+
+def _run_job(program, inputs):
+    """
+    Run one already-parsed program to completion with pre-supplied inputs,
+    stopping it after JOB_TIMEOUT seconds, like a queued job.
+    """
+    interp = Interpreter(trace_format="off")   # graders only need output
+    interp.load(program)
+    interp.provide_inputs(inputs)
+    # checked by the interpreter's loops: the batch may run in a request
+    # thread, where the job queue's SIGALRM deadline is not available
+    interp.deadline = time.monotonic() + JOB_TIMEOUT
+    errors = []
+    needs_input = False
+
+    while True:
+        try:
+            if not interp.step():
+                break
+
+        except InputRequest as inp:
+            needs_input = True
+            errors.append(_make_problem(
+                kind="error",
+                title=f"Input Required (Line {inp.line}):",
+                message="Program ko diye gaye inputs se zyada input chahiye.",
+                line=inp.line,
+            ))
+            break
+
+        except ExecutionTimeout:
+            errors.append(_make_problem(
+                kind="error",
+                title="Time Limit Exceeded:",
+                message=f"Program {JOB_TIMEOUT} second se zyada chala, rok diya gaya.",
+            ))
+            break
+
+        except ExpressionError as e:
+            line = getattr(e, "line", None)
+            errors.append(_make_problem(
+                kind="error",
+                title=f"Expression Error (Line {line}):" if line else "Expression Error:",
+                message=str(e),
+                line=line,
+                expression=getattr(e, "expr_text", None),
+            ))
+            interp.skip_statement()
+            if interp.pc >= len(interp.program.statements):
+                break
+
+        except Exception as e:
+            errors.append(_make_problem(kind="error", title="Runtime Error:", message=str(e)))
+            interp.skip_statement()
+            if interp.pc >= len(interp.program.statements):
+                break
+
+    record_interpreter(interp)
+    return {
+        "success": not errors,
+        "needs_input": needs_input,
+        "output": interp.output,
+        "errors": errors,
+        "unused_inputs": len(interp.input_queue),
+    }
+
+
+def _run_group(code, jobs):
+    """Parse `code` once and run every (index, inputs) job against it."""
+    try:
+        program = parse_program(code)
+    except Exception as e:
+        failed = {"success": False, "needs_input": False, "output": [], "errors": _parse_problems(e),
+                  "unused_inputs": 0}
+        return [(index, dict(failed)) for index, _ in jobs]
+
+    results = []
+    for index, inputs in jobs:
+        try:
+            results.append((index, _run_job(program, inputs)))
+        except Exception as e:
+            p = _make_problem(kind="error", title="Runtime Error:", message=str(e))
+            results.append((index, {"success": False, "needs_input": False, "output": [],
+                                    "errors": [p], "unused_inputs": 0}))
+    return results
+
+
+def _group_by_source(jobs):
+    groups = {}
+    for index, job in enumerate(jobs):
+        groups.setdefault(job["code"], []).append((index, list(job.get("inputs") or [])))
+    return list(groups.items())
+
+
+def _chunks(groups, n):
+    """Split source groups into at most `n` tasks of similar job counts."""
+    tasks = [[] for _ in range(n)]
+    sizes = [0] * n
+    for code, jobs in sorted(groups, key=lambda g: -len(g[1])):
+        k = sizes.index(min(sizes))
+        tasks[k].append((code, jobs))
+        sizes[k] += len(jobs)
+    return [t for t in tasks if t]
+
+
+def _run_task(groups):
+    results = []
+    for code, jobs in groups:
+        results.extend(_run_group(code, jobs))
+    return results
+
+
+def _run_pool_task(groups):
+    """Worker side of _run_task: also returns what the metrics counters gained."""
+    before = counter_values()
+    results = _run_task(groups)
+    return results, counter_delta(before)
+
+
+def _check_size(jobs):
+    if len(jobs) > MAX_BATCH_JOBS:
+        raise HTTPException(status_code=413, detail=f"Batch me max {MAX_BATCH_JOBS} jobs ho sakte hain.")
+
+
+def _iter_batch(jobs):
+    """
+    Yield (index, result) for every job as soon as it finishes. Identical
+    sources are parsed once; large batches are spread across worker
+    processes.
+    """
+    groups = _group_by_source(jobs)
+
+    if len(jobs) < MIN_PARALLEL_JOBS or pool.EXECUTION_WORKERS == 1:
+        yield from _run_task(groups)
+        return
+
+    futures = [pool.submit(_run_pool_task, task) for task in _chunks(groups, pool.EXECUTION_WORKERS * 4)]
+    for fut in as_completed(futures):
+        results, counters = fut.result()
+        fold_counters(counters)
+        yield from results
+
+
+def run_batch(jobs):
+    _check_size(jobs)
+
+    results = [None] * len(jobs)
+    for index, result in _iter_batch(jobs):
+        results[index] = result
+
+    return {
+        "success": all(r["success"] for r in results),
+        "count": len(results),
+        "unique_sources": len({job["code"] for job in jobs}),
+        "results": results,
+    }
+
+
+def stream_batch(jobs):
+    """NDJSON lines `{index, ...result}` in completion order."""
+    _check_size(jobs)
+
+    def lines():
+        for index, result in _iter_batch(jobs):
+            yield dumps({"index": index, **result}) + b"\n"
+
+    return lines()
@@ -0,0 +1,160 @@
+import copy
+
+from fastapi import HTTPException  # pyright: ignore[reportMissingImports]
+
+from app.services.session import session_manager
+from app.services.debug_runner import (
+    start_debug_session,
+    continue_to_breakpoint,
+    set_breakpoint,
+    clear_breakpoint,
+    step_cursor,
+    cursor_input,
+)
+from app.services.input_runner import resume_with_input
+
+
+# status fields copied from the underlying HTTP-style result into each reply
+_STATUS_KEYS = (
+    "success", "done", "needs_input", "need_input", "var", "vars", "error", "line",
+    "expression", "breakpoint", "cursor",
+)
+
+
+class DebugChannel:
+    """
+    One WebSocket debug connection. Remembers what the client has already
+    seen (env, output length, trace length) so each reply only carries the
+    changes since the previous message.
+    """
+
+    def __init__(self):
+        self.session_id = None
+        self.debug_key = None
+        self.seq = 0
+
+        self._env = {}
+        self._output_len = 0
+        self._trace_len = 0
+
+    # ---------- commands ----------
+    def handle(self, msg: dict):
+        cmd = msg.get("cmd")
+        self.seq += 1
+
+        try:
+            if cmd == "start":
+                result = start_debug_session(msg.get("code", ""), msg.get("debug_key", ""))
+                self.session_id = result["session_id"]
+                self.debug_key = result["debug_key"]
+                return self._full(cmd, result)
+
+            if cmd == "attach":
+                session_manager.get(msg.get("session_id"))
+                self.session_id = msg.get("session_id")
+                self.debug_key = msg.get("debug_key", self.debug_key)
+                return self._full(cmd, {"success": True})
+
+            if self.session_id is None:
+                return self._error(cmd, "No debug session. Send 'start' or 'attach' first.")
+
+            if cmd == "snapshot":
+                return self._full(cmd, {"success": True})
+
+            if cmd == "break":
+                return {"type": "breakpoints", "cmd": cmd, "seq": self.seq,
+                        **set_breakpoint(self.session_id, msg.get("line"), msg.get("condition"))}
+
+            if cmd == "clear":
+                return {"type": "breakpoints", "cmd": cmd, "seq": self.seq,
+                        **clear_breakpoint(self.session_id, msg.get("line"))}
+
+            if cmd == "step":
+                result = session_manager.step(self.session_id)
+            elif cmd == "back":
+                result = session_manager.back(self.session_id)
+            elif cmd == "next":
+                result = session_manager.next(self.session_id)
+            elif cmd in ("step_into", "step_over", "step_out"):
+                result = step_cursor(self.session_id, self.debug_key, cmd[len("step_"):])
+            elif cmd == "continue":
+                result = continue_to_breakpoint(self.session_id, self.debug_key)
+            elif cmd == "input":
+                if session_manager.get(self.session_id).cursor_waiting_input():
+                    result = cursor_input(self.session_id, self.debug_key, msg.get("value", ""))
+                else:
+                    result = resume_with_input(self.session_id, msg.get("value", ""))
+            else:
+                return self._error(cmd, f"Unknown command '{cmd}'")
+
+        except HTTPException as e:
+            return self._error(cmd, e.detail)
+        except Exception as e:
+            return self._error(cmd, str(e))
+
+        return self._delta(cmd, result)
+
+    def close(self):
+        """Connection gone: release the paused cursor thread of its session."""
+        if self.session_id is None:
+            return
+        interp = session_manager.sessions.get(self.session_id)
+        if interp is not None:
+            interp.drop_cursor()
+
+    # ---------- replies ----------
+    def _base(self, cmd, result):
+        interp = session_manager.get(self.session_id)
+        reply = {
+            "type": "delta",
+            "cmd": cmd,
+            "seq": self.seq,
+            "session_id": self.session_id,
+            "pc": interp.pc,
+            "state_info": interp.state.info(),
+        }
+        for k in _STATUS_KEYS:
+            if k in result:
+                reply[k] = result[k]
+        return reply, interp
+
+    def _full(self, cmd, result):
+        reply, interp = self._base(cmd, result)
+        reply["type"] = "state"
+        reply["env"] = interp.env
+        reply["output"] = list(interp.output)
+        reply["trace"] = list(interp.trace_log)
+        self._remember(interp)
+        return reply
+
+    def _delta(self, cmd, result):
+        reply, interp = self._base(cmd, result)
+
+        env = interp.env
+        changed = {k: v for k, v in env.items() if k not in self._env or self._env[k] != v}
+        removed = [k for k in self._env if k not in env]
+        reply["env"] = {"set": changed, "del": removed}
+
+        output, trace = interp.output, interp.trace_log
+        if len(output) < self._output_len or len(trace) < self._trace_len:
+            # history was rewritten (e.g. session reloaded): resend in full
+            reply["reset"] = True
+            reply["output"] = list(output)
+            reply["trace"] = list(trace)
+        else:
+            reply["output"] = output[self._output_len:]
+            reply["trace"] = trace[self._trace_len:]
+
+        self._remember(interp)
+        return reply
+
+    def _error(self, cmd, message):
+        return {"type": "error", "cmd": cmd, "seq": self.seq, "error": message}
+
+    def _remember(self, interp):
+        try:
+            self._env = copy.deepcopy(interp.env)
+        except Exception:
+            self._env = dict(interp.env)
+        self._output_len = len(interp.output)
+        self._trace_len = len(interp.trace_log)
@@ -1,18 +1,39 @@
+import functools
 import uuid
 
-from app.runtime.lexer import Lexer
+from app.runtime.lexer import Lexer, TOKEN_EOF
 from app.runtime.parser import Parser
 from app.runtime.interpreter import Interpreter, ExpressionError, InputRequest
+from app.services.program_cache import parse_program
 from app.services.session import session_manager
+from app.utils.metrics import record_interpreter
 
 
 def _signature(line, message, expression):
     return f"{line}|{message}|{expression}"
 
 
+def _recorded(fn):
+    """
+    Fold the session interpreter's counters into the metrics after `fn`
+    ran it, and release abandoned cursors of other sessions (`fn` may
+    have just paused a new one).
+    """
+    @functools.wraps(fn)
+    def wrapper(session_id, *args, **kwargs):
+        try:
+            return fn(session_id, *args, **kwargs)
+        finally:
+            interp = session_manager.sessions.get(session_id)
+            if interp is not None:
+                record_interpreter(interp)
+            session_manager.release_cursors(keep=session_id)
+    return wrapper
+
+
 def start_debug_session(code: str, debug_key: str):
-    tokens = Lexer(code).tokenize()
-    program = Parser(tokens).parse()
+    # only the first syntax error is reported here: stop at it
+    program = parse_program(code, max_errors=1)
 
     interp = Interpreter()
     interp.load(program)
@@ -32,10 +53,11 @@ def start_debug_session(code: str, debug_key: str):
             "state_info": interp.state.info() if hasattr(interp, "state") else None
         },
 
-        "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+        "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
     }
 
 
+@_recorded
 def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 10000):
     interp = session_manager.get(session_id)
 
@@ -65,7 +87,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
                         "state_info": interp.state.info() if hasattr(interp, "state") else None
                     },
 
-                    "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                    "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
                 }
 
         except InputRequest as inp:
@@ -92,7 +114,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
                     "state_info": interp.state.info() if hasattr(interp, "state") else None
                 },
 
-                "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
             }
 
         except ExpressionError as e:
@@ -104,7 +126,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
 
             if session_manager.has_seen(debug_key, sig):
                 try:
-                    interp.pc += 1
+                    interp.skip_statement()
                 except Exception:
                     pass
                 continue
@@ -128,7 +150,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
                     "state_info": interp.state.info() if hasattr(interp, "state") else None
                 },
 
-                "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
             }
 
         except Exception as e:
@@ -137,7 +159,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
 
             if session_manager.has_seen(debug_key, sig):
                 try:
-                    interp.pc += 1
+                    interp.skip_statement()
                 except Exception:
                     pass
                 continue
@@ -161,7 +183,7 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
                     "state_info": interp.state.info() if hasattr(interp, "state") else None
                 },
 
-                "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
             }
 
     return {
@@ -181,5 +203,191 @@ def run_until_next_new_error(session_id: str, debug_key: str, max_steps: int = 1
             "state_info": interp.state.info() if hasattr(interp, "state") else None
         },
 
-        "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+        "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
     }
+
+
+def _parse_condition(condition: str):
+    parser = Parser(Lexer(condition).tokenize())
+    node = parser.expr()
+    parser.skip_newlines()
+    if parser.current.type != TOKEN_EOF:
+        raise Exception(f"Invalid breakpoint condition: {condition}")
+    return node
+
+
+def _breakpoint_list(interp):
+    return [
+        {"line": line, "condition": cond}
+        for line, (cond, _) in sorted(interp.breakpoints.items())
+    ]
+
+
+def set_breakpoint(session_id: str, line: int, condition: str = None):
+    interp = session_manager.get(session_id)
+
+    try:
+        node = _parse_condition(condition) if condition else None
+    except Exception as e:
+        return {"success": False, "error": str(e), "breakpoints": _breakpoint_list(interp)}
+
+    interp.set_breakpoint(line, condition or None, node)
+    return {"success": True, "breakpoints": _breakpoint_list(interp)}
+
+
+def clear_breakpoint(session_id: str, line: int = None):
+    interp = session_manager.get(session_id)
+    interp.clear_breakpoint(line)
+    return {"success": True, "breakpoints": _breakpoint_list(interp)}
+
+
+def list_breakpoints(session_id: str):
+    return {"success": True, "breakpoints": _breakpoint_list(session_manager.get(session_id))}
+
+
+def _debug_state(interp, session_id, debug_key, **extra):
+    result = {
+        "success": True,
+        "done": False,
+        "needs_input": False,
+        "session_id": session_id,
+        "debug_key": debug_key,
+        "pc": interp.pc,
+        "env": interp.env,
+        "output": interp.output,
+        "trace": interp.trace_log,
+        "error": None,
+        "line": None,
+        "expression": None,
+        "breakpoint": None,
+        "cursor": interp.cursor_info(),
+        "detail": {"state_info": interp.state.info()},
+        "memory_kb": interp.memory_kb(),
+    }
+    result.update(extra)
+    return result
+
+
+@_recorded
+def continue_to_breakpoint(session_id: str, debug_key: str, max_steps: int = 100000):
+    """
+    Run at full speed (history reduced to keyframes) until a breakpoint
+    hits, the program asks for input, an error occurs or it finishes. A
+    hit inside a block or kaam pauses right there, with the cursor active.
+    """
+    interp = session_manager.get(session_id)
+
+    try:
+        status = interp.run_to_breakpoint(max_steps=max_steps)
+
+    except InputRequest as inp:
+        return _debug_state(
+            interp, session_id, debug_key,
+            success=False,
+            needs_input=True,
+            error="Program is waiting for input",
+            line=inp.line,
+            expression=getattr(interp, "last_input_var", None),
+        )
+
+    except ExpressionError as e:
+        # move past the failed statement, or every later continue fails on it again
+        interp.skip_statement()
+        session_manager.mark_seen(debug_key, _signature(e.line, str(e), None))
+        return _debug_state(
+            interp, session_id, debug_key,
+            success=False,
+            error=str(e),
+            line=e.line,
+            expression=e.expression,
+        )
+
+    except Exception as e:
+        interp.skip_statement()
+        return _debug_state(interp, session_id, debug_key, success=False, error=str(e))
+
+    if status == "breakpoint":
+        return _debug_state(
+            interp, session_id, debug_key,
+            line=interp.breakpoint_hit["line"],
+            breakpoint=interp.breakpoint_hit,
+        )
+
+    if status == "max_steps":
+        return _debug_state(interp, session_id, debug_key, success=False, error="Max debug steps exceeded")
+
+    return _debug_state(interp, session_id, debug_key, done=True)
+
+
+def _cursor_result(interp, session_id, debug_key, status):
+    if status == "input":
+        node_line = interp.cursor_info()["line"]
+        return _debug_state(
+            interp, session_id, debug_key,
+            success=False,
+            needs_input=True,
+            error="Program is waiting for input",
+            line=node_line,
+        )
+    return _debug_state(
+        interp, session_id, debug_key,
+        done=(status == "done"),
+        line=interp.cursor_info()["line"],
+    )
+
+
+def _cursor_error(interp, session_id, debug_key, e):
+    # the failed top-level statement is skipped, like /debug/rerunDebug
+    interp.skip_statement()
+    if isinstance(e, ExpressionError):
+        session_manager.mark_seen(debug_key, _signature(e.line, str(e), None))
+        return _debug_state(
+            interp, session_id, debug_key,
+            success=False, error=str(e), line=e.line, expression=e.expression,
+        )
+    return _debug_state(interp, session_id, debug_key, success=False, error=str(e))
+
+
+@_recorded
+def step_cursor(session_id: str, debug_key: str, mode: str = "into"):
+    """Step into / over / out of the statement the cursor is paused before."""
+    interp = session_manager.get(session_id)
+
+    if mode not in ("into", "over", "out"):
+        return _debug_state(interp, session_id, debug_key, success=False, error=f"Unknown step mode '{mode}'")
+
+    try:
+        status = interp.cursor_step(mode)
+    except InputRequest as inp:
+        return _debug_state(
+            interp, session_id, debug_key,
+            success=False, needs_input=True, error="Program is waiting for input", line=inp.line,
+        )
+    except Exception as e:
+        return _cursor_error(interp, session_id, debug_key, e)
+
+    return _cursor_result(interp, session_id, debug_key, status)
+
+
+@_recorded
+def cursor_input(session_id: str, debug_key: str, value):
+    """Answer the pucho the cursor is paused on and stop at the next statement."""
+    interp = session_manager.get(session_id)
+
+    if not interp.cursor_waiting_input():
+        return _debug_state(interp, session_id, debug_key, success=False, error="No pending input variable")
+
+    try:
+        status = interp.cursor_input(value)
+    except ExpressionError as e:
+        # wrong number of values: stay on the same pucho
+        if interp.cursor_waiting_input():
+            return _debug_state(
+                interp, session_id, debug_key,
+                success=False, needs_input=True, error=str(e), line=e.line,
+            )
+        return _cursor_error(interp, session_id, debug_key, e)
+    except Exception as e:
+        return _cursor_error(interp, session_id, debug_key, e)
+
+    return _cursor_result(interp, session_id, debug_key, status)
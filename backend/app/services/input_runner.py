@@ -0,0 +1,110 @@
+from app.runtime.interpreter import InputRequest, ExpressionError
+from app.services.session import session_manager
+from app.utils.metrics import record_interpreter
+
+
+def infer_type(raw: str):
+    raw = str(raw).strip()
+    try:
+        return int(raw)
+    except:
+        pass
+    try:
+        return float(raw)
+    except:
+        pass
+    return raw
+
+
+def resume_with_input(session_id: str, value):
+    interp = session_manager.get(session_id)
+    try:
+        return _resume(interp, session_id, value)
+    finally:
+        record_interpreter(interp)
+
+
+def _resume(interp, session_id: str, value):
+    raw = str(value).strip()
+
+    last_vars = getattr(interp, "last_input_vars", None)
+    waiting_cursor = interp.cursor_waiting_input()
+    if waiting_cursor:
+        # paused mid-statement by a fine-grained debug step
+        try:
+            interp.cursor_input(raw)
+        except ExpressionError as e:
+            return {
+                "success": False,
+                "need_input": True,
+                "session_id": session_id,
+                "error": e.message,
+                "line": e.line,
+                "output": interp.output,
+                "env": interp.env,
+                "warnings": []
+            }
+
+    elif last_vars:
+        parts = raw.split()
+
+        if len(parts) != len(last_vars):
+            return {
+                "success": False,
+                "need_input": True,
+                "session_id": session_id,
+                "error": "Input count aur variables ka count match nahi karta.",
+                "line": getattr(interp, "last_input_line", None),
+                "output": interp.output,
+                "env": interp.env,
+                "warnings": []
+            }
+
+    elif not getattr(interp, "last_input_var", None):
+        return {
+            "success": False,
+            "error": "No pending input variable"
+        }
+
+    try:
+        if not waiting_cursor:
+            # re-runs the suspended statement with the answer
+            interp.answer_input(raw)
+
+        if interp.cursor_active():
+            interp.step()
+
+        while interp.step():
+            pass
+
+        return {
+            "success": True,
+            "output": interp.output,
+            "env": interp.env,
+            "warnings": []
+        }
+
+    except InputRequest as inp:
+        return {
+            "success": False,
+            "need_input": True,
+            "session_id": session_id,
+
+            "var": getattr(interp, "last_input_var", None),
+            "vars": getattr(interp, "last_input_vars", None),
+
+            "line": inp.line,
+            "output": interp.output,
+            "env": interp.env,
+            "warnings": []
+        }
+
+    except ExpressionError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "line": e.line,
+            "output": interp.output,
+            "env": interp.env,
+            "warnings": []
+        }
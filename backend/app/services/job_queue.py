@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from fastapi import HTTPException  # pyright: ignore[reportMissingImports]
+
+from app.services import pool
+from app.services.runner import run_code
+from app.utils.metrics import counter_delta, counter_values, fold_counters, registry
+
+
+MAX_QUEUED_JOBS = 1000
+# jobs running at once (all clients) and per client
+MAX_RUNNING_JOBS = pool.EXECUTION_WORKERS
+MAX_RUNNING_PER_CLIENT = 2
+# finished jobs kept for polling; the oldest are dropped first, and any
+# older than the TTL (seconds) even below the cap
+MAX_FINISHED_JOBS = 1000
+FINISHED_JOB_TTL = 600
+# wall-clock limit for one job in its worker process (seconds)
+JOB_TIMEOUT = 30
+
+job_wait = registry.histogram("ayr_job_wait_seconds", "Time jobs spent queued.")
+job_run = registry.histogram("ayr_job_run_seconds", "Time jobs spent running.")
+
+
+@dataclass
+class Job:
+    id: str
+    client: str
+    priority: int
+    code: str
+    inputs: List[Any]
+    trace_format: str
+    seq: int = 0
+    status: str = "queued"          # queued | running | done | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    def info(self):
+        info = {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.started_at is not None:
+            info["wait_ms"] = round((self.started_at - self.submitted_at) * 1000, 2)
+        if self.finished_at is not None:
+            info["run_ms"] = round((self.finished_at - self.started_at) * 1000, 2)
+        if self.status == "done":
+            info["result"] = self.result
+        if self.error is not None:
+            info["error"] = self.error
+        return info
+
+
+class JobTimeout(BaseException):
+    """Raised in the worker when a job runs too long; BaseException so run_code can't swallow it."""
+
+
+def _run_job(code, trace_format, inputs, timeout):
+    """
+    Worker side: run_code under a SIGALRM deadline (where the platform has
+    one). Returns the result and what the metrics counters gained.
+    """
+    before = counter_values()
+    if not hasattr(signal, "setitimer"):
+        return run_code(code, trace_format, inputs), counter_delta(before)
+
+    def expired(signum, frame):
+        raise JobTimeout(f"Job {timeout} second se zyada chala, rok diya gaya.")
+
+    old = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = run_code(code, trace_format, inputs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old)
+    return result, counter_delta(before)
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0,
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class JobScheduler:
+    """
+    Bounded priority queue in front of the execution pool. Higher priority
+    runs first (FIFO within a priority); a client never has more than
+    MAX_RUNNING_PER_CLIENT jobs running, its other jobs wait while other
+    clients' jobs go ahead.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []                  # (-priority, seq, job)
+        self._seq = itertools.count()
+        self._dispatcher = None
+
+        self.jobs = {}
+        self._finished = OrderedDict()
+        self._running = 0
+        self._running_by_client = {}
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = _Timing()
+        self.run_time = _Timing()
+
+    # ---------- API ----------
+    def submit(self, code, inputs=None, priority=0, client="anonymous", trace_format="full"):
+        with self._cond:
+            if len(self._heap) >= MAX_QUEUED_JOBS:
+                self.rejected += 1
+                raise HTTPException(status_code=429, detail="Job queue full hai, thodi der baad try karo.")
+
+            job = Job(str(uuid.uuid4()), client, priority, code, list(inputs or []),
+                      trace_format, seq=next(self._seq))
+            self.jobs[job.id] = job
+            heapq.heappush(self._heap, (-priority, job.seq, job))
+            self.submitted += 1
+
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+
+        return job
+
+    def get(self, job_id):
+        with self._cond:
+            self._expire_finished(time.time())
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        info = job.info()
+        if job.status == "queued":
+            key = (-job.priority, job.seq)
+            with self._cond:
+                info["position"] = sum(1 for p, seq, _ in self._heap if (p, seq) < key)
+        return info
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "queue_depth": len(self._heap),
+                "running": self._running,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait_time": self.wait_time.summary(),
+                "run_time": self.run_time.summary(),
+            }
+
+    # ---------- scheduling ----------
+    def _next_runnable(self):
+        """Pop the best job whose client is under its limit (None if none)."""
+        skipped = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self._running_by_client.get(entry[2].client, 0) < MAX_RUNNING_PER_CLIENT:
+                job = entry[2]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    if self._running < MAX_RUNNING_JOBS:
+                        job = self._next_runnable()
+                    if job is None:
+                        self._cond.wait()
+
+                self._running += 1
+                self._running_by_client[job.client] = self._running_by_client.get(job.client, 0) + 1
+                job.status = "running"
+                job.started_at = time.time()
+                self.wait_time.add(job.started_at - job.submitted_at)
+                job_wait.observe(job.started_at - job.submitted_at)
+
+            try:
+                # non-interactive: pucho is answered from job.inputs, no session is kept
+                future = pool.submit(_run_job, job.code, job.trace_format, job.inputs, JOB_TIMEOUT)
+            except Exception as e:
+                self._finish(job, None, e)
+                continue
+            future.add_done_callback(lambda f, job=job: self._finish(job, f, None))
+
+    def _finish(self, job, future, error):
+        if error is None:
+            error = future.exception()
+
+        with self._cond:
+            job.finished_at = time.time()
+            self.run_time.add(job.finished_at - job.started_at)
+            job_run.observe(job.finished_at - job.started_at)
+
+            if error is None:
+                job.status = "done"
+                job.result, counters = future.result()
+                fold_counters(counters)
+                self.completed += 1
+            else:
+                job.status = "failed"
+                job.error = str(error)
+                self.failed += 1
+            job.code = None
+            job.inputs = None
+
+            self._running -= 1
+            self._running_by_client[job.client] -= 1
+            if self._running_by_client[job.client] == 0:
+                del self._running_by_client[job.client]
+
+            self._finished[job.id] = job
+            while len(self._finished) > MAX_FINISHED_JOBS:
+                old_id, _ = self._finished.popitem(last=False)
+                self.jobs.pop(old_id, None)
+            self._expire_finished(job.finished_at)
+
+            self._cond.notify()
+
+    def _expire_finished(self, now):
+        # _finished is in finish order, so expired jobs are at the front
+        while self._finished:
+            old_id, old = next(iter(self._finished.items()))
+            if now - old.finished_at < FINISHED_JOB_TTL:
+                break
+            self._finished.popitem(last=False)
+            self.jobs.pop(old_id, None)
+
+
+job_scheduler = JobScheduler()
+
+registry.gauge("ayr_job_queue_depth", "Jobs waiting to run.", lambda: len(job_scheduler._heap))
+registry.gauge("ayr_jobs_running", "Jobs currently running.", lambda: job_scheduler._running)
+registry.gauge(
+    "ayr_jobs_total", "Jobs by outcome.",
+    lambda: {
+        ("submitted",): job_scheduler.submitted,
+        ("rejected",): job_scheduler.rejected,
+        ("completed",): job_scheduler.completed,
+        ("failed",): job_scheduler.failed,
+    },
+    ("outcome",), kind="counter",
+)
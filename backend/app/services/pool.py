@@ -0,0 +1,49 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+# worker processes shared by /run/batch and the job queue
+EXECUTION_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+_pool = None
+_lock = threading.Lock()
+
+
+def get_execution_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXECUTION_WORKERS)
+        return _pool
+
+
+def _discard(pool):
+    """Forget a pool whose worker died; the next get_execution_pool() builds a new one."""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def submit(fn, *args):
+    """
+    Submit to the shared pool. A pool broken by a crashed worker (killed,
+    out of memory) is replaced instead of failing every later task.
+    """
+    pool = get_execution_pool()
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard(pool)
+        pool = get_execution_pool()
+        future = pool.submit(fn, *args)
+
+    def check(f, pool=pool):
+        if not f.cancelled() and isinstance(f.exception(), BrokenProcessPool):
+            _discard(pool)
+
+    future.add_done_callback(check)
+    return future
@@ -0,0 +1,50 @@
+import os
+import time
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser, MAX_PARSE_ERRORS
+from app.runtime.ast_cache import ASTCache
+from app.utils.metrics import phase_duration, registry
+
+
+# parsed programs survive restarts here. Off unless AYR_AST_CACHE_DIR is set:
+# entries are loaded back as trusted ASTs, so the directory must be private
+# to this service (a shared /tmp path is not)
+AST_CACHE_DIR = os.environ.get("AYR_AST_CACHE_DIR", "")
+
+ast_cache = ASTCache(AST_CACHE_DIR) if AST_CACHE_DIR else None
+
+
+def parse_program(code: str, max_errors: int = MAX_PARSE_ERRORS):
+    """
+    Program for `code`: from the on-disk AST cache, else Lexer + Parser (and
+    cached). Tokens are lexed on demand as the parser consumes them, so
+    parsing stops lexing once `max_errors` syntax errors were found.
+    """
+    if ast_cache is not None:
+        start = time.perf_counter()
+        program = ast_cache.get(code)
+        if program is not None:
+            phase_duration.observe(time.perf_counter() - start, "ast_cache_load")
+            return program
+
+    start = time.perf_counter()
+    program = Parser(Lexer(code).stream(), max_errors=max_errors).parse()
+    # lexing is interleaved with parsing, so both count as "parse"
+    phase_duration.observe(time.perf_counter() - start, "parse")
+
+    if ast_cache is not None:
+        # before any run: the interpreter's call-site caches aren't on the nodes yet
+        ast_cache.put(code, program)
+    return program
+
+
+registry.gauge(
+    "ayr_ast_cache_lookups_total", "On-disk AST cache lookups by result.",
+    lambda: {} if ast_cache is None else {
+        ("hit",): ast_cache.hits,
+        ("miss",): ast_cache.misses,
+        ("corrupt",): ast_cache.corrupt,
+    },
+    ("result",), kind="counter",
+)
@@ -1,8 +1,14 @@
+import time
 import uuid
-from app.runtime.lexer import Lexer
-from app.runtime.parser import Parser
+
+from fastapi import HTTPException  # pyright: ignore[reportMissingImports]
+
+from app.runtime.parser import ParseErrors
 from app.runtime.interpreter import Interpreter, ExpressionError, InputRequest
+from app.runtime.profiler import ProfilingInterpreter
+from app.services.program_cache import parse_program
 from app.services.session import session_manager
+from app.utils.metrics import phase_duration, record_interpreter
 
 
 def _make_problem(kind: str, title: str, message: str, line=None, expression=None):
@@ -15,7 +21,29 @@ def _make_problem(kind: str, title: str, message: str, line=None, expression=Non
     }
 
 
-def run_code(code: str):
+def _parse_problems(e):
+    """Problems for a failed lex/parse: one per syntax error the parser collected."""
+    if isinstance(e, ParseErrors):
+        return [
+            _make_problem(kind="error", title=f"Compiler/Parse Error (Line {line}):", message=msg, line=line)
+            for line, msg in e.errors
+        ]
+    return [_make_problem(kind="error", title="Compiler/Parse Error:", message=str(e))]
+
+
+def collapsed_stacks(session_id: str) -> str:
+    interp = session_manager.get(session_id)
+    if not isinstance(interp, ProfilingInterpreter):
+        raise HTTPException(status_code=400, detail="Ye session profile mode me nahi chala tha.")
+    return interp.stacks.collapsed()
+
+
+def _record_run(interp, exec_start):
+    phase_duration.observe(time.perf_counter() - exec_start, "execute")
+    record_interpreter(interp)
+
+
+def run_code(code: str, trace_format: str = "full", inputs=None, profile: bool = False):
     interp = None
     problems = []
     errors = []
@@ -23,14 +51,19 @@ def run_code(code: str):
     bugs = []
 
     try:
-        tokens = Lexer(code).tokenize()
-        program = Parser(tokens).parse()
+        program = parse_program(code)
+        exec_start = time.perf_counter()
 
-        interp = Interpreter()
+        interp = (ProfilingInterpreter if profile else Interpreter)(trace_format=trace_format)
         interp.load(program)
 
-        sid = str(uuid.uuid4())
-        session_manager.store(sid, interp)
+        sid = None
+        if inputs is None:
+            sid = str(uuid.uuid4())
+            session_manager.store(sid, interp)
+        else:
+            # every pucho is answered from the queue: nothing to resume later
+            interp.provide_inputs(inputs)
 
         while True:
             try:
@@ -42,12 +75,16 @@ def run_code(code: str):
                 p = _make_problem(
                     kind="error",
                     title=f"Input Required (Line {inp.line}):",
-                    message="Program ko input chahiye.",
+                    message=(
+                        "Program ko input chahiye." if inputs is None
+                        else "Program ko diye gaye inputs se zyada input chahiye."
+                    ),
                     line=inp.line,
                     expression=getattr(interp, "last_input_var", None),
                 )
                 problems.append(p)
                 errors.append(p)
+                _record_run(interp, exec_start)
 
                 return {
                     "success": False,
@@ -71,7 +108,10 @@ def run_code(code: str):
 
                     "env": interp.env,
                     "trace": interp.trace_log,
-                    "detail": { "state_info": (interp.state.info() if interp and hasattr(interp, "state") else None)},                    "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0
+                    "detail": { "state_info": (interp.state.info() if interp and hasattr(interp, "state") else None)},
+                    "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
+                    # covers the statements that ran before the pucho
+                    "profile": interp.profile_report(code) if profile else None,
                 }
 
             except ExpressionError as e:
@@ -92,7 +132,7 @@ def run_code(code: str):
                 problems.append(p)
                 errors.append(p)
 
-                interp.pc += 1
+                interp.skip_statement()
                 if interp.program and interp.pc >= len(interp.program.statements):
                     break
 
@@ -107,7 +147,7 @@ def run_code(code: str):
                 problems.append(p)
                 errors.append(p)
 
-                interp.pc += 1
+                interp.skip_statement()
                 if not interp.program or interp.pc >= len(interp.program.statements):
                     break
 
@@ -131,6 +171,8 @@ def run_code(code: str):
                 problems.append(p)
                 warnings.append(p)
 
+        _record_run(interp, exec_start)
+
         return {
             "success": (len(errors) == 0),
 
@@ -153,37 +195,33 @@ def run_code(code: str):
             "env": interp.env,
             "trace": interp.trace_log,
             "detail": { "state_info": interp.state.info() if hasattr(interp, "state") else None },
-            "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0
+            "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
+            "profile": interp.profile_report(code) if profile else None,
         }
 
     except Exception as e:
-        p = _make_problem(
-            kind="error",
-            title="Compiler/Parse Error:",
-            message=str(e),
-            line=None,
-            expression=None
-        )
+        parse_problems = _parse_problems(e)
 
         return {
             "success": False,
             "session_id": None,
             "output": [],
 
-            "problems": [p],
-            "errors": [p],
+            "problems": parse_problems,
+            "errors": parse_problems,
             "warnings": [],
             "bugs": [],
 
             "summary": {
-                "total_errors": 1,
+                "total_errors": len(parse_problems),
                 "total_warnings": 0,
                 "total_bugs": 0,
-                "total_problems": 1
+                "total_problems": len(parse_problems)
             },
 
             "env": {},
             "trace": [],
             "detail": { "state_info": interp.state.info() if hasattr(interp, "state") else None },
-            "memory_kb": 0
+            "memory_kb": 0,
+            "profile": interp.profile_report(code) if profile and interp is not None else None,
         }
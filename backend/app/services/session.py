@@ -1,18 +1,69 @@
+import threading
+import time
+
 from fastapi import HTTPException  # pyright: ignore[reportMissingImports]
 
+from app.runtime.interpreter import InputRequest
+from app.utils.metrics import registry, record_interpreter
+
+
+# every paused debug cursor holds a blocked thread: cursors of sessions
+# idle this long (seconds) are dropped, and past the cap the least
+# recently used ones go first
+CURSOR_IDLE_TTL = 600
+MAX_LIVE_CURSORS = 64
+
 
 class SessionManager:
     def __init__(self):
         self.sessions = {}
         self.debug_seen = {}
+        self._touched = {}
+        # requests and stream workers touch sessions from several threads
+        self._lock = threading.Lock()
 
     def store(self, sid, interp):
-        self.sessions[sid] = interp
+        with self._lock:
+            self.sessions[sid] = interp
+            self._touched[sid] = time.monotonic()
 
     def get(self, sid):
-        if sid not in self.sessions:
+        with self._lock:
+            interp = self.sessions.get(sid)
+            if interp is not None:
+                self._touched[sid] = time.monotonic()
+        if interp is None:
             raise HTTPException(status_code=404, detail="Session not found")
-        return self.sessions[sid]
+        return interp
+
+    def release_cursors(self, keep=None, now=None):
+        """
+        Drop the cursors of sessions idle past CURSOR_IDLE_TTL, then the
+        least recently used ones over MAX_LIVE_CURSORS. `keep` (the session
+        being debugged right now) is never dropped. Returns how many went.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            live = sorted(
+                (self._touched.get(sid, 0), sid, interp)
+                for sid, interp in self.sessions.items()
+                if interp.cursor_active()
+            )
+        excess = len(live) - MAX_LIVE_CURSORS
+        released = 0
+        for touched, sid, interp in live:
+            if sid == keep:
+                continue
+            if now - touched < CURSOR_IDLE_TTL and released >= excess:
+                break
+            interp.drop_cursor()
+            released += 1
+        return released
+
+    def snapshot(self):
+        """(session_id, interpreter) pairs, copied under the lock."""
+        with self._lock:
+            return list(self.sessions.items())
 
     def _seen_set(self, debug_key: str):
         if debug_key not in self.debug_seen:
@@ -34,6 +85,7 @@ class SessionManager:
 
         try:
             cont = interp.step()
+            record_interpreter(interp)
             return {
                 "success": True,
                 "done": (not cont),
@@ -42,10 +94,29 @@ class SessionManager:
                 "output": interp.output,
                 "warnings": getattr(interp, "warnings", []),
                 "trace": interp.trace_log,
-                "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
+                "state_info": interp.state.info() if hasattr(interp, "state") else None,
+            }
+        except InputRequest as inp:
+            # the statement is re-run once /input (or a ws `input`) answers it
+            record_interpreter(interp)
+            return {
+                "success": False,
+                "done": False,
+                "needs_input": True,
+                "var": getattr(interp, "last_input_var", None),
+                "vars": getattr(interp, "last_input_vars", None),
+                "line": inp.line,
+                "pc": interp.pc,
+                "env": interp.env,
+                "output": interp.output,
+                "warnings": getattr(interp, "warnings", []),
+                "trace": interp.trace_log,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
                 "state_info": interp.state.info() if hasattr(interp, "state") else None,
             }
         except Exception as e:
+            record_interpreter(interp)
             return {
                 "success": False,
                 "done": False,
@@ -55,7 +126,7 @@ class SessionManager:
                 "output": interp.output,
                 "warnings": getattr(interp, "warnings", []),
                 "trace": interp.trace_log,
-                "memory_kb": interp.state.memory_kb() if hasattr(interp, "state") else 0,
+                "memory_kb": interp.memory_kb() if hasattr(interp, "state") else 0,
                 "state_info": interp.state.info() if hasattr(interp, "state") else None,
             }
 
@@ -65,12 +136,14 @@ class SessionManager:
         if not hasattr(interp, "state"):
             return {"success": False, "error": "No state manager"}
 
+        # a statement half-run by the debug cursor is rewound first
+        interp.drop_cursor()
         if interp.state.index <= 0:
             return {"success": False, "error": "No previous state"}
 
-        interp.state.index -= 1
-        interp.env = interp.state.current()
-        interp.pc = max(0, interp.pc - 1)
+        # restores the nearest checkpoint and replays forward
+        interp.travel(interp.state.index - 1)
+        record_interpreter(interp)
 
         return {
             "success": True,
@@ -88,12 +161,12 @@ class SessionManager:
         if not hasattr(interp, "state"):
             return {"success": False, "error": "No state manager"}
 
-        if interp.state.index >= len(interp.state.history) - 1:
+        interp.drop_cursor()
+        if interp.state.index >= len(interp.state) - 1:
             return {"success": False, "error": "No next state"}
 
-        interp.state.index += 1
-        interp.env = interp.state.current()
-        interp.pc = interp.pc + 1
+        interp.travel(interp.state.index + 1)
+        record_interpreter(interp)
 
         return {
             "success": True,
@@ -105,6 +178,29 @@ class SessionManager:
             "state_info": interp.state.info(),
         }
 
+    def memory(self, sid=None):
+        """Deep memory usage of one session, or of all sessions combined."""
+        if sid is not None:
+            return {"session_id": sid, **self.get(sid).memory_report()}
+
+        totals = {}
+        sessions = []
+        busy = 0
+        for key, interp in self.snapshot():
+            try:
+                report = interp.memory_report()
+            except RuntimeError:
+                # its env / trace changed size under us: the session is
+                # running on another thread right now, skip it this time
+                busy += 1
+                continue
+            sessions.append({"session_id": key, "total_kb": report["total_kb"]})
+            for k, v in report.items():
+                totals[k] = round(totals.get(k, 0) + v, 2)
+
+        sessions.sort(key=lambda s: s["total_kb"], reverse=True)
+        return {"session_count": len(sessions), "busy_sessions": busy, **totals, "sessions": sessions}
+
     def env(self, sid):
         return self.get(sid).env
 
@@ -128,3 +224,18 @@ class SessionManager:
 
 
 session_manager = SessionManager()
+
+
+def _checkpoint_totals():
+    interps = [interp for _, interp in session_manager.snapshot()]
+    return {
+        ("count",): sum(len(i.state.checkpoints) for i in interps),
+        ("bytes",): sum(i.state.checkpoint_bytes for i in interps),
+    }
+
+
+registry.gauge("ayr_sessions", "Live debug/run sessions.", lambda: len(session_manager.sessions))
+registry.gauge("ayr_debug_cursors", "Paused debug cursors (one blocked thread each).",
+               lambda: sum(i.cursor_active() for _, i in session_manager.snapshot()))
+registry.gauge("ayr_session_checkpoints", "Time-travel checkpoints held by live sessions.",
+               _checkpoint_totals, ("unit",))
@@ -0,0 +1,210 @@
+import queue
+import threading
+import uuid
+
+from app.runtime.interpreter import Interpreter, ExpressionError, InputRequest
+from app.services.runner import _make_problem, _parse_problems
+from app.services.program_cache import parse_program
+from app.services.session import session_manager
+from app.utils.metrics import record_interpreter
+from app.utils.serializer import dumps
+
+
+# max events buffered between the interpreter thread and the HTTP response;
+# a slow client blocks the interpreter instead of growing memory
+STREAM_BUFFER = 256
+
+
+class StreamCancelled(Exception):
+    pass
+
+
+def _sse(event: str, data) -> str:
+    payload = dumps(data).decode("utf-8")
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class _EventChannel:
+    def __init__(self):
+        self.events = queue.Queue(maxsize=STREAM_BUFFER)
+        self.cancelled = threading.Event()
+
+    def _put(self, msg):
+        while True:
+            if self.cancelled.is_set():
+                raise StreamCancelled()
+            try:
+                self.events.put(msg, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def emit(self, event: str, data):
+        self._put(_sse(event, data))
+
+    def close(self):
+        self._put(None)
+
+
+class StreamingOutput:
+    """
+    Drop-in replacement for `interp.output` while streaming: every `dikhao`
+    value is sent as an SSE event instead of being kept in a list.
+    """
+
+    def __init__(self, channel: _EventChannel):
+        self.channel = channel
+        self.count = 0
+
+    def append(self, value):
+        self.channel.emit("output", {"index": self.count, "value": value})
+        self.count += 1
+
+
+def _execute(code: str, channel: _EventChannel, inputs=None):
+    errors = 0
+    problems = 0
+
+    def problem(p):
+        nonlocal errors, problems
+        problems += 1
+        if p["kind"] == "error":
+            errors += 1
+        channel.emit("error" if p["kind"] == "error" else "warning", p)
+
+    try:
+        program = parse_program(code)
+    except Exception as e:
+        for p in _parse_problems(e):
+            problem(p)
+        channel.emit("done", {"success": False, "session_id": None,
+                              "summary": {"total_errors": errors, "total_problems": problems}})
+        return
+
+    # the stream never sends the trace: don't deep-copy env every statement
+    interp = Interpreter(trace_format="off")
+    interp.load(program)
+    sink = StreamingOutput(channel)
+    interp.output = sink
+
+    sid = None
+    if inputs is None:
+        sid = str(uuid.uuid4())
+        session_manager.store(sid, interp)
+    else:
+        interp.provide_inputs(inputs)
+
+    try:
+        while True:
+            try:
+                if not interp.step():
+                    break
+
+            except InputRequest as inp:
+                # hand the session back to the regular /input flow
+                interp.output = []
+                channel.emit("input", {
+                    "session_id": sid,
+                    "var": getattr(interp, "last_input_var", None),
+                    "vars": getattr(interp, "last_input_vars", None),
+                    "line": inp.line,
+                })
+                channel.emit("done", {
+                    "success": False,
+                    "needs_input": True,
+                    "session_id": sid,
+                    "output_count": sink.count,
+                    "summary": {"total_errors": errors, "total_problems": problems},
+                })
+                return
+
+            except StreamCancelled:
+                raise
+
+            except ExpressionError as e:
+                line = getattr(e, "line", None)
+                problem(_make_problem(
+                    kind="error",
+                    title=f"Expression Error (Line {line}):" if line else "Expression Error:",
+                    message=str(e),
+                    line=line,
+                    expression=getattr(e, "expr_text", None),
+                ))
+                interp.skip_statement()
+                if interp.pc >= len(interp.program.statements):
+                    break
+
+            except Exception as e:
+                problem(_make_problem(
+                    kind="error",
+                    title="Runtime Error:",
+                    message=str(e),
+                ))
+                interp.skip_statement()
+                if interp.pc >= len(interp.program.statements):
+                    break
+
+        for v in interp.env:
+            if v not in interp.used_vars:
+                interp.warnings.append(
+                    f"⚠️ Warning: variable '{v}' define hua hai par use nahi hua."
+                )
+        for w in interp.warnings:
+            problem(_make_problem(kind="warning", title="Warning:", message=str(w)))
+
+        # the stream already delivered every output value
+        interp.output = []
+
+        channel.emit("done", {
+            "success": errors == 0,
+            "session_id": sid,
+            "output_count": sink.count,
+            "env": interp.env,
+            "summary": {
+                "total_errors": errors,
+                "total_warnings": problems - errors,
+                "total_problems": problems,
+            },
+            "detail": {"state_info": interp.state.info()},
+            "memory_kb": interp.memory_kb(),
+        })
+
+    except StreamCancelled:
+        # the stored session outlives this stream: detach it from the dead channel
+        interp.output = []
+        raise
+
+    finally:
+        record_interpreter(interp)
+
+
+def stream_code(code: str, inputs=None):
+    """
+    Run `code` on a worker thread and yield SSE messages as they happen:
+    `output` per dikhao value, `error` / `warning` problems, `input` when
+    pucho suspends the program, and a final `done` summary.
+    """
+    channel = _EventChannel()
+
+    def worker():
+        try:
+            try:
+                _execute(code, channel, inputs)
+            except StreamCancelled:
+                raise
+            except Exception as e:
+                channel.emit("error", _make_problem(kind="error", title="Runtime Error:", message=str(e)))
+            channel.close()
+        except StreamCancelled:
+            return
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    try:
+        while True:
+            msg = channel.events.get()
+            if msg is None:
+                break
+            yield msg
+    finally:
+        channel.cancelled.set()
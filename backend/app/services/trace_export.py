@@ -0,0 +1,32 @@
+from app.runtime.trace import ColumnarTrace
+from app.services.session import session_manager
+
+
+# max trace entries returned by one /trace page
+TRACE_PAGE_LIMIT = 1000
+
+
+def trace_page(session_id: str, start: int = 0, limit: int = 200):
+    """Per-step {i, line, env} entries, rebuilt only for the requested page."""
+    interp = session_manager.get(session_id)
+    trace = interp.trace_log
+
+    start = max(0, start)
+    limit = max(0, min(limit, TRACE_PAGE_LIMIT))
+
+    return {
+        "success": True,
+        "session_id": session_id,
+        "format": interp.trace_format,
+        "total": len(trace),
+        "start": start,
+        "entries": trace[start:start + limit],
+    }
+
+
+def export_trace(session_id: str) -> bytes:
+    """Binary columnar export of a session's trace (see ColumnarTrace.to_bytes)."""
+    trace = session_manager.get(session_id).trace_log
+    if not isinstance(trace, ColumnarTrace):
+        trace = ColumnarTrace.from_entries(trace)
+    return trace.to_bytes()
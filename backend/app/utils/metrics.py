@@ -0,0 +1,210 @@
+"""
+Minimal Prometheus-style metrics (text exposition format 0.0.4).
+
+Updates are plain attribute/dict writes with no locks: under the GIL a
+racing increment can very rarely be lost, which is fine for monitoring
+and keeps instrumentation off the interpreter's critical path. The
+interpreter itself only bumps ints on its own instance; every run, debug /
+input request and stream folds them into these metrics at the end
+(record_interpreter). Worker processes send what their counters gained
+back with the result (counter_delta / fold_counters).
+"""
+import bisect
+import time
+
+
+# seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    inner = ",".join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return "{" + inner + "}"
+
+
+def _fmt(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.values = {}
+
+    def inc(self, amount=1, *labels):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, v in list(self.values.items()):
+            yield self.name, _labels(self.label_names, labels), v
+
+
+class Gauge:
+    """
+    Value read from `fn()` at scrape time (a number, or a dict of label
+    tuple -> value). kind="counter" exposes a monotonic count kept elsewhere.
+    """
+
+    def __init__(self, name, help, fn, labels=(), kind="gauge"):
+        self.name, self.help, self.fn, self.label_names = name, help, fn, tuple(labels)
+        self.kind = kind
+
+    def samples(self):
+        value = self.fn()
+        if not isinstance(value, dict):
+            value = {(): value}
+        for labels, v in value.items():
+            yield self.name, _labels(self.label_names, labels), v
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}   # labels -> [bucket counts..., +Inf count, sum, count]
+
+    def observe(self, value, *labels):
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0] * (len(self.buckets) + 3)
+        s[bisect.bisect_left(self.buckets, value)] += 1
+        s[-2] += value
+        s[-1] += 1
+
+    def samples(self):
+        for labels, s in list(self.series.items()):
+            cumulative = 0
+            for i, le in enumerate(self.buckets + ("+Inf",)):
+                cumulative += s[i]
+                bucket_labels = _labels(self.label_names + ("le",), labels + (le,))
+                yield self.name + "_bucket", bucket_labels, cumulative
+            yield self.name + "_sum", _labels(self.label_names, labels), s[-2]
+            yield self.name + "_count", _labels(self.label_names, labels), s[-1]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name, help, fn, labels=(), kind="gauge"):
+        return self.register(Gauge(name, help, fn, labels, kind))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            for name, labels, value in list(m.samples()):
+                lines.append(f"{name}{labels} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------- HTTP ----------
+http_requests = registry.counter(
+    "ayr_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_latency = registry.histogram(
+    "ayr_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+
+# ---------- run_code ----------
+phase_duration = registry.histogram(
+    "ayr_run_phase_duration_seconds", "Parse (lexing included) / AST cache load / execute time per /run.", ("phase",))
+statements_executed = registry.counter(
+    "ayr_statements_executed_total", "Statements executed by the interpreter.")
+cache_lookups = registry.counter(
+    "ayr_call_cache_lookups_total", "Function/method call-site cache lookups.", ("cache", "result"))
+checkpoints_taken = registry.counter(
+    "ayr_checkpoints_total", "Time-travel checkpoints taken.")
+checkpoint_bytes_taken = registry.counter(
+    "ayr_checkpoint_bytes_total", "Deep size of all time-travel checkpoints taken.")
+
+def record_interpreter(interp):
+    """Fold one interpreter's hot-path counters into the registry and reset them."""
+    statements_executed.inc(interp.statements_executed)
+    cache_lookups.inc(interp.call_cache_hits, "call", "hit")
+    cache_lookups.inc(interp.call_cache_misses, "call", "miss")
+    cache_lookups.inc(interp.method_cache_hits, "method", "hit")
+    cache_lookups.inc(interp.method_cache_misses, "method", "miss")
+    interp.reset_counters()
+
+
+# counters a worker process hands back to the parent with each result
+WORKER_COUNTERS = (statements_executed, cache_lookups, checkpoints_taken, checkpoint_bytes_taken)
+
+
+def counter_values():
+    """Snapshot of WORKER_COUNTERS, taken in the worker before a task."""
+    return [dict(c.values) for c in WORKER_COUNTERS]
+
+
+def counter_delta(before):
+    """What WORKER_COUNTERS gained since `before` (plain, picklable)."""
+    return [
+        {labels: v - old.get(labels, 0) for labels, v in c.values.items() if v != old.get(labels, 0)}
+        for c, old in zip(WORKER_COUNTERS, before)
+    ]
+
+
+def fold_counters(delta):
+    """Add a worker's counter_delta to this process's metrics."""
+    for c, values in zip(WORKER_COUNTERS, delta):
+        for labels, v in values.items():
+            c.inc(v, *labels)
+
+
+def cache_hit_ratio():
+    ratios = {}
+    for cache in ("call", "method"):
+        hit = cache_lookups.values.get((cache, "hit"), 0)
+        miss = cache_lookups.values.get((cache, "miss"), 0)
+        ratios[(cache,)] = hit / (hit + miss) if hit + miss else 0.0
+    return ratios
+
+
+registry.gauge("ayr_call_cache_hit_ratio", "Hit ratio of the call-site caches.", cache_hit_ratio, ("cache",))
+
+
+class MetricsMiddleware:
+    """Counts requests and observes latency per route template (e.g. /jobs/{job_id})."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def wrapped_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_latency.observe(time.perf_counter() - start, scope["method"], path)
+            http_requests.inc(1, scope["method"], path, status)
@@ -0,0 +1,63 @@
+import json
+
+from fastapi.responses import Response  # pyright: ignore[reportMissingImports]
+
+from app.runtime.nodes import AYRObject, AYRClass
+from app.runtime.builtins import AYRRange, AYRArray
+from app.runtime.trace import ColumnarTrace
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+
+def encode_value(obj):
+    """`default` hook for runtime values the JSON backends don't know."""
+    if isinstance(obj, AYRObject):
+        return {"class": obj.class_ref.name, "fields": obj.fields}
+    if isinstance(obj, AYRClass):
+        return {"class": obj.name, "methods": list(obj.methods)}
+    if isinstance(obj, AYRArray):
+        return obj.tolist()
+    if isinstance(obj, AYRRange):
+        return {"start": obj.start, "stop": obj.stop, "step": obj.step}
+    if isinstance(obj, ColumnarTrace):
+        return obj.columns()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def stdlib_dumps(data) -> bytes:
+    return json.dumps(
+        data, default=encode_value, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(data) -> bytes:
+        try:
+            return orjson.dumps(data, default=encode_value, option=_ORJSON_OPTS)
+        except TypeError:
+            # orjson stops at 64-bit ints (and never asks `default` about
+            # them); AYR ints are unbounded, so let stdlib json do this one
+            return stdlib_dumps(data)
+
+else:
+    dumps = stdlib_dumps
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response serialized straight from interpreter state to bytes,
+    skipping FastAPI's jsonable_encoder pass over env/trace payloads.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,57 @@
+"""
+List vs NumPy-backed array() on the same transform + reduce workload.
+
+    cd backend
+    python -m benchmarks.bench_array --n 2000
+"""
+import argparse
+import time
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+
+
+LIST_PROGRAM = """
+xs = []
+har range({n}) main i
+    append(xs, i)
+total = 0
+har xs main v
+    total = total + v * 2 + 1
+dikhao total
+"""
+
+ARRAY_PROGRAM = """
+a = array(range({n}))
+b = a * 2 + 1
+dikhao sum(b)
+"""
+
+
+def run_program(src: str):
+    start = time.perf_counter()
+    interp = Interpreter()
+    interp.load(Parser(Lexer(src).tokenize()).parse())
+    interp.run()
+    return time.perf_counter() - start, interp.output
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--n", type=int, default=2000, help="number of elements")
+    args = ap.parse_args()
+
+    t_list, out_list = run_program(LIST_PROGRAM.format(n=args.n))
+    t_arr, out_arr = run_program(ARRAY_PROGRAM.format(n=args.n))
+
+    assert out_list == out_arr, (out_list, out_arr)
+
+    print(f"n={args.n}")
+    print(f"list  : {t_list * 1000:10.2f} ms")
+    print(f"array : {t_arr * 1000:10.2f} ms")
+    print(f"speedup: {t_list / t_arr:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cold Lexer + Parser vs loading the same Program from the on-disk AST
+cache, for generated sources of growing size.
+
+    cd backend
+    python -m benchmarks.bench_ast_cache --repeat 7
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.ast_cache import ASTCache
+from benchmarks.bench_parser import same_tree
+from benchmarks.generator import Knobs, generate
+
+
+SIZES = (50, 200, 800, 3200)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ASTCache(directory)
+        print(f"{'statements':>10} {'source_kb':>10} {'entry_kb':>9} {'parse_ms':>9} {'load_ms':>9} {'speedup':>8}")
+
+        for n in SIZES:
+            source, _ = generate(Knobs(statements=n, depth=2, expr_len=8, classes=4))
+            t_parse, program = best_of(lambda: Parser(Lexer(source).tokenize()).parse(), args.repeat)
+            cache.put(source, program)
+            t_load, loaded = best_of(lambda: cache.get(source), args.repeat)
+            assert same_tree(program, loaded), "cached tree differs"
+
+            entry_kb = os.path.getsize(cache.path(source)) / 1024
+            print(f"{n:>10} {len(source) / 1024:>10.1f} {entry_kb:>9.1f} "
+                  f"{t_parse * 1000:>9.2f} {t_load * 1000:>9.2f} {t_parse / t_load:>7.2f}x")
+
+        # a flipped byte must be detected, counted and the entry dropped
+        path = cache.path(source)
+        with open(path, "r+b") as f:
+            f.seek(-10, os.SEEK_END)
+            byte = f.read(1)
+            f.seek(-10, os.SEEK_END)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        assert cache.get(source) is None and not os.path.exists(path)
+        print(f"\ncorrupted entry ignored: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
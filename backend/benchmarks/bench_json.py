@@ -0,0 +1,79 @@
+"""
+Serialization time for a large /run payload (default: 50k trace entries).
+
+    cd backend
+    python -m benchmarks.bench_json --entries 50000
+"""
+import argparse
+import gzip
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder  # pyright: ignore[reportMissingImports]
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+from app.utils import serializer
+
+
+PROGRAM = """
+class Point:
+    kaam __init__(self, x, y):
+        self.x = x
+        self.y = y
+p = Point(1, 2)
+xs = [1, 2, 3, 4, 5]
+total = 0
+har range({n}) main i
+    total = total + i
+"""
+
+
+def build_payload(entries: int):
+    interp = Interpreter()
+    # one trace entry per loop iteration, plus a few for the setup lines
+    interp.load(Parser(Lexer(PROGRAM.format(n=entries)).tokenize()).parse())
+    interp.run()
+    return {"success": True, "env": interp.env, "trace": interp.trace_log[:entries]}
+
+
+def timed(fn, payload, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def fastapi_default(payload):
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--entries", type=int, default=50000, help="trace entries")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    payload = build_payload(args.entries)
+    print(f"trace entries: {len(payload['trace'])}")
+
+    backends = [("jsonable_encoder + json", fastapi_default), ("stdlib json", serializer.stdlib_dumps)]
+    if serializer.orjson is not None:
+        backends.append(("orjson", serializer.dumps))
+
+    base = None
+    for name, fn in backends:
+        t, body = timed(fn, payload, args.repeat)
+        base = base or t
+        print(f"{name:24}: {t * 1000:9.1f} ms  {len(body) / 1024:9.1f} KB  ({base / t:.1f}x)")
+
+    start = time.perf_counter()
+    packed = gzip.compress(body, compresslevel=5)
+    print(f"{'gzip (level 5)':24}: {(time.perf_counter() - start) * 1000:9.1f} ms  {len(packed) / 1024:9.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
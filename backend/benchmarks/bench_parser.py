@@ -0,0 +1,112 @@
+"""
+Pratt expression parser vs the previous precedence-climbing chain
+(expr -> logical -> comparison -> term -> factor -> unary -> primary) on
+expression-heavy sources. Both must build identical trees.
+
+    cd backend
+    python -m benchmarks.bench_parser --expr-len 16 --statements 400
+"""
+import argparse
+import time
+
+from app.runtime.lexer import Lexer, TOKEN_KEYWORD, TOKEN_OPERATOR
+from app.runtime.parser import Parser
+from app.runtime.nodes import BinaryOpNode
+from benchmarks.generator import Knobs, generate
+
+
+class DescentParser(Parser):
+    """The recursive-descent expression layer the Pratt loop replaced."""
+
+    def expr(self, min_power=0):
+        return self.logical()
+
+    def _binary(self, operand, ttype, ops):
+        node = operand()
+        while self.current.type == ttype and self.current.value in ops:
+            tok = self.current
+            self.advance()
+            right = operand()
+            node = BinaryOpNode(node, tok.value, right, tok.line,
+                                f"{node.expr_text} {tok.value} {right.expr_text}")
+        return node
+
+    def logical(self):
+        return self._binary(self.comparison, TOKEN_KEYWORD, ("aur", "ya"))
+
+    def comparison(self):
+        return self._binary(self.term, TOKEN_OPERATOR, (">", "<", ">=", "<=", "==", "!="))
+
+    def term(self):
+        return self._binary(self.factor, TOKEN_OPERATOR, ("+", "-"))
+
+    def factor(self):
+        return self._binary(self.unary, TOKEN_OPERATOR, ("*", "/", "%"))
+
+
+def same_tree(a, b):
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_tree(x, y) for x, y in zip(a, b))
+    if not hasattr(a, "__dict__"):
+        return a == b
+    da = {k: v for k, v in vars(a).items() if not k.startswith("_")}
+    db = {k: v for k, v in vars(b).items() if not k.startswith("_")}
+    return da.keys() == db.keys() and all(same_tree(da[k], db[k]) for k in da)
+
+
+# precedence and prefix corner cases, plus two syntax errors
+CASES = """
+x = 1 + 2 * 3 - 4 / 5 % 6
+y = 1 < 2 aur 3 >= 4 ya nahi x == 5
+z = nahi nahi x + 1 * y
+w = x - y - 1 < 2 < 3
+"""
+BAD = ("x = 1 +\n", "x = 1 * * 2\n")
+
+
+def best_of(parser_cls, tokens, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        program = parser_cls(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return best, program
+
+
+def error_of(parser_cls, src):
+    try:
+        parser_cls(Lexer(src).tokenize()).parse()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--expr-len", type=int, default=16, help="terms per expression")
+    ap.add_argument("--statements", type=int, default=400)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    pratt = Parser(Lexer(CASES).tokenize()).parse()
+    descent = DescentParser(Lexer(CASES).tokenize()).parse()
+    assert same_tree(pratt, descent), "trees differ on precedence cases"
+    for src in BAD:
+        assert error_of(Parser, src) == error_of(DescentParser, src), src
+
+    source, _ = generate(Knobs(statements=args.statements, expr_len=args.expr_len, depth=2))
+    tokens = Lexer(source).tokenize()
+
+    t_descent, p_descent = best_of(DescentParser, tokens, args.repeat)
+    t_pratt, p_pratt = best_of(Parser, tokens, args.repeat)
+    assert same_tree(p_pratt, p_descent), "trees differ on generated source"
+
+    print(f"{len(tokens)} tokens, {args.statements} statements, expr_len={args.expr_len}")
+    print(f"descent : {t_descent * 1000:8.2f} ms")
+    print(f"pratt   : {t_pratt * 1000:8.2f} ms   ({t_descent / t_pratt:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
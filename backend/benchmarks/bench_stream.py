@@ -0,0 +1,65 @@
+"""
+Streaming lexer vs tokenizing up front: peak memory of lex + parse for a
+large valid source, and time to the first syntax error near the top of
+a large broken one.
+
+    cd backend
+    python -m benchmarks.bench_stream --statements 8000
+"""
+import argparse
+import time
+import tracemalloc
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser, ParseErrors
+from benchmarks.generator import Knobs, generate
+from benchmarks.token_buffer import tokenize_compact
+
+
+SOURCES = {
+    "list": lambda src: Lexer(src).tokenize(),
+    "buffer": tokenize_compact,
+    "stream": lambda src: Lexer(src).stream(),
+}
+
+
+def peak_kb(source, tokens_of):
+    tracemalloc.start()
+    try:
+        Parser(tokens_of(source)).parse()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def first_error_ms(source, tokens_of):
+    start = time.perf_counter()
+    try:
+        Parser(tokens_of(source), max_errors=1).parse()
+    except ParseErrors as e:
+        line = e.errors[0][0]
+    else:
+        raise AssertionError("expected a syntax error")
+    return (time.perf_counter() - start) * 1000, line
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--statements", type=int, default=8000)
+    args = ap.parse_args()
+
+    source, _ = generate(Knobs(statements=args.statements, depth=2, classes=0, inputs=0))
+    lines = source.splitlines()
+    broken = "\n".join(lines[:2] + ["x = 1 +"] + lines[2:]) + "\n"
+    print(f"{len(lines)} lines, {len(source) / 1024:.0f} KB; syntax error on line 3 of the broken copy")
+    print(f"{'':>8} {'peak_kb':>10} {'first_error_ms':>15}")
+
+    for name, tokens_of in SOURCES.items():
+        peak = peak_kb(source, tokens_of)
+        ms, line = first_error_ms(broken, tokens_of)
+        assert line == 3, line
+        print(f"{name:>8} {peak:>10.0f} {ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
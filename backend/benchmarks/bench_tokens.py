@@ -0,0 +1,59 @@
+"""
+Token list (one Token object per token) vs the struct-of-arrays
+TokenBuffer: memory held by the tokens, peak memory of tokenize + parse,
+and time.
+
+    cd backend
+    python -m benchmarks.bench_tokens --statements 4000
+"""
+import argparse
+import time
+import tracemalloc
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from benchmarks.bench_parser import same_tree
+from benchmarks.generator import Knobs, generate
+from benchmarks.token_buffer import tokenize_compact
+
+
+def measure(source, compact):
+    tokenize = tokenize_compact if compact else (lambda src: Lexer(src).tokenize())
+
+    tracemalloc.start()
+    try:
+        tokens = tokenize(source)
+        held = tracemalloc.get_traced_memory()[0]
+        program = Parser(tokens).parse()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    tokens = tokenize(source)
+    lexed = time.perf_counter()
+    Parser(tokens).parse()
+    parsed = time.perf_counter()
+    return held, peak, lexed - start, parsed - lexed, len(tokens), program
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--statements", type=int, default=4000)
+    ap.add_argument("--expr-len", type=int, default=8)
+    args = ap.parse_args()
+
+    source, _ = generate(Knobs(statements=args.statements, expr_len=args.expr_len, depth=2))
+    rows = {}
+    for name, compact in (("list", False), ("buffer", True)):
+        rows[name] = measure(source, compact)
+    assert same_tree(rows["list"][5], rows["buffer"][5]), "programs differ"
+
+    print(f"{rows['list'][4]} tokens, {len(source) / 1024:.0f} KB of source")
+    print(f"{'':>8} {'tokens_kb':>10} {'peak_kb':>10} {'lex_ms':>9} {'parse_ms':>9}")
+    for name, (held, peak, t_lex, t_parse, _, _) in rows.items():
+        print(f"{name:>8} {held / 1024:>10.0f} {peak / 1024:>10.0f} {t_lex * 1000:>9.1f} {t_parse * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
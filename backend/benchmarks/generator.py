@@ -0,0 +1,118 @@
+"""
+Synthetic AYR program generator for scaling tests (see scaling.py).
+
+    cd backend
+    python -m benchmarks.generator --statements 20 --depth 2 --classes 1
+
+Programs are deterministic for a given seed, always valid, and terminate:
+expressions stay bounded and only `har range(...)` loops are generated.
+"""
+import argparse
+import random
+from dataclasses import dataclass
+
+
+VARIABLES = ("a", "b", "c", "d")
+
+
+@dataclass
+class Knobs:
+    statements: int = 50      # top-level statements in the body
+    depth: int = 1            # agar blocks wrapped around every statement
+    expr_len: int = 4         # terms per arithmetic expression
+    loop_trips: int = 10      # iterations of every generated loop
+    list_size: int = 10       # elements in the list literal
+    classes: int = 2          # user classes (one object + method calls each)
+    inputs: int = 2           # pucho calls (answered from a queue)
+    seed: int = 0
+
+
+KNOBS = tuple(k for k in Knobs.__dataclass_fields__ if k != "seed")
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+
+    def add(self, indent, text):
+        self.lines.append("    " * indent + text)
+
+
+def _expr(rng, knobs, extra=()):
+    # AYR has no parentheses or unary minus: keep every term small with
+    # `%` (binds tighter than + / -) so values stay bounded at any length
+    names = VARIABLES + tuple(extra)
+    out = ""
+    for k in range(max(1, knobs.expr_len)):
+        if rng.random() < 0.6:
+            term = f"{rng.choice(names)} % 97 * {rng.randint(1, 9)}"
+        else:
+            term = str(rng.randint(1, 9))
+        out += term if k == 0 else f" {rng.choice('+-')} {term}"
+    return out
+
+
+def _statement(w, rng, knobs, index, indent):
+    kind = index % 5
+    target = rng.choice(VARIABLES)
+
+    if kind == 0:
+        w.add(indent, f"{target} = {_expr(rng, knobs)}")
+    elif kind == 1:
+        w.add(indent, f"{target} = xs[{target} % {max(1, knobs.list_size)}]")
+    elif kind == 2:
+        w.add(indent, f"har range({knobs.loop_trips}) main i")
+        w.add(indent + 1, f"{target} = {_expr(rng, knobs, extra=('i',))}")
+    elif kind == 3 and knobs.classes:
+        obj = f"o{rng.randrange(knobs.classes)}"
+        w.add(indent, f"{target} = {obj}.get({target}) % 1000")
+    else:
+        w.add(indent, f"dikhao {target}")
+
+
+def generate(knobs: Knobs):
+    """Return (source, inputs) for one program; `inputs` answers its pucho calls."""
+    rng = random.Random(knobs.seed)
+    w = _Writer()
+
+    for k in range(knobs.classes):
+        w.add(0, f"class C{k}:")
+        w.add(1, "kaam __init__(self, v):")
+        w.add(2, "self.v = v")
+        w.add(1, "kaam get(self, x):")
+        w.add(2, f"wapas self.v + x * {k + 1}")
+    for k in range(knobs.classes):
+        w.add(0, f"o{k} = C{k}({k})")
+
+    w.add(0, "xs = [" + ", ".join(str(rng.randint(0, 99)) for _ in range(max(1, knobs.list_size))) + "]")
+    for name in VARIABLES:
+        w.add(0, f"{name} = {rng.randint(1, 9)}")
+
+    inputs = []
+    for k in range(knobs.inputs):
+        w.add(0, f"{VARIABLES[k % len(VARIABLES)]} = pucho")
+        inputs.append(rng.randint(1, 99))
+
+    for index in range(knobs.statements):
+        for level in range(knobs.depth):
+            name = VARIABLES[level % len(VARIABLES)]
+            w.add(level, f"agar {name} == {name}")
+        _statement(w, rng, knobs, index, knobs.depth)
+
+    return "\n".join(w.lines) + "\n", inputs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name, f in Knobs.__dataclass_fields__.items():
+        ap.add_argument(f"--{name.replace('_', '-')}", type=int, default=f.default)
+    args = ap.parse_args()
+
+    source, inputs = generate(Knobs(**vars(args)))
+    print(source, end="")
+    if inputs:
+        print(f"# inputs: {inputs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark suite: per-phase timings and peak memory for every workload,
+compared against a stored baseline.
+
+    cd backend
+    python -m benchmarks.run_suite                      # compare with baseline.json
+    python -m benchmarks.run_suite --save-baseline      # record a new baseline
+    python -m benchmarks.run_suite --threshold 0.2 --phase-threshold execute=0.1
+
+Phases: tokenize (Lexer.tokenize), parse (Parser.parse), execute (step()
+until done, minus snapshotting), snapshot (StateManager.save plus the
+per-step env copy into trace_log, as step() does them), time_travel (back to
+the start, the middle and the end of the history) and serialize (JSON of
+output/env/trace). Times are the best of --repeat runs; peak memory is
+measured with tracemalloc in a separate pass so it doesn't skew timings.
+Exits with status 1 when anything regresses past its threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+from app.utils.serializer import dumps
+from benchmarks.workloads import WORKLOADS
+
+
+PHASES = ("tokenize", "parse", "execute", "snapshot", "time_travel", "serialize")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# differences below this are timer noise, never a regression
+NOISE_FLOOR_MS = 0.5
+
+
+def _timed(obj, name, spent):
+    """Replace obj.<name> with a wrapper that adds its run time to spent[0]."""
+    fn = getattr(obj, name)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            spent[0] += time.perf_counter() - start
+
+    setattr(obj, name, timed)
+
+
+def _timed_snapshots(interp):
+    """Tally history saves and trace env copies, the two per-step snapshots."""
+    spent = [0.0]
+    _timed(interp.state, "save", spent)
+    _timed(interp, "_trace_snapshot", spent)
+    return spent
+
+
+def run_once(source):
+    """One full pipeline run; returns {phase: seconds}."""
+    timings = {}
+
+    start = time.perf_counter()
+    tokens = Lexer(source).tokenize()
+    timings["tokenize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = Parser(tokens).parse()
+    timings["parse"] = time.perf_counter() - start
+
+    interp = Interpreter()
+    interp.load(program)
+    snapshot = _timed_snapshots(interp)
+    start = time.perf_counter()
+    # step() like a session does, not run(): same saves and trace copies
+    while interp.step():
+        pass
+    elapsed = time.perf_counter() - start
+    timings["snapshot"] = snapshot[0]
+    timings["execute"] = elapsed - snapshot[0]
+
+    last = len(interp.state) - 1
+    start = time.perf_counter()
+    for target in (0, last // 2, last):
+        interp.travel(target)
+    timings["time_travel"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dumps({"output": interp.output, "env": interp.env, "trace": interp.trace_log})
+    timings["serialize"] = time.perf_counter() - start
+
+    return timings
+
+
+def peak_memory_kb(source):
+    tracemalloc.start()
+    try:
+        run_once(source)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def measure(source, repeat):
+    best = {phase: float("inf") for phase in PHASES}
+    for _ in range(repeat):
+        for phase, seconds in run_once(source).items():
+            best[phase] = min(best[phase], seconds)
+    result = {phase: round(best[phase] * 1000, 3) for phase in PHASES}
+    result["peak_kb"] = peak_memory_kb(source)
+    return result
+
+
+def compare(results, baseline, thresholds, memory_threshold):
+    """List of (workload, metric, baseline, current, ratio) that regressed."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for phase in PHASES:
+            old, new = base.get(phase), current[phase]
+            if old is None or new - old < NOISE_FLOOR_MS:
+                continue
+            if new > old * (1 + thresholds[phase]):
+                regressions.append((name, phase, old, new, new / old if old else float("inf")))
+        old, new = base.get("peak_kb"), current["peak_kb"]
+        if old and new > old * (1 + memory_threshold):
+            regressions.append((name, "peak_kb", old, new, new / old))
+    return regressions
+
+
+def _parse_phase_thresholds(items, default):
+    thresholds = {phase: default for phase in PHASES}
+    for item in items:
+        phase, _, value = item.partition("=")
+        if phase not in thresholds or not value:
+            raise SystemExit(f"--phase-threshold expects PHASE=RATIO with PHASE in {', '.join(PHASES)}")
+        thresholds[phase] = float(value)
+    return thresholds
+
+
+def print_table(results, baseline):
+    header = f"{'workload':<22}" + "".join(f"{p:>13}" for p in PHASES) + f"{'peak_kb':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<22}" + "".join(f"{r[p]:>11.2f}ms" for p in PHASES) + f"{r['peak_kb']:>11.1f}")
+        base = baseline.get(name)
+        if base:
+            deltas = []
+            for p in PHASES + ("peak_kb",):
+                old = base.get(p)
+                deltas.append(f"{(r[p] / old - 1) * 100:>+12.0f}%" if old else f"{'':>13}")
+            print(f"{'  vs baseline':<22}" + "".join(deltas[:-1]) + f"{deltas[-1]:>11}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5, help="runs per workload (best time is kept)")
+    ap.add_argument("--only", nargs="*", choices=sorted(WORKLOADS), help="workloads to run")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    ap.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed slowdown per phase as a ratio (0.25 = 25%%)")
+    ap.add_argument("--phase-threshold", action="append", default=[], metavar="PHASE=RATIO",
+                    help="override --threshold for one phase (repeatable)")
+    ap.add_argument("--memory-threshold", type=float, default=0.10,
+                    help="allowed peak memory growth as a ratio")
+    args = ap.parse_args()
+
+    thresholds = _parse_phase_thresholds(args.phase_threshold, args.threshold)
+    names = args.only or list(WORKLOADS)
+
+    results = {}
+    for name in names:
+        source, _ = WORKLOADS[name]
+        results[name] = measure(source, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("workloads", {})
+
+    print_table(results, {} if args.save_baseline else baseline)
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "workloads": merged,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nbaseline saved to {args.baseline}")
+        return
+
+    if not baseline:
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    regressions = compare(results, baseline, thresholds, args.memory_threshold)
+    if not regressions:
+        print("\nno regressions")
+        return
+
+    print("\nREGRESSIONS:")
+    for name, metric, old, new, ratio in regressions:
+        print(f"  {name}.{metric}: {old} -> {new} ({(ratio - 1) * 100:+.0f}%)")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
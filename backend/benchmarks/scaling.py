@@ -0,0 +1,200 @@
+"""
+Scaling sweeps: time and peak memory of Lexer, Parser and Interpreter as
+one generator knob grows while the others stay at their defaults.
+
+    cd backend
+    python -m benchmarks.scaling                        # every knob
+    python -m benchmarks.scaling --knob statements --knob depth
+    python -m benchmarks.scaling --plot-dir /tmp/ayr-scaling --csv scaling.csv
+
+For every knob the log-log slope of time against the knob value is
+reported: ~1 is linear, ~2 quadratic. Slopes above --cliff are flagged.
+Plots need matplotlib (optional); without it only the tables are printed.
+"""
+import argparse
+import csv
+import math
+import os
+import time
+import tracemalloc
+from dataclasses import replace
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+from benchmarks.generator import Knobs, KNOBS, generate
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:  # optional: tables only
+    plt = None
+
+
+STAGES = ("lexer", "parser", "interpreter")
+
+SWEEPS = {
+    "statements": (50, 100, 200, 400, 800),
+    "depth": (1, 2, 4, 8, 16),
+    "expr_len": (4, 16, 64, 256, 1024),
+    "loop_trips": (10, 40, 160, 640),
+    "list_size": (10, 100, 1000, 10000),
+    "classes": (1, 4, 16, 64),
+    "inputs": (1, 10, 100, 1000),
+}
+
+
+def run_stages(source, inputs):
+    """Seconds per stage for one full pipeline run."""
+    timings = {}
+
+    start = time.perf_counter()
+    tokens = Lexer(source).tokenize()
+    timings["lexer"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = Parser(tokens).parse()
+    timings["parser"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interp = Interpreter()
+    interp.load(program)
+    interp.provide_inputs(inputs)
+    interp.run()
+    timings["interpreter"] = time.perf_counter() - start
+
+    return timings
+
+
+def peak_kb(source, inputs):
+    """Peak traced memory per stage (each stage measured from its own start)."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        tokens = Lexer(source).tokenize()
+        peaks["lexer"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+
+        program = Parser(tokens).parse()
+        peaks["parser"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+
+        interp = Interpreter()
+        interp.load(program)
+        interp.provide_inputs(inputs)
+        interp.run()
+        peaks["interpreter"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {stage: round(b / 1024, 1) for stage, b in peaks.items()}
+
+
+def sweep(knob, values, base, repeat):
+    rows = []
+    for value in values:
+        source, inputs = generate(replace(base, **{knob: value}))
+        row = {"knob": knob, "value": value, "source_kb": round(len(source) / 1024, 1), "error": ""}
+        try:
+            best = {stage: float("inf") for stage in STAGES}
+            for _ in range(repeat):
+                for stage, seconds in run_stages(source, inputs).items():
+                    best[stage] = min(best[stage], seconds)
+            row.update({f"{stage}_ms": round(best[stage] * 1000, 3) for stage in STAGES})
+            row.update({f"{stage}_kb": kb for stage, kb in peak_kb(source, inputs).items()})
+        except Exception as e:
+            # a hard limit (e.g. RecursionError) is a cliff worth reporting, not a crash
+            row.update({f"{stage}_{unit}": None for stage in STAGES for unit in ("ms", "kb")})
+            row["error"] = type(e).__name__
+        rows.append(row)
+    return rows
+
+
+def slope(xs, ys):
+    """Least-squares slope of log(y) against log(x)."""
+    pts = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(p[0] for p in pts) / len(pts)
+    my = sum(p[1] for p in pts) / len(pts)
+    var = sum((p[0] - mx) ** 2 for p in pts)
+    if var == 0:
+        return None
+    return sum((p[0] - mx) * (p[1] - my) for p in pts) / var
+
+
+def print_sweep(knob, rows, cliff):
+    cols = ["value", "source_kb"] + [f"{s}_ms" for s in STAGES] + [f"{s}_kb" for s in STAGES]
+    print(f"\n== {knob} ==")
+    print("".join(f"{c:>15}" for c in cols))
+    for row in rows:
+        if row["error"]:
+            print(f"{row['value']:>15}{row['source_kb']:>15}   failed: {row['error']}")
+        else:
+            print("".join(f"{row[c]:>15}" for c in cols))
+
+    ok = [row for row in rows if not row["error"]]
+    xs = [row["value"] for row in ok]
+    notes = []
+    for stage in STAGES:
+        k = slope(xs, [row[f"{stage}_ms"] for row in ok])
+        if k is None:
+            continue
+        flag = "  <-- superlinear" if k > cliff else ""
+        notes.append(f"{stage} time ~ n^{k:.2f}{flag}")
+    print("   " + "; ".join(notes))
+
+
+def plot_sweep(knob, rows, plot_dir):
+    rows = [row for row in rows if not row["error"]]
+    xs = [row["value"] for row in rows]
+    fig, (ax_t, ax_m) = plt.subplots(1, 2, figsize=(11, 4))
+    for stage in STAGES:
+        ax_t.plot(xs, [row[f"{stage}_ms"] for row in rows], marker="o", label=stage)
+        ax_m.plot(xs, [row[f"{stage}_kb"] for row in rows], marker="o", label=stage)
+    for ax, label in ((ax_t, "time (ms)"), (ax_m, "peak memory (KB)")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel(knob)
+        ax.set_ylabel(label)
+        ax.legend()
+    fig.tight_layout()
+    path = os.path.join(plot_dir, f"scaling_{knob}.png")
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--knob", action="append", choices=KNOBS, help="knob to sweep (repeatable; default all)")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per point (best time is kept)")
+    ap.add_argument("--cliff", type=float, default=1.3, help="flag slopes above this")
+    ap.add_argument("--csv", help="write all rows to this CSV file")
+    ap.add_argument("--plot-dir", help="write one PNG per knob here (needs matplotlib)")
+    args = ap.parse_args()
+
+    base = Knobs()
+    all_rows = []
+    for knob in args.knob or KNOBS:
+        rows = sweep(knob, SWEEPS[knob], base, args.repeat)
+        print_sweep(knob, rows, args.cliff)
+        all_rows.extend(rows)
+
+        if args.plot_dir:
+            if plt is None:
+                print("   (matplotlib not installed, skipping plot)")
+            else:
+                os.makedirs(args.plot_dir, exist_ok=True)
+                print(f"   plot: {plot_sweep(knob, rows, args.plot_dir)}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(all_rows[0]))
+            writer.writeheader()
+            writer.writerows(all_rows)
+        print(f"\nrows written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Struct-of-arrays token list, kept as a baseline for bench_tokens and
+bench_stream. The runtime parses from Lexer.stream(), which holds no token
+list at all; building a Token per read made parsing from this buffer
+slower, so nothing outside the benchmarks uses it.
+"""
+from array import array
+
+from app.runtime.lexer import (
+    Lexer, Token, TOKEN_KEYWORD, TOKEN_IDENTIFIER, TOKEN_NUMBER, TOKEN_STRING,
+    TOKEN_OPERATOR, TOKEN_NEWLINE, TOKEN_INDENT, TOKEN_DEDENT, TOKEN_EOF,
+)
+
+
+# small-int codes stored per token
+TOKEN_TYPES = (
+    TOKEN_KEYWORD, TOKEN_IDENTIFIER, TOKEN_NUMBER, TOKEN_STRING, TOKEN_OPERATOR,
+    TOKEN_NEWLINE, TOKEN_INDENT, TOKEN_DEDENT, TOKEN_EOF,
+)
+_TYPE_CODES = {t: code for code, t in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer:
+    """
+    Token stream as parallel arrays: a type code (array('B')), an interned
+    value id, position and line (array('I')) per token. Indexing builds a
+    Token on demand, so Parser walks it with the same cursor code as a
+    list while only the tokens it currently holds exist as objects.
+    """
+
+    def __init__(self):
+        self.types = array("B")
+        self.value_ids = array("I")
+        self.positions = array("I")
+        self.lines = array("I")
+        self.values = [None]
+        self._interned = {(type(None), None): 0}
+
+    def append(self, ttype, value, position, line):
+        key = (type(value), value)   # keep 1, 1.0 and True apart
+        vid = self._interned.get(key)
+        if vid is None:
+            vid = self._interned[key] = len(self.values)
+            self.values.append(value)
+        self.types.append(_TYPE_CODES[ttype])
+        self.value_ids.append(vid)
+        self.positions.append(position)
+        self.lines.append(line)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        return Token(TOKEN_TYPES[self.types[i]], self.values[self.value_ids[i]],
+                     self.positions[i], self.lines[i])
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self[i]
+
+
+def tokenize_compact(source):
+    """Same tokens as Lexer(source).tokenize(), as a TokenBuffer."""
+    buf = TokenBuffer()
+    append = buf.append
+    for t in Lexer(source)._scan():
+        append(*t)
+    return buf
@@ -0,0 +1,82 @@
+"""
+Representative AYR programs for the benchmark suite (see run_suite.py).
+
+Each workload stresses one part of the runtime; sizes are picked so a
+single run takes tens of milliseconds on a laptop.
+"""
+
+ARITH_LOOP = """
+i = 0
+total = 0
+jabtak i < 4000
+    total = total + i * 3 % 7 - 1
+    i = i + 1
+dikhao total
+"""
+
+RECURSION = """
+kaam fib(n):
+    agar n < 2
+        wapas n
+    wapas fib(n - 1) + fib(n - 2)
+
+dikhao fib(14)
+"""
+
+# deeper than Python's recursion limit allows without tail calls
+TAIL_RECURSION = """
+kaam total(n, acc):
+    agar n == 0
+        wapas acc
+    wapas total(n - 1, acc + n)
+
+dikhao total(3000, 0)
+"""
+
+LIST_INDEXING = """
+xs = []
+har range(500) main i
+    append(xs, i * 2)
+total = 0
+har range(3) main r
+    har range(500) main j
+        total = total + xs[j] - xs[499 - j]
+dikhao total
+"""
+
+STRING_INTERPOLATION = """
+name = "AYR"
+har range(2000) main i
+    msg = "step {i} of {name}"
+dikhao msg
+"""
+
+OOP_METHODS = """
+class Counter:
+    kaam __init__(self, start):
+        self.n = start
+    kaam inc(self, by):
+        self.n = self.n + by
+        wapas self.n
+
+c = Counter(0)
+har range(1500) main i
+    c.inc(2)
+dikhao c.n
+"""
+
+# one top-level statement per step, so the time-travel ledger gets deep
+DEEP_HISTORY = "xs = []\ntotal = 0\n" + "".join(
+    f"total = total + {i}\nappend(xs, total % 10)\n" for i in range(800)
+) + "dikhao total\n"
+
+# name -> (source, what it stresses)
+WORKLOADS = {
+    "arith_loop": (ARITH_LOOP, "tight jabtak arithmetic loop"),
+    "recursion": (RECURSION, "recursive kaam calls"),
+    "tail_recursion": (TAIL_RECURSION, "self tail calls run as a loop"),
+    "list_indexing": (LIST_INDEXING, "list indexing in nested har loops"),
+    "string_interpolation": (STRING_INTERPOLATION, "{...} interpolation in string literals"),
+    "oop_methods": (OOP_METHODS, "method calls on a user class"),
+    "deep_history": (DEEP_HISTORY, "long time-travel history with a growing list"),
+}
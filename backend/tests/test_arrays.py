@@ -0,0 +1,50 @@
+import copy
+
+import pytest
+
+from app.runtime.builtins import AYRArray, BUILTINS, BuiltinError, array_binary_op
+from app.services.runner import run_code
+
+
+array = BUILTINS["array"].fn
+
+
+def test_deep_copies_share_the_buffer_until_a_write():
+    a = array([1, 2, 3])
+    b = copy.deepcopy(a)
+    assert b.data is a.data
+
+    b.set_item(0, 10)
+    assert b.data is not a.data
+    assert a.tolist() == [1, 2, 3] and b.tolist() == [10, 2, 3]
+
+    # the original still thinks it is shared: its first write copies too
+    buffer = a.data
+    a.set_item(1, 20)
+    assert a.data is not buffer and a.tolist() == [1, 20, 3]
+
+
+def test_float_write_widens_the_copy_only():
+    a = array([1, 2])
+    b = copy.deepcopy(a)
+    b.set_item(0, 0.5)
+    assert b.tolist() == [0.5, 2.0] and a.tolist() == [1, 2]
+
+
+def test_vectorized_ops_and_guards():
+    a = array([1, 2, 3])
+    assert array_binary_op(a, 2, "*").tolist() == [2, 4, 6]
+    assert array_binary_op(a, array([3, 2, 1]), ">").tolist() == [False, False, True]
+    with pytest.raises(BuiltinError):
+        array_binary_op(a, 0, "%")
+    with pytest.raises(BuiltinError):
+        array_binary_op(array([2 ** 62]), 4, "*")
+    with pytest.raises(BuiltinError):
+        bool(a)
+
+
+def test_time_travel_keeps_old_array_values():
+    result = run_code("a = array([1, 2, 3])\na[0] = 9\ndikhao a\n")
+    assert result["output"][0].tolist() == [9, 2, 3]
+    snapshots = [step["env"]["a"].tolist() for step in result["trace"] if "a" in step["env"]]
+    assert snapshots == [[1, 2, 3], [9, 2, 3], [9, 2, 3]]
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import threading
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.ast_cache import ASTCache
+
+
+SOURCE = "kaam f(n):\n    wapas n * 2\nagar f(2) > 3\n    dikhao \"ok\"\n"
+
+
+def parse(code):
+    return Parser(Lexer(code).tokenize()).parse()
+
+
+def test_round_trip_and_corrupt_entry(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    assert cache.get(SOURCE) is None
+
+    cache.put(SOURCE, parse(SOURCE))
+    assert cache.get(SOURCE) == parse(SOURCE)
+
+    with open(cache.path(SOURCE), "r+b") as f:
+        f.seek(-3, os.SEEK_END)
+        f.write(b"xyz")
+    assert cache.get(SOURCE) is None
+    assert cache.corrupt == 1 and not os.path.exists(cache.path(SOURCE))
+
+
+def test_concurrent_puts_leave_one_entry(tmp_path):
+    cache = ASTCache(str(tmp_path / "cache"))
+    program = parse(SOURCE)
+    threads = [threading.Thread(target=cache.put, args=(SOURCE, program)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert os.listdir(cache.directory) == [os.path.basename(cache.path(SOURCE))]
+    assert os.stat(cache.directory).st_mode & 0o777 == 0o700
+    assert cache.get(SOURCE) == program
+
+
+def cache_dir_in_fresh_process(env):
+    # the cache is configured once, at import time
+    code = "from app.services.program_cache import ast_cache; print(ast_cache and ast_cache.directory)"
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=backend, env=env,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+def test_disabled_unless_configured(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "AYR_AST_CACHE_DIR"}
+    assert cache_dir_in_fresh_process(env) == "None"
+    assert cache_dir_in_fresh_process({**env, "AYR_AST_CACHE_DIR": str(tmp_path)}) == str(tmp_path)
@@ -0,0 +1,48 @@
+import json
+
+from app.services import batch_runner
+from app.services.batch_runner import run_batch, stream_batch
+
+
+SQUARE = "x = pucho\ndikhao x * x\n"
+
+
+def test_results_follow_job_order_and_sources_are_parsed_once(monkeypatch):
+    parsed = []
+    parse = batch_runner.parse_program
+    monkeypatch.setattr(batch_runner, "parse_program", lambda code: parsed.append(code) or parse(code))
+
+    jobs = [{"code": SQUARE, "inputs": [i]} for i in range(5)] + [{"code": "dikhao 7\n"}]
+    result = run_batch(jobs)
+
+    assert result["success"] and result["count"] == 6
+    assert result["unique_sources"] == 2
+    assert sorted(parsed) == sorted([SQUARE, "dikhao 7\n"])
+    assert [r["output"] for r in result["results"]] == [[0], [1], [4], [9], [16], [7]]
+
+
+def test_pooled_batch_keeps_job_order():
+    jobs = [{"code": SQUARE, "inputs": [i]} for i in range(batch_runner.MIN_PARALLEL_JOBS + 4)]
+    jobs[3] = {"code": "dikhao 1 +\n"}
+    result = run_batch(jobs)
+
+    assert not result["success"]
+    assert result["results"][3]["errors"][0]["line"] == 1
+    assert [r["output"] for i, r in enumerate(result["results"]) if i != 3] == [
+        [i * i] for i in range(len(jobs)) if i != 3
+    ]
+
+
+def test_stream_lines_carry_their_job_index():
+    lines = [json.loads(line) for line in stream_batch([{"code": "dikhao 1\n"}, {"code": "dikhao 2\n"}])]
+    assert sorted((line["index"], line["output"]) for line in lines) == [(0, [1]), (1, [2])]
+
+
+def test_a_job_past_the_time_limit_is_stopped(monkeypatch):
+    monkeypatch.setattr(batch_runner, "JOB_TIMEOUT", 0.2)
+    result = run_batch([{"code": "dikhao 1\njabtak true\n    x = 1\n"}, {"code": "dikhao 2\n"}])
+
+    looping, fine = result["results"]
+    assert looping["output"] == [1]
+    assert looping["errors"][0]["title"] == "Time Limit Exceeded:"
+    assert fine["success"] and fine["output"] == [2]
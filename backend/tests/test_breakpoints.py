@@ -0,0 +1,55 @@
+from app.services.debug_runner import (
+    start_debug_session, set_breakpoint, clear_breakpoint, continue_to_breakpoint, step_cursor,
+)
+
+
+LOOP = """total = 0
+i = 0
+jabtak i < 100
+    total = total + i
+    i = i + 1
+dikhao total
+"""
+
+
+def test_conditional_breakpoint_pauses_inside_the_loop():
+    sid = start_debug_session(LOOP, "bp-cond")["session_id"]
+    assert set_breakpoint(sid, 4, "i == 42")["success"]
+
+    hit = continue_to_breakpoint(sid, "bp-cond")
+    assert hit["success"] and not hit["done"]
+    assert hit["line"] == 4 and hit["breakpoint"]["condition"] == "i == 42"
+    assert hit["breakpoint"]["paused"] == "before"
+    assert hit["env"]["i"] == 42 and hit["cursor"]["active"]
+
+    # the condition is false for the rest of the loop
+    done = continue_to_breakpoint(sid, "bp-cond")
+    assert done["done"] and done["output"] == [4950]
+
+
+def test_each_continue_stops_at_the_next_hit():
+    sid = start_debug_session(LOOP, "bp-each")["session_id"]
+    set_breakpoint(sid, 5)
+
+    seen = [continue_to_breakpoint(sid, "bp-each")["env"]["i"] for _ in range(3)]
+    assert seen == [0, 1, 2]
+
+    # stepping from a hit works, then continue without breakpoints runs to the end
+    assert step_cursor(sid, "bp-each", "into")["line"] == 4
+    clear_breakpoint(sid)
+    assert continue_to_breakpoint(sid, "bp-each")["output"] == [4950]
+
+
+def test_top_level_breakpoint_and_bad_condition():
+    sid = start_debug_session(LOOP, "bp-top")["session_id"]
+    assert not set_breakpoint(sid, 6, "i ==")["success"]
+    set_breakpoint(sid, 6)
+    hit = continue_to_breakpoint(sid, "bp-top")
+    assert hit["line"] == 6 and hit["env"]["total"] == 4950 and hit["output"] == []
+
+
+def test_runtime_error_is_reported_once_and_skipped():
+    sid = start_debug_session("x = 1\ny = nope\ndikhao x\n", "bp-err")["session_id"]
+    failed = continue_to_breakpoint(sid, "bp-err")
+    assert not failed["success"] and failed["line"] == 2
+    assert continue_to_breakpoint(sid, "bp-err")["output"] == [1]
@@ -0,0 +1,63 @@
+import pytest
+
+from app.runtime.builtins import AYRRange, BUILTINS, BuiltinError
+from app.services.runner import run_code
+
+
+def call(name, *args):
+    return BUILTINS[name].fn(*args)
+
+
+def test_range_is_lazy_and_matches_python():
+    r = call("range", 2, 11, 3)
+    assert isinstance(r, AYRRange)
+    assert list(r) == list(range(2, 11, 3))
+    assert call("len", r) == 3
+    assert call("sum", call("range", 5)) == 10
+    assert call("min", call("range", 3, 7)) == 3 and call("max", call("range", 3, 7)) == 6
+
+
+@pytest.mark.parametrize("name, args, result", [
+    ("len", ("abc",), 3),
+    ("min", (4, 2, 8), 2),
+    ("max", ([1, 9, 3],), 9),
+    ("sorted", ([3, 1, 2],), [1, 2, 3]),
+    ("abs", (-4,), 4),
+    ("str", (True,), "true"),
+    ("str", (None,), "none"),
+    ("int", ("42",), 42),
+    ("float", ("1.5",), 1.5),
+    ("mean", ([1, 2, 3, 4],), 2.5),
+    ("any", ([False, True],), True),
+    ("all", ([True, False],), False),
+])
+def test_results(name, args, result):
+    assert call(name, *args) == result
+
+
+@pytest.mark.parametrize("name, args", [
+    ("range", (1, 5, 0)),
+    ("range", (1.5,)),
+    ("sum", (["a"],)),
+    ("min", ([],)),
+    ("max", ([1, "a"],)),
+    ("pop", ([],)),
+    ("int", ("abc",)),
+    ("int", (True,)),
+    ("len", (5,)),
+])
+def test_errors_are_builtin_errors(name, args):
+    with pytest.raises(BuiltinError):
+        call(name, *args)
+
+
+def test_append_and_pop_change_the_list_in_place():
+    xs = [1, 2]
+    assert call("append", xs, 3) is None and xs == [1, 2, 3]
+    assert call("pop", xs) == 3 and call("pop", xs, 0) == 1 and xs == [2]
+
+
+def test_builtin_errors_and_arity_reach_the_program():
+    result = run_code("dikhao len(range(5))\nx = pop([])\ny = len(1, 2)\n")
+    assert result["output"] == [5]
+    assert [e["line"] for e in result["errors"]] == [2, 3]
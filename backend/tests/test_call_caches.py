@@ -0,0 +1,59 @@
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+
+
+def run(code):
+    interp = Interpreter(trace_format="off")
+    interp.load(Parser(Lexer(code).tokenize()).parse())
+    while interp.step():
+        pass
+    return interp
+
+
+def test_call_site_sees_a_redefined_function():
+    interp = run(
+        "kaam f(n):\n"
+        "    wapas n + 1\n"
+        "har range(3) main i\n"
+        "    dikhao f(i)\n"
+        "    agar i == 0\n"
+        "        kaam f(n):\n"
+        "            wapas n * 10\n"
+    )
+    assert interp.output == [1, 10, 20]
+
+
+def test_kaam_defined_later_shadows_a_cached_builtin():
+    interp = run(
+        "har range(2) main i\n"
+        "    dikhao len([1, 2])\n"
+        "    kaam len(x):\n"
+        "        wapas 99\n"
+    )
+    assert interp.output == [2, 99]
+
+
+def test_method_cache_follows_the_receiver_class():
+    interp = run(
+        "class A:\n"
+        "    kaam who(self):\n"
+        "        wapas 1\n"
+        "old = A()\n"
+        "har range(3) main i\n"
+        "    a = A()\n"
+        "    dikhao a.who() + old.who() * 10\n"
+        "    class A:\n"
+        "        kaam who(self):\n"
+        "            wapas 2\n"
+    )
+    # instances made before the redefinition keep the old methods
+    assert interp.output == [11, 12, 12]
+    assert interp.method_cache_hits > 0
+
+
+def test_repeated_calls_hit_the_inline_cache():
+    interp = run("kaam f(n):\n    wapas n\nhar range(50) main i\n    x = f(i)\n")
+    # range() once, f(i) resolved on its first call only
+    assert interp.call_cache_misses == 2
+    assert interp.call_cache_hits == 49
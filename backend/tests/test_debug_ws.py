@@ -0,0 +1,54 @@
+import time
+
+from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+
+from app.main import app
+from app.services.session import session_manager
+
+
+CODE = "a = 1\nx = pucho\ndikhao x + a\n"
+
+
+def test_step_input_step():
+    client = TestClient(app)
+    with client.websocket_connect("/debug/ws") as ws:
+        ws.send_json({"cmd": "start", "code": CODE, "debug_key": "ws-input"})
+        assert ws.receive_json()["type"] == "state"
+
+        ws.send_json({"cmd": "step"})
+        assert ws.receive_json()["env"]["set"] == {"a": 1}
+
+        ws.send_json({"cmd": "step"})
+        reply = ws.receive_json()
+        assert reply["success"] is False and reply["needs_input"] is True
+        assert (reply["var"], reply["line"]) == ("x", 2)
+        assert "error" not in reply
+
+        ws.send_json({"cmd": "input", "value": "41"})
+        reply = ws.receive_json()
+        assert reply["success"] is True
+        assert reply["env"]["set"] == {"x": 41} and reply["output"] == [42]
+
+        ws.send_json({"cmd": "step"})
+        assert ws.receive_json()["done"] is True
+
+
+def test_disconnect_releases_a_paused_cursor():
+    client = TestClient(app)
+    with client.websocket_connect("/debug/ws") as ws:
+        ws.send_json({"cmd": "start", "code": "har range(3) main i\n    dikhao i\n", "debug_key": "ws-close"})
+        sid = ws.receive_json()["session_id"]
+        ws.send_json({"cmd": "step_into"})
+        ws.send_json({"cmd": "step_into"})
+        ws.receive_json()
+        assert ws.receive_json()["cursor"]["active"]
+        thread = session_manager.get(sid)._cursor._thread
+
+    # the server side notices the close on its own schedule
+    interp = session_manager.get(sid)
+    deadline = time.monotonic() + 5
+    while interp.cursor_active() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not interp.cursor_active() and interp.pc == 0
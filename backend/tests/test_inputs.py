@@ -0,0 +1,41 @@
+from app.services.input_runner import resume_with_input
+from app.services.runner import run_code
+
+
+LOOP = """total = 0
+har range(3) main i
+    x = pucho
+    total = total + x
+dikhao total
+"""
+
+
+def test_queued_inputs_answer_every_pucho():
+    result = run_code(LOOP, inputs=[1, "2", " 3 "])
+    assert result["success"] and result["output"] == [6]
+    assert result["session_id"] is None
+
+
+def test_queued_values_are_typed_and_multi_assign_takes_one_entry():
+    code = "a, b = pucho\nname = pucho\ndikhao a + b\ndikhao name\n"
+    result = run_code(code, inputs=["2 3.5", "ayr"])
+    assert result["output"] == [5.5, "ayr"]
+
+
+def test_running_out_of_queued_inputs():
+    result = run_code(LOOP, inputs=[1])
+    assert result["needs_input"] and result["line"] == 3
+    assert result["errors"][0]["message"] == "Program ko diye gaye inputs se zyada input chahiye."
+    assert result["session_id"] is None
+
+
+def test_interactive_run_resumes_inside_the_loop():
+    first = run_code(LOOP)
+    assert first["needs_input"] and first["var"] == "x"
+    sid = first["session_id"]
+
+    assert resume_with_input(sid, "10")["need_input"]
+    assert resume_with_input(sid, "20")["need_input"]
+    last = resume_with_input(sid, "30")
+    assert last["success"] and last["output"] == [60]
+    assert last["env"]["total"] == 60
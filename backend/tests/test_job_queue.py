@@ -0,0 +1,58 @@
+import heapq
+import time
+
+import pytest
+
+from app.services import job_queue
+from app.services.job_queue import Job, JobScheduler, JobTimeout, MAX_RUNNING_PER_CLIENT, _run_job
+
+
+def queued(scheduler, client, priority):
+    job = Job(f"{client}-{priority}", client, priority, "dikhao 1\n", [], "off", seq=next(scheduler._seq))
+    heapq.heappush(scheduler._heap, (-priority, job.seq, job))
+    return job
+
+
+def test_higher_priority_first_then_fifo():
+    s = JobScheduler()
+    low, high, high2 = queued(s, "a", 0), queued(s, "b", 5), queued(s, "c", 5)
+    assert [s._next_runnable() for _ in range(3)] == [high, high2, low]
+
+
+def test_client_at_its_limit_waits_while_others_run():
+    s = JobScheduler()
+    busy = queued(s, "busy", 9)
+    other = queued(s, "other", 1)
+    s._running_by_client["busy"] = MAX_RUNNING_PER_CLIENT
+
+    assert s._next_runnable() is other
+    # the skipped job stays queued for later
+    assert s._next_runnable() is None and len(s._heap) == 1
+
+    s._running_by_client["busy"] -= 1
+    assert s._next_runnable() is busy
+
+
+def test_run_job_stops_at_the_deadline():
+    start = time.monotonic()
+    with pytest.raises(JobTimeout):
+        _run_job("jabtak true\n    x = 1\n", "off", [], 0.2)
+    assert time.monotonic() - start < 5
+
+    result, counters = _run_job("dikhao 2\n", "off", [], 5)
+    # statements_executed gained one, counted in this (worker) process
+    assert result["output"] == [2] and sum(counters[0].values()) == 1
+
+
+def test_timed_out_job_is_reported_failed(monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_TIMEOUT", 0.5)
+    s = JobScheduler()
+    slow = s.submit("jabtak true\n    x = 1\n", client="t", trace_format="off")
+    quick = s.submit("dikhao 3\n", client="t", trace_format="off")
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and {slow.status, quick.status} & {"queued", "running"}:
+        time.sleep(0.05)
+
+    assert quick.status == "done" and quick.result["output"] == [3]
+    assert slow.status == "failed" and "second se zyada chala" in slow.error
@@ -0,0 +1,16 @@
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+
+
+def test_env_size_follows_in_place_changes():
+    interp = Interpreter()
+    interp.load(Parser(Lexer("xs = []\nhar range(200) main i\n    append(xs, i)\n").tokenize()).parse())
+    interp.step()
+    before = interp.memory_report()["env_kb"]
+
+    # stops inside the loop: env grows without a saved step
+    interp.cursor_step("into")
+    for _ in range(100):
+        interp.cursor_step("into")
+    assert interp.memory_report()["env_kb"] > before
@@ -0,0 +1,63 @@
+import re
+
+from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+
+from app.main import app
+from app.utils.metrics import Registry
+
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? (\S+)$')
+
+
+def parse(text):
+    """{metric name: kind}, [(sample name, labels, value)]; asserts the line format."""
+    kinds, samples = {}, []
+    for line in text.rstrip("\n").split("\n"):
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            kinds[name] = kind
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            m = SAMPLE.match(line)
+            assert m, f"bad sample line: {line!r}"
+            samples.append((m.group(1), m.group(2) or "", float(m.group(4))))
+    return kinds, samples
+
+
+def test_registry_renders_counters_gauges_and_histograms():
+    r = Registry()
+    c = r.counter("t_total", "A counter.", ("kind",))
+    c.inc(2, "a")
+    r.gauge("t_live", "A gauge.", lambda: 3)
+    h = r.histogram("t_seconds", "A histogram.", buckets=(0.1, 1))
+    for v in (0.05, 0.5, 5):
+        h.observe(v)
+
+    text = r.render()
+    assert text.startswith("# HELP t_total A counter.\n# TYPE t_total counter\n")
+    kinds, samples = parse(text)
+    assert kinds == {"t_total": "counter", "t_live": "gauge", "t_seconds": "histogram"}
+    assert ("t_total", '{kind="a"}', 2) in samples
+    assert ("t_live", "", 3) in samples
+    buckets = [v for name, _, v in samples if name == "t_seconds_bucket"]
+    assert buckets == [1, 2, 3]   # cumulative, +Inf last
+    assert ("t_seconds_count", "", 3) in samples and ("t_seconds_sum", "", 5.55) in samples
+
+
+def test_metrics_endpoint_counts_runs():
+    client = TestClient(app)
+
+    def statements():
+        res = client.get("/metrics")
+        assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+        _, samples = parse(res.text)
+        return {name: v for name, labels, v in samples if not labels}.get("ayr_statements_executed_total", 0), samples
+
+    before, _ = statements()
+    client.post("/run", json={"code": "x = 1\ny = x + 1\ndikhao y\n"})
+    after, samples = statements()
+
+    assert after - before == 3
+    assert any(name == "ayr_http_requests_total" and 'route="/run"' in labels and 'status="200"' in labels
+               for name, labels, _ in samples)
@@ -0,0 +1,52 @@
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser, ParseErrors
+from app.services.runner import run_code
+
+
+def error_lines(code):
+    return [p["line"] for p in run_code(code)["errors"]]
+
+
+def test_lexer_error_while_synchronizing_keeps_earlier_errors():
+    # the '$' is only lexed while recovery skips the broken line 2
+    assert error_lines("x = 1 +\ny = 1 + + 2 $\n") == [1, 2, 2]
+
+
+def test_lexer_error_in_blank_lines_keeps_earlier_errors():
+    try:
+        Parser(Lexer("x = 1 +\n\n$\n").stream()).parse()
+    except ParseErrors as e:
+        assert [line for line, _ in e.errors] == [1, 3]
+    else:
+        raise AssertionError("expected ParseErrors")
+
+
+def parse_expr(text):
+    return Parser(Lexer(text).tokenize()).expr()
+
+
+def test_pratt_precedence_and_left_associativity():
+    node = parse_expr("10 - 3 - 2 * 4")
+    assert node.op == "-" and node.right.op == "*"
+    assert node.left.op == "-" and node.left.left.value == 10
+
+    node = parse_expr("a > 1 aur nahi b ya c")
+    assert node.op == "ya" and node.left.op == "aur"
+    assert node.left.right.op == "nahi"
+
+
+def test_pratt_results():
+    result = run_code("dikhao 10 - 3 - 2\ndikhao 1 + 2 * 3 % 4\ndikhao 2 < 3 aur nahi false ya false\n")
+    assert result["output"] == [5, 3, True]
+
+
+def test_all_errors_reported_in_one_pass():
+    assert error_lines("x = 1 +\ny = 2\nz = * 3\n") == [1, 3]
+
+
+def test_body_of_broken_header_is_still_parsed():
+    code = "agar x ==\n    y = 1 +\n    z = 2\ndikhao 3 +\n"
+    assert error_lines(code) == [1, 2, 4]
+
+    code = "kaam f(a\n    wapas a +\n    agar\n        q = 1 +\nx = 1\n"
+    assert error_lines(code) == [1, 2, 3, 4]
@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+
+from app.main import app
+from app.services.runner import run_code
+
+
+CODE = """class P:
+    kaam __init__(self):
+        self.n = 0
+    kaam bump(self):
+        self.n = self.n + 1
+kaam g(n):
+    agar n == 0
+        wapas 0
+    wapas 1 + g(n - 1)
+p = P()
+har range(4) main i
+    p.bump()
+dikhao g(3)
+"""
+
+
+def profile_of(code):
+    result = run_code(code, profile=True)
+    assert result["success"], result["errors"]
+    return result
+
+
+def test_call_and_line_counts():
+    result = profile_of(CODE)
+    profile = result["profile"]
+
+    calls = {f["name"]: f["calls"] for f in profile["functions"]}
+    assert calls == {"P.__init__": 1, "P.bump": 4, "g": 4}
+
+    hits = {h["line"]: h["hits"] for h in profile["hotspots"]}
+    assert hits[12] == 4     # p.bump() once per iteration
+    assert hits[5] == 4      # the method body
+    assert hits[7] == 4 and hits[9] == 3
+    assert result["output"] == [3]
+
+
+def test_annotated_source_and_no_profile_by_default():
+    profile = profile_of(CODE)["profile"]
+    assert len(profile["annotated"]) == len(CODE.splitlines())
+    assert profile["annotated"][11].split()[0] == "4"
+    assert run_code(CODE)["profile"] is None
+
+
+def test_flamegraph_nests_recursive_calls():
+    result = profile_of(CODE)
+    stacks = dict(line.rsplit(" ", 1) for line in result["profile"]["flamegraph"].splitlines())
+    assert "main;g;g;g;g" in stacks and "main;P.bump" in stacks
+
+    client = TestClient(app)
+    res = client.get("/run/flamegraph", params={"session_id": result["session_id"]})
+    assert res.status_code == 200 and "main;g;g;g;g" in res.text
+    plain = run_code("dikhao 1\n")
+    assert client.get("/run/flamegraph", params={"session_id": plain["session_id"]}).status_code == 400
@@ -0,0 +1,20 @@
+import json
+
+from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+
+from app.main import app
+from app.utils.serializer import dumps
+
+
+BIG = 9223372036854775807 * 4
+
+
+def test_dumps_falls_back_for_ints_past_64_bits():
+    assert json.loads(dumps({"x": BIG, "ys": [1, BIG]})) == {"x": BIG, "ys": [1, BIG]}
+
+
+def test_run_returns_big_ints():
+    client = TestClient(app)
+    res = client.post("/run", json={"code": "x = 9223372036854775807 * 4\ndikhao x\n"})
+    assert res.status_code == 200
+    assert json.loads(res.content)["output"] == [BIG]
@@ -0,0 +1,46 @@
+import time
+
+from app.services import session as session_module
+from app.services.debug_runner import start_debug_session, step_cursor
+from app.services.session import session_manager
+
+
+LOOP = "har range(3) main i\n    dikhao i\n"
+
+
+def paused_session(key):
+    sid = start_debug_session(LOOP, key)["session_id"]
+    step_cursor(sid, key, "into")
+    step_cursor(sid, key, "into")
+    return sid
+
+
+def test_cursors_past_the_cap_are_released_oldest_first(monkeypatch):
+    session_manager.release_cursors(now=time.monotonic() + 10 ** 9)
+    monkeypatch.setattr(session_module, "MAX_LIVE_CURSORS", 2)
+
+    sids, threads = [], {}
+    for i in range(4):
+        sid = paused_session(f"cap-{i}")
+        sids.append(sid)
+        threads[sid] = session_manager.sessions[sid]._cursor._thread
+
+    live = [sid for sid in sids if session_manager.sessions[sid].cursor_active()]
+    assert live == sids[2:]
+    for sid in sids[:2]:
+        thread = threads[sid]
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        # rewound to before the statement the cursor was inside
+        assert session_manager.sessions[sid].pc == 0
+
+
+def test_idle_cursors_expire():
+    sid = paused_session("idle")
+    assert session_manager.release_cursors(keep=sid) == 0
+
+    later = time.monotonic() + session_module.CURSOR_IDLE_TTL + 1
+    assert session_manager.release_cursors(now=later) >= 1
+    assert not session_manager.sessions[sid].cursor_active()
+    # the session itself stays usable
+    assert step_cursor(sid, "idle", "into")["cursor"]["active"]
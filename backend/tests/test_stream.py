@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+
+from app.main import app
+from app.services import stream_runner
+from app.services.stream_runner import stream_code
+
+
+def events(messages):
+    parsed = []
+    for msg in messages:
+        head, data = msg.strip().split("\n")
+        parsed.append((head[len("event: "):], json.loads(data[len("data: "):])))
+    return parsed
+
+
+def test_outputs_and_problems_arrive_in_program_order():
+    code = "dikhao 1\nx = y\ndikhao 2\nz = 3\n"
+    got = events(stream_code(code))
+
+    assert [name for name, _ in got] == ["output", "error", "output", "warning", "done"]
+    assert [data["value"] for name, data in got if name == "output"] == [1, 2]
+    assert [data["index"] for name, data in got if name == "output"] == [0, 1]
+    assert got[1][1]["line"] == 2
+    done = got[-1][1]
+    assert done["output_count"] == 2 and done["summary"]["total_errors"] == 1
+
+
+def test_pucho_ends_the_stream_with_input_then_done():
+    got = events(stream_code("dikhao 1\nx = pucho\ndikhao x\n"))
+    assert [name for name, _ in got] == ["output", "input", "done"]
+    assert got[1][1]["var"] == "x" and got[-1][1]["needs_input"] is True
+
+
+def test_parse_errors_come_before_done():
+    got = events(stream_code("x = 1 +\ny = * 2\n"))
+    assert [name for name, _ in got] == ["error", "error", "done"]
+    assert got[-1][1]["success"] is False
+
+
+def test_sse_endpoint_streams_the_same_events():
+    client = TestClient(app)
+    with client.stream("POST", "/run/stream", json={"code": "dikhao 5\n"}) as res:
+        assert res.headers["content-type"].startswith("text/event-stream")
+        body = "".join(res.iter_text())
+    got = events(m + "\n\n" for m in body.strip().split("\n\n"))
+    assert [name for name, _ in got] == ["output", "done"]
+
+
+def test_closing_the_stream_stops_the_program(monkeypatch):
+    monkeypatch.setattr(stream_runner, "STREAM_BUFFER", 2)
+    before = threading.active_count()
+    stream = stream_code("jabtak true\n    dikhao 1\n")
+    assert next(stream).startswith("event: output")
+    stream.close()
+
+    # the worker notices the cancel instead of blocking on the full buffer
+    deadline = time.monotonic() + 5
+    while threading.active_count() > before and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert threading.active_count() <= before
@@ -0,0 +1,50 @@
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+from app.services.runner import run_code
+
+
+def run(code):
+    interp = Interpreter()
+    interp.load(Parser(Lexer(code).tokenize()).parse())
+    while interp.step():
+        pass
+    return interp
+
+
+def test_self_tail_call_runs_at_any_depth():
+    interp = run(
+        "kaam total(n, acc):\n"
+        "    agar n == 0\n"
+        "        wapas acc\n"
+        "    wapas total(n - 1, acc + n)\n"
+        "dikhao total(20000, 0)\n"
+    )
+    assert interp.output == [200010000]
+
+
+def test_tail_call_to_another_target_looks_up_once():
+    # the inner kaam replaces f before `wapas f(n)`: no frame reuse
+    interp = run(
+        "kaam f(n):\n"
+        "    kaam f(m):\n"
+        "        wapas m * 10\n"
+        "    wapas f(n)\n"
+        "dikhao f(4)\n"
+    )
+    assert interp.output == [40]
+    # each call site resolved once and never looked up again
+    assert (interp.call_cache_misses, interp.call_cache_hits) == (2, 0)
+
+
+def test_profiler_counts_every_round_of_a_tail_call():
+    result = run_code(
+        "kaam f(n, acc):\n"
+        "    agar n == 0\n"
+        "        wapas acc\n"
+        "    wapas f(n - 1, acc + n)\n"
+        "dikhao f(5, 0)\n",
+        profile=True,
+    )
+    assert result["output"] == [15]
+    assert {f["name"]: f["calls"] for f in result["profile"]["functions"]} == {"f": 6}
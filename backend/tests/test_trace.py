@@ -0,0 +1,48 @@
+import pytest
+
+from app.runtime.lexer import Lexer
+from app.runtime.parser import Parser
+from app.runtime.interpreter import Interpreter
+from app.runtime.trace import ColumnarTrace, _plain
+
+
+IN_PLACE = """xs = []
+ys = [[1], [2]]
+class P:
+    kaam __init__(self):
+        self.items = []
+p = P()
+har range(30) main i
+    append(xs, i)
+    agar i % 5 == 0
+        xs[0] = i
+    agar i % 7 == 0
+        pop(xs)
+    append(ys[0], i)
+    append(p.items, i)
+    zs = xs
+dikhao xs
+"""
+
+
+def trace_of(code, fmt):
+    interp = Interpreter(trace_format=fmt)
+    interp.load(Parser(Lexer(code).tokenize()).parse())
+    while interp.step():
+        pass
+    return interp.trace_log
+
+
+@pytest.mark.parametrize("code", [IN_PLACE, "x = 1\nx = 2\nx = 2\ns = \"a\"\n"])
+def test_columnar_matches_full_trace(code):
+    full = [dict(e, env=_plain(e["env"])) for e in trace_of(code, "full")]
+    columnar = trace_of(code, "columnar")
+    assert list(columnar) == full
+    assert list(ColumnarTrace.from_bytes(columnar.to_bytes())) == full
+
+
+def test_appends_store_only_the_tail():
+    trace = trace_of("xs = []\nhar range(50) main i\n    append(xs, i)\n", "columnar")
+    grown = [v for v in trace.values if isinstance(v, tuple)]
+    assert len(grown) == 50
+    assert trace[-1]["env"]["xs"] == list(range(50))